@@ -0,0 +1,222 @@
+"""Measures how each phase of a game tick scales with the number of entities, over reproducible scenarios.
+
+Usage (from the repository's root directory):
+
+    python benchmarks/scenarios.py --ticks 600
+    python benchmarks/scenarios.py --scenario tanks_64 --scenario sustained_fire --output before.json
+
+Every scenario loads the first level, adds its extra AI tanks (made by Tank.enemy) and turrets at seeded random
+positions, and runs for a fixed number of ticks on a virtual clock, driven by seeded random player input. Tanks and
+turrets can't be destroyed, so the number of entities stays the same throughout a run. Each tick is split into the
+phases below, and their mean, 95th and 99th percentile times are written to a JSON file (by default, one per commit
+in benchmarks/results/) so that runs can be compared across commits. Scenarios with the bullet engine require NumPy.
+
+- ai: the AI mobs' lines of sight to the player, and the updates of those that the AI scheduler lets think.
+- sprites: every sprite's update, including movement against obstacles.
+- collisions: collision resolution between sprites.
+- draw: drawing the level, including the map, decals, sprites and HUD.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+import xml.etree.ElementTree as ElementTree
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame as pg  # noqa: E402
+
+import src.config as cfg  # noqa: E402
+import src.utils.timer as timer  # noqa: E402
+from src.entities.tank_ctrl import AITankCtrl  # noqa: E402
+from src.headless import RandomInput, feed_input  # noqa: E402
+from src.sprites.attributes.poolable import PoolMixin  # noqa: E402
+from src.sprites.tank import Tank  # noqa: E402
+from src.utils.timer import VirtualClock  # noqa: E402
+from src.world.level import Level  # noqa: E402
+
+_LEVEL = 'level_1.tmx'
+_PHASES = ('ai', 'sprites', 'collisions', 'draw')
+_LEVEL_PHASES = {'ai': '_update_ai', 'sprites': '_update_sprites', 'collisions': '_resolve_collisions'}
+_HEALTH = 10 ** 9  # Keeps tanks and turrets alive for the whole run.
+_TANK_SIZES = (Tank.BIG, Tank.LARGE, Tank.HUGE)
+
+SCENARIOS = {
+    'baseline': {},
+    'tanks_16': {'tanks': 16},
+    'tanks_64': {'tanks': 64},
+    'turrets_32': {'turrets': 32},
+    'turrets_128': {'turrets': 128},
+    'sustained_fire': {'tanks': 16, 'turrets': 16, 'sustained_fire': True},
+    'large_map': {'map_scale': 3, 'tanks': 32, 'turrets': 32},
+    'bullet_storm': {'turrets': 96, 'sustained_fire': True},
+    'bullet_storm_engine': {'turrets': 96, 'sustained_fire': True, 'bullet_engine': True},
+}
+
+
+def _scaled_map(scale: int, directory: str) -> str:
+    """Writes a copy of the first level whose ground layer is repeated scale times in each direction.
+
+    :param scale: Number of copies of the ground layer along each axis.
+    :param directory: Directory in which to write the map file.
+    :return: Absolute path of the new map file.
+    """
+    tree = ElementTree.parse(os.path.join(cfg.MAP_DIR, _LEVEL))
+    root = tree.getroot()
+    root.set('width', str(int(root.get('width')) * scale))
+    root.set('height', str(int(root.get('height')) * scale))
+    for tileset in root.iter('tileset'):
+        tileset.set('source', os.path.join(cfg.MAP_DIR, tileset.get('source')))
+    for layer in root.iter('layer'):
+        layer.set('width', str(int(layer.get('width')) * scale))
+        layer.set('height', str(int(layer.get('height')) * scale))
+        data = layer.find('data')
+        rows = [row.rstrip(',') for row in data.text.split()]
+        rows = [','.join([row] * scale) for row in rows] * scale
+        data.text = '\n' + ',\n'.join(rows) + '\n'
+    path = os.path.join(directory, f'level_1_x{scale}.tmx')
+    tree.write(path, encoding='UTF-8', xml_declaration=True)
+    return path
+
+
+def _timed(samples: typing.List[float], method: typing.Callable) -> typing.Callable:
+    """Wraps a method so that each call's duration, in milliseconds, is appended to samples."""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        method(*args, **kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+    return wrapper
+
+
+def _summary(samples: typing.List[float]) -> typing.Dict[str, float]:
+    """Returns the mean, 95th, and 99th percentile of a list of durations."""
+    percentiles = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'mean_ms': statistics.fmean(samples), 'p95_ms': percentiles[94], 'p99_ms': percentiles[98]}
+
+
+def _fire_all(level: Level) -> None:
+    """Has every AI tank and turret fire, with its ammo refilled, regardless of what its AI decided."""
+    for ai in level.ai_mobs:
+        if isinstance(ai, AITankCtrl):
+            ai.tank.fire()
+            ai.tank.reload()
+        else:
+            ai.turret.barrel.fire()
+            ai.turret.barrel.reload()
+
+
+def run_scenario(screen: pg.Surface, name: str, ticks: int, seed: int, map_dir: str) -> dict:
+    """Builds a scenario's game world and times each phase of every tick.
+
+    :param screen: Surface that the level is drawn to.
+    :param name: Key of the scenario in SCENARIOS.
+    :param ticks: Number of ticks to run for.
+    :param seed: Seed for entity placement, player input, and the level's own random choices.
+    :param map_dir: Directory for generated map files.
+    :return: Dictionary with the scenario's settings, entity counts, and per-phase timings.
+    """
+    settings = SCENARIOS[name]
+    scale = settings.get('map_scale', 1)
+    level_file = _scaled_map(scale, map_dir) if scale > 1 else _LEVEL
+
+    clock = VirtualClock()
+    timer.set_clock(clock)
+    random.seed(seed)
+    placement = random.Random(seed)
+    timer.reset()
+    PoolMixin.clear_pools()
+    cfg.USE_BULLET_ENGINE = settings.get('bullet_engine', False)
+    level = Level(level_file)
+    area = level.rect.inflate(-256, -256)
+    for i in range(settings.get('tanks', 0)):
+        level.add_enemy_tank(placement.uniform(area.left, area.right), placement.uniform(area.top, area.bottom),
+                             _TANK_SIZES[i % len(_TANK_SIZES)])
+    for i in range(settings.get('turrets', 0)):
+        level.add_turret(placement.uniform(area.left, area.right), placement.uniform(area.top, area.bottom),
+                         'standard', i % 7 + 1)
+    for sprite in [level.player.tank] + [ai.sprite for ai in level.ai_mobs]:
+        sprite.MAX_HEALTH = sprite.health = _HEALTH
+
+    samples = {phase: [] for phase in _PHASES}
+    for phase, method in _LEVEL_PHASES.items():
+        setattr(level, method, _timed(samples[phase], getattr(level, method)))
+    draw = _timed(samples['draw'], level.draw)
+
+    player_input = RandomInput(seed)
+    dt = 1 / cfg.TICK_RATE
+    for tick in range(ticks):
+        feed_input(level, *player_input.actions(level, tick))
+        if settings.get('sustained_fire'):
+            _fire_all(level)
+        level.update(dt)
+        clock.advance(dt * 1000)
+        draw(screen)
+
+    return {
+        'settings': settings,
+        'map_size': list(level.rect.size),
+        'ai_mobs': len(level.ai_mobs),
+        'ai_scheduler': level.ai_scheduler.stats(),
+        'visibility': level.visibility.stats(),
+        'phases': {phase: _summary(samples[phase]) for phase in _PHASES}
+    }
+
+
+def _commit() -> typing.Optional[str]:
+    """Returns the hash of the checked-out commit, if the repository's history is available."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=_ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="scenario to run; may be repeated (default: all)")
+    parser.add_argument('--ticks', type=int, default=600, help="ticks to run each scenario for")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    commit = _commit()
+    output = args.output or os.path.join(_ROOT, 'benchmarks', 'results', f"scenarios-{commit or 'unknown'}.json")
+    screen = pg.display.get_surface()
+    results = {
+        'commit': commit,
+        'python': platform.python_version(),
+        'pygame': pg.version.ver,
+        'ticks': args.ticks,
+        'tick_rate': cfg.TICK_RATE,
+        'seed': args.seed,
+        'scenarios': {}
+    }
+    print(f"{'scenario':<16}" + ''.join(f"{phase + ' mean/p95/p99 (ms)':>34}" for phase in _PHASES))
+    with tempfile.TemporaryDirectory() as map_dir:
+        for name in args.scenario or SCENARIOS:
+            result = run_scenario(screen, name, args.ticks, args.seed, map_dir)
+            results['scenarios'][name] = result
+            print(f"{name:<16}" + ''.join(
+                f"{'{mean_ms:.3f} / {p95_ms:.3f} / {p99_ms:.3f}'.format(**result['phases'][phase]):>34}"
+                for phase in _PHASES))
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {output}")
+
+
+if __name__ == '__main__':
+    main()
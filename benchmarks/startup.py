@@ -0,0 +1,90 @@
+"""Measures cold and warm startup time of the game, loading assets from their files and from the asset bundle.
+
+Usage (from the repository's root directory):
+
+    python -m src.services.bundle       # Build the bundle first.
+    python benchmarks/startup.py --runs 5
+
+Each run is a fresh interpreter that times opening the window, importing the asset loaders, and loading the first
+level (which decodes the images that the bundle defers). The first run of each mode is reported as cold; if the page
+cache can be dropped (requires root on Linux), it is dropped before that run. The remaining runs are reported as warm.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_CHILD = """
+import json, time
+t0 = time.perf_counter()
+import src
+import src.config as cfg
+cfg.USE_ASSET_BUNDLE = {use_bundle}
+t1 = time.perf_counter()
+import src.services.image_loader, src.services.sound, src.services.text
+t2 = time.perf_counter()
+from src.world.level import Level
+Level('level_1.tmx')
+t3 = time.perf_counter()
+print(json.dumps({{'window': t1 - t0, 'assets': t2 - t1, 'level': t3 - t2}}))
+"""
+
+
+def _drop_page_cache() -> bool:
+    """Tries to empty the OS page cache so that the next run reads assets from disk."""
+    try:
+        os.sync()
+        with open('/proc/sys/vm/drop_caches', 'w') as f:
+            f.write('3\n')
+        return True
+    except OSError:
+        return False
+
+
+def _run(use_bundle: bool) -> dict:
+    """Times one startup in a fresh interpreter."""
+    env = dict(os.environ, SDL_VIDEODRIVER=os.environ.get('SDL_VIDEODRIVER', 'dummy'),
+               SDL_AUDIODRIVER=os.environ.get('SDL_AUDIODRIVER', 'dummy'), PYGAME_HIDE_SUPPORT_PROMPT='1')
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', _CHILD.format(use_bundle=use_bundle)], cwd=_ROOT, env=env,
+                         check=True, capture_output=True, text=True).stdout
+    timings = json.loads(out.strip().splitlines()[-1])
+    timings['process'] = time.perf_counter() - start
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="runs per mode, including the cold run")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for mode, use_bundle in (('files', False), ('bundle', True)):
+        dropped = _drop_page_cache()
+        cold = _run(use_bundle)
+        warm = [_run(use_bundle) for _ in range(args.runs - 1)]
+        results[mode] = {
+            'cold': cold,
+            'cold_cache_dropped': dropped,
+            'warm_median': {phase: statistics.median(run[phase] for run in warm) for phase in cold} if warm else None
+        }
+
+    print(f"{'mode':<8}{'run':<6}{'window':>10}{'assets':>10}{'level':>10}{'process':>10}  (seconds)")
+    for mode, result in results.items():
+        for run in ('cold', 'warm_median'):
+            timings = result[run]
+            if timings:
+                print(f"{mode:<8}{run.split('_')[0]:<6}" + ''.join(f"{timings[p]:>10.3f}"
+                                                              for p in ('window', 'assets', 'level', 'process')))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
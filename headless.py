@@ -0,0 +1,38 @@
+"""Simulates a level without a window or sound, faster than real time, and reports the ticks per second.
+
+Usage:
+
+    python headless.py --ticks 36000
+    python headless.py --script my_inputs.json --no-restart
+"""
+import argparse
+import os
+
+# The window is created when the src package is imported, so the dummy drivers must be selected first.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import src.config as cfg  # noqa: E402
+from src.headless import HeadlessRunner, RandomInput, ScriptedInput  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--level', default='level_1.tmx', help="level file in the maps folder")
+    parser.add_argument('--ticks', type=int, default=cfg.TICK_RATE * 600, help="number of ticks to simulate")
+    parser.add_argument('--tick-rate', type=int, default=cfg.TICK_RATE, help="ticks per simulated second")
+    parser.add_argument('--script', help="JSON file of player input steps; seeded random input by default")
+    parser.add_argument('--seed', type=int, default=0, help="seed for random input and the level's random choices")
+    parser.add_argument('--no-restart', action='store_true', help="stop once the game is over")
+    args = parser.parse_args()
+
+    player_input = ScriptedInput.load(args.script) if args.script else RandomInput(args.seed)
+    runner = HeadlessRunner(args.level, player_input, args.tick_rate, not args.no_restart, args.seed)
+    report = runner.run(args.ticks)
+    print(f"{report['ticks']} ticks ({report['sim_seconds']:.1f} s simulated) in {report['wall_seconds']:.2f} s: "
+          f"{report['ticks_per_second']:.0f} ticks/s, {report['realtime_factor']:.1f}x real time, "
+          f"slowest tick {report['slowest_tick_ms']:.1f} ms, {report['rounds']} game(s) finished")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,5 +2,7 @@ import pygame as pg
 
 import src.config as cfg
 
+# A small buffer keeps sound effects in step with the game; it must be set before the mixer is initialized.
+pg.mixer.pre_init(cfg.MIXER_FREQUENCY, -16, 2, cfg.MIXER_BUFFER)
 pg.init()
 pg.display.set_mode((cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT), pg.RESIZABLE)
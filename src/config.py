@@ -7,12 +7,27 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 800
 TITLE = "Blast Zone"
 FPS = 60
+# Simulation rate in ticks per second, independent of FPS; rendering interpolates between the last two ticks.
+TICK_RATE = 60
+# Longest frame, in seconds, that is simulated; time beyond it is dropped so a stall can't snowball into more ticks.
+MAX_FRAME_TIME = 0.25
 
 # Game directory and game assets directories.
 GAME_DIR = os.path.dirname(__file__)
 IMG_DIR = os.path.join(GAME_DIR, 'assets', 'images')
 SND_DIR = os.path.join(GAME_DIR, 'assets', 'sounds')
 MAP_DIR = os.path.join(GAME_DIR, 'assets', 'maps')
+# Pre-built bundle of images and sounds (see src/services/bundle.py); loose asset files are used if it's missing.
+ASSET_BUNDLE = os.path.join(GAME_DIR, 'assets', 'assets.bundle')
+USE_ASSET_BUNDLE = True
+
+# Map rendering: size in pixels of each baked map chunk and memory budget in bytes for baked chunks.
+MAP_CHUNK_SIZE = 512
+MAP_CHUNK_BUDGET = 64 * 1024 * 1024
+
+# Ground decals: size in pixels of each decal chunk, and maximum number of chunks faded per tick.
+DECAL_CHUNK_SIZE = 64
+DECAL_FADES_PER_TICK = 16
 
 # Color RGBs
 BLACK = (0, 0, 0)
@@ -34,8 +49,67 @@ TANK_COLORS = ["Blue", "Dark", "Green", "Red", "Sand"]
 CATEGORY = {"standard": 1, "power": 2, "rapid": 3}
 DEFAULT_IMAGE_ROT = -90  # See sprite sheet.
 
+# Sound mixer: sample rate, buffer size in samples (smaller means lower latency), and channels for sound effects.
+MIXER_FREQUENCY = 44100
+MIXER_BUFFER = 512
+MIXER_CHANNELS = 16
+# Sound effects: voices of the same sound at once, minimum milliseconds between two plays of a sound, and pixels beyond
+# the camera's view within which sounds are heard.
+SFX_DEFAULT_VOICE_LIMIT = 3
+SFX_VOICE_LIMITS = {'shoot.wav': 6, 'box.wav': 2, 'reload.wav': 1}
+SFX_COOLDOWNS = {'shoot.wav': 40, 'box.wav': 80}
+SFX_HEARING_MARGIN = 256
+
+# AI navigation: size in pixels of the navigation grid's cells, pixels by which obstacles are grown to keep tanks clear
+# of them, maximum number of cached routes, steps of route searches taken per tick (a step expands 64 cells), minimum
+# milliseconds between refreshes of a flow field to a target, steps of a refresh taken per tick (a step is a pass over
+# the field with NumPy, or 64 cells settled without it), and cells from the target to the edges of the field.
+NAV_CELL_SIZE = 32
+NAV_CLEARANCE = 20
+NAV_ROUTE_CACHE_SIZE = 512
+NAV_SEARCH_STEPS_PER_TICK = 4
+FLOW_FIELD_INTERVAL = 250
+FLOW_FIELD_STEPS_PER_TICK = 6
+FLOW_FIELD_RADIUS = 24
+
+# Line of sight: size in pixels of the cells that rays are cast over, and maximum number of cached lines of sight.
+LOS_CELL_SIZE = 32
+LOS_CACHE_SIZE = 8192
+
+# AI level of detail: maximum number of AI mobs that think per tick, milliseconds per tick that they may spend thinking
+# while the game runs in real time (None for no limit), distances in pixels from the player that separate the levels of
+# detail, and milliseconds between thinks per AI state, for each level.
+AI_THINKS_PER_TICK = 32
+AI_THINK_BUDGET_MS = 2.0
+AI_LOD_DISTANCES = (600, 1200)
+AI_THINK_INTERVALS = {
+    'patrol': (50, 150, 300),
+    'pursue': (0, 50, 100),
+    'flee': (0, 100, 200),
+    'attack': (0, 100, 250),
+    'reload': (100, 250, 500),
+}
+
+# Milliseconds per frame that the main thread may spend converting assets decoded in the background.
+PRELOAD_BUDGET_MS = 4
+
+# Frame profiler: number of frames kept for its graph, and the file that frames are streamed to (CSV if it ends in .csv).
+PROFILER_HISTORY = 240
+PROFILER_EXPORT_FILE = 'frame_profile.jsonl'
+
+# Bullet engine (requires NumPy): whether bullets are kept in arrays instead of sprites, and its initial capacity.
+USE_BULLET_ENGINE = False
+BULLET_ENGINE_CAPACITY = 256
+
+# Rotation cache: angle bucket size in degrees, maximum cached surfaces, and whether to pre-rotate on level load.
+ROTATION_CACHE_STEP = 2
+ROTATION_CACHE_SIZE = 4096
+ROTATION_CACHE_WARM_UP = True
+
 # Game font names.
 FONT_NAMES = ('arial', 'calibri')
+# Maximum number of rendered text surfaces kept by the text renderer.
+TEXT_CACHE_SIZE = 256
 
 
 # Sprite Layers (smallest is topmost).
@@ -43,4 +117,3 @@ EFFECTS_LAYER = 5
 BARREL_LAYER = 4
 ITEM_LAYER = 3
 TANK_LAYER = 2
-TRACKS_LAYER = 1
@@ -6,6 +6,8 @@ import src.utils.constants as constants
 
 class AIMob(metaclass=abc.ABCMeta):
     """Abstract base class for a game AI."""
+    visibility = None  # The level's Visibility, which tells which AI mobs see their target past obstacles.
+
     def __init__(self, sprite, target):
         """Sets the sprite to be controlled by the AI and the sprite that the AI is targeting.
 
@@ -45,6 +47,12 @@ class AIMob(metaclass=abc.ABCMeta):
         return self.target.alive() and \
             self.ray_to_target.length_squared() < self._sprite.range ** 2
 
+    def is_target_in_sight(self) -> bool:
+        """Determines if the target is in range and not hidden behind an obstacle."""
+        if AIMob.visibility is None:
+            return self.is_target_in_range()
+        return self.target.alive() and AIMob.visibility.sees(self._sprite)
+
     def angle_to_target(self) -> float:
         """Determines the direction of the target relative to AI's sprite."""
         return self.ray_to_target.angle_to(constants.UNIT_VEC)
@@ -6,6 +6,7 @@ import src.config as cfg
 import src.services.text as text_renderer
 import src.services.image_loader as image_loader
 from src.input.input_state import InputState
+from src.ui.hud import Hud
 
 
 # Player HUD constants.
@@ -35,13 +36,37 @@ class PlayerCtrl:
         }
 
         # HUD attributes.
+        self._hud = self._make_hud()
+
+    def _make_hud(self) -> Hud:
+        """Lays out the health bar, ammo icon, and ammo count, each re-rendered only when its value changes."""
+        bar_rect = pg.Rect(0, 0, _HP_WIDTH, _HP_HEIGHT)
+
         # Ammo Icon
-        self.ammo_surf = image_loader.get_image(f"bullet{tank.color}3_outline.png")
-        self.ammo_rect = self.ammo_surf.get_rect()
+        ammo_surf = image_loader.get_image(f"bullet{self.tank.color}3_outline.png")
+        ammo_rect = ammo_surf.get_rect()
+        ammo_rect.x = bar_rect.left
+        ammo_rect.y = bar_rect.bottom + 5
 
         # Ammo text surface
-        self.ammo_count_surf = pg.Surface((_HP_HEIGHT * 2, self.ammo_rect.height))
-        self.ammo_count_rect = self.ammo_count_surf.get_rect()
+        ammo_count_rect = pg.Rect(ammo_rect.right + 2, ammo_rect.y, _HP_HEIGHT * 2, ammo_rect.height)
+
+        hud = Hud(max(bar_rect.right, ammo_count_rect.right), ammo_count_rect.bottom)
+        hud.add_widget(bar_rect, lambda: (self.tank.health, self.tank.MAX_HEALTH), self._render_health)
+        hud.add_widget(ammo_rect, lambda: None, lambda surf, _: surf.blit(ammo_surf, (0, 0)))
+        hud.add_widget(ammo_count_rect, self.tank.ammo_count, self._render_ammo_count)
+        return hud
+
+    def _render_health(self, surf: pg.Surface, health: tuple) -> None:
+        """Renders the player's health bar and HP text."""
+        surf.blit(self.tank.health_bar_image(*surf.get_size()), (0, 0))
+        text_renderer.render(surf, "HP: {} / {}".format(*health), 16, cfg.WHITE)
+
+    @staticmethod
+    def _render_ammo_count(surf: pg.Surface, ammo: int) -> None:
+        """Renders the player's ammo count."""
+        surf.fill(cfg.BLACK)
+        text_renderer.render(surf, f"Ammo: {ammo}", 12, cfg.WHITE)
 
     def handle_keys(self):
         """Consumes any key active key bindings and invokes the appropriate action on the PlayerCtrl's sprite."""
@@ -86,27 +111,6 @@ class PlayerCtrl:
         """Sets the rotation speed of the PlayerCtrl's sprite to move backwards."""
         self.tank.rot_speed = -PlayerCtrl._ROT_SPEED
 
-    def draw_hud(self, surface, camera):
-        """Draws the player's health and ammo count."""
-        # Draw the health bar.
-        hp_x, hp_y = camera.rect.x + _HP_X_OFFSET, camera.rect.y + _HP_Y_OFFSET
-        bar_rect = pg.Rect(hp_x, hp_y, _HP_WIDTH, _HP_HEIGHT)
-        self.tank.draw_health(surface, camera, bar_rect)
-
-        hp_text_pos = camera.apply(bar_rect).center
-        text_renderer.render_pos(surface, *hp_text_pos, f"HP: {self.tank.health} / {self.tank.MAX_HEALTH}", 16,
-                                 cfg.WHITE)
-
-        # Draw ammo icon.
-        self.ammo_rect.x = bar_rect.left
-        self.ammo_rect.y = bar_rect.bottom + 5
-        surface.blit(self.ammo_surf, camera.apply(self.ammo_rect))
-
-        # Ammo count
-        self.ammo_count_rect.x = self.ammo_rect.right + 2
-        self.ammo_count_rect.y = self.ammo_rect.y
-        self.ammo_count_surf.fill(cfg.BLACK)
-
-        ammo_text = f"Ammo: {self.tank.ammo_count()}"
-        text_renderer.render(self.ammo_count_surf, ammo_text, 12, cfg.WHITE)
-        surface.blit(self.ammo_count_surf, camera.apply(self.ammo_count_rect))
\ No newline at end of file
+    def draw_hud(self, surface):
+        """Draws the player's health and ammo count, re-rendering only the parts that changed."""
+        self._hud.draw(surface, (_HP_X_OFFSET, _HP_Y_OFFSET))
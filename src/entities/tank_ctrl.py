@@ -5,31 +5,51 @@ import random
 import src.utils.constants as constants
 from src.utils.timer import Timer
 from src.entities.ai_mob import AIMob
+from src.world.flow_field import FlowField
+from src.world.navigation import Navigator
 
 
 class AITankCtrl(AIMob):
     """Class for an AI that controls a tank object."""
-    def __init__(self, tank, path_data: list, target):
-        """Initiates the AI in a patrol state.
+    _WAYPOINT_RADIUS = 24  # Pixels from a waypoint at which the tank heads for the next one.
+    _REPLAN_DELAY = 500  # Minimum milliseconds between routes planned after hitting a wall.
+
+    def __init__(self, tank, path_data: list, target, navigator: Navigator, flow_field: FlowField):
+        """Initiates the AI in a patrol state, which heads to the first patrol point on the AI's first update.
 
         :param tank: The tank sprite controlled by this AI.
         :param path_data: The points that the sprite navigates to during its patrol state.
         :param target: The sprite that the target is targeting.
+        :param navigator: The level's navigator, which plans the routes that the tank drives along.
+        :param flow_field: Flow field toward the target, which the tank follows while pursuing or fleeing it.
         """
         AIMob.__init__(self, tank, target)
         random.shuffle(path_data)
         # Iterator that cycles the destination points of the tank's destination points.
         self._path_points = itertools.cycle([pg.math.Vector2(p.x, p.y) for p in path_data])
+        self._navigator = navigator
+        self._flow_field = flow_field
+        self._goal = None
+        self._route = None
+        self._route_start = None
+        self._waypoint = 0
+        self._replan_timer = Timer()
         self._patrol_state = AIPatrolState(self)
         self._pursue_state = AIPursueState(self)
         self._flee_state = AIFleeState(self)
-        self.state = self._patrol_state
-        self.state.enter()
+        # The patrol state is entered without planning a route, which is planned on the first think instead, once the
+        # level has baked its obstacles into the navigator.
+        self._state = self._patrol_state
 
     @property
     def tank(self):
         return self._sprite
 
+    @property
+    def goal(self) -> pg.math.Vector2:
+        """Returns the world position that the tank is driving to, or None until the AI first updates."""
+        return self._goal
+
     @property
     def patrol_state(self) -> 'AIPatrolState':
         return self._patrol_state
@@ -48,10 +68,81 @@ class AITankCtrl(AIMob):
         :param aim_direction: Angle in which to rotate the sprite.
         :return: None
         """
+        self.turn_to(aim_direction)
+        self._sprite.rotate_barrel(aim_direction)
+
+    def turn_to(self, direction: float) -> None:
+        """Rotates the tank controlled by the AI, but not its barrels."""
         tank = self._sprite
-        tank.rot = aim_direction
+        tank.rot = direction
         tank.rotate()
-        tank.rotate_barrel(aim_direction)
+
+    def aim(self, aim_direction: float) -> None:
+        """Rotates the barrels of the tank controlled by the AI, but not the tank itself."""
+        self._sprite.rotate_barrel(aim_direction)
+
+    def head_to(self, goal: pg.math.Vector2) -> None:
+        """Plans a route to a world position, along which heading() then steers.
+
+        :param goal: World position to drive to.
+        :return: None
+        """
+        self._goal = pg.math.Vector2(goal)
+        self._route_start = pg.math.Vector2(self._sprite.pos)
+        self._route = self._navigator.route(self._route_start, self._goal)
+        # The first waypoint is the center of the cell that the tank is in.
+        self._waypoint = 1
+        self._replan_timer.restart()
+
+    def heading(self) -> float:
+        """Returns the direction in which to drive to follow the route to the goal.
+
+        The route is planned again if an obstacle has since blocked it, or if the tank keeps running into a wall. Once
+        past the route's last turn, or if the goal can't be reached, the tank drives straight to the goal, as it does
+        while its route is still pending.
+        """
+        tank = self._sprite
+        if self._route is not None and self._route.pending:
+            # The navigator carries on with the search from where the tank was when it first asked for the route.
+            self._route = self._navigator.route(self._route_start, self._goal)
+        elif (self._route is not None and not self._route.valid) or \
+                (tank.hit_wall and self._replan_timer.elapsed() > AITankCtrl._REPLAN_DELAY):
+            self.head_to(self._goal)
+        waypoint = self._goal
+        if self._route is not None:
+            waypoints = self._route.waypoints
+            while self._waypoint < len(waypoints) - 1 and \
+                    tank.pos.distance_squared_to(waypoints[self._waypoint]) < AITankCtrl._WAYPOINT_RADIUS ** 2:
+                self._waypoint += 1
+            # The route's last waypoint is the center of the goal's cell, so the goal itself is driven to instead.
+            if self._waypoint < len(waypoints) - 1:
+                waypoint = waypoints[self._waypoint]
+        return (waypoint - tank.pos).angle_to(constants.UNIT_VEC)
+
+    def chase(self) -> float:
+        """Returns the direction in which to drive to the target.
+
+        The tank drives straight to the target when nothing is in the way, and otherwise follows the flow field.
+        """
+        pos, goal = self._sprite.pos, self.target.pos
+        self._flow_field.update(goal)
+        if not self._navigator.line_clear(pos, goal):
+            direction = self._flow_field.toward(pos)
+            if direction is not None:
+                return direction
+        return (goal - pos).angle_to(constants.UNIT_VEC)
+
+    def evade(self, flee_angle: float) -> float:
+        """Returns the direction in which to drive away from the target, following the flow field away from it.
+
+        :param flee_angle: Angle relative to the target's direction to drive in where the field leads nowhere farther.
+        :return: Direction in degrees.
+        """
+        self._flow_field.update(self.target.pos)
+        direction = self._flow_field.away(self._sprite.pos)
+        if direction is None:
+            return self.angle_to_target() + flee_angle
+        return direction
 
     def move(self, acc_pct=1.0) -> None:
         """Sets the acceleration of the tank sprite controlled by the AI
@@ -71,6 +162,7 @@ class AITankCtrl(AIMob):
 
 class AITankCtrlState:
     """Based class for the tank controller's state behavior."""
+    NAME = None  # Key of the state in cfg.AI_THINK_INTERVALS, which sets how often the AI thinks while in it.
     WALL_AVOID_DURATION = 1000
     WALL_TURN_ANGLE = 15
     _crash_timer = Timer()
@@ -98,61 +190,59 @@ class AITankCtrlState:
 
 class AIPatrolState(AITankCtrlState):
     """Simulates an idle, patrolling state for the AITankCtrl"""
+    NAME = 'patrol'
     _EPSILON = 100
 
-    def __init__(self, ai: AITankCtrl):
-        AITankCtrlState.__init__(self, ai)
-        self._destination = None
-
     def enter(self) -> None:
-        """Sets the starting destination that the AI's sprite will patrol to."""
-        self._destination = self._ai.get_next_destination()
-        aim_direction = (self._destination - self._ai.tank.pos).angle_to(constants.UNIT_VEC)
-        self._ai.rotate_to(aim_direction)
+        """Plans a route to the next point that the AI's sprite will patrol to."""
+        self._ai.head_to(self._ai.get_next_destination())
+        self._ai.rotate_to(self._ai.heading())
 
     def update(self, dt: float) -> None:
-        """Marches on to the next path point, or pursues the target if it is in-range."""
-        self.check_for_walls()
-        if not self.is_avoiding_wall():
-            if self._ai.is_target_in_range():
-                self._ai.state = self._ai.pursue_state
-            else:
-                if self.arrived():
-                    self._destination = self._ai.get_next_destination()
-
-                aim_direction = (self._destination - self._ai.tank.pos).angle_to(constants.UNIT_VEC)
-                self._ai.rotate_to(aim_direction)
+        """Drives along the route to the next path point, or pursues the target if it is in-range."""
+        if self._ai.is_target_in_range():
+            self._ai.state = self._ai.pursue_state
+        else:
+            if self._ai.goal is None or self.arrived():
+                self._ai.head_to(self._ai.get_next_destination())
+            self._ai.rotate_to(self._ai.heading())
         self._ai.move(acc_pct=0.75)
 
     def arrived(self) -> bool:
         """Determines whether the target has reached its current destination."""
-        dist = (self._destination - self._ai.tank.pos).length_squared()
+        dist = (self._ai.goal - self._ai.tank.pos).length_squared()
         return dist < AIPatrolState._EPSILON
 
 
 class AIPursueState(AITankCtrlState):
     """Class that simulates the AITankCtrl's pursue behavior."""
+    NAME = 'pursue'
+
     def __init__(self, ai):
         AITankCtrlState.__init__(self, ai)
 
     def update(self, dt) -> None:
-        """Chases and fires at the target while the AI's tank has ammo and is in range; flees when out of ammo."""
-        self.check_for_walls()
-        if not self.is_avoiding_wall():
-            if self._ai.tank.ammo_count() > 0:
-                if self._ai.is_target_in_range():
-                    aim_direction = self._ai.angle_to_target()
-                    self._ai.rotate_to(aim_direction)
+        """Chases the target while the AI's tank has ammo and is in range, firing once in sight; flees when out of ammo.
+
+        The tank drives around obstacles toward the target, while its barrels stay aimed at the target.
+        """
+        if self._ai.tank.ammo_count() > 0:
+            if self._ai.is_target_in_range():
+                self._ai.turn_to(self._ai.chase())
+                self._ai.aim(self._ai.angle_to_target())
+                # Don't waste bullets on trees and barricades.
+                if self._ai.is_target_in_sight():
                     self._ai.tank.fire()
-                else:
-                    self._ai.state = self._ai.patrol_state
             else:
-                self._ai.state = self._ai.flee_state
+                self._ai.state = self._ai.patrol_state
+        else:
+            self._ai.state = self._ai.flee_state
         self._ai.move(acc_pct=0.9)
 
 
 class AIFleeState(AITankCtrlState):
     """Class that simulates the AITankCtrl's flee behavior."""
+    NAME = 'flee'
     # 180 to go opposite to player, and 30 for slight turn.
     FLEE_ANGLE = 210
     _RELOAD_TIME = 5000
@@ -173,7 +263,6 @@ class AIFleeState(AITankCtrlState):
                 self._ai.tank.reload()
                 self._ai.state = self._ai.patrol_state  # Causes exit to be called by the AI.
             else:
-                # Run away from target.
-                aim_direction = self._ai.angle_to_target() + AIFleeState.FLEE_ANGLE
-                self._ai.rotate_to(aim_direction)
+                # Run away from target, around obstacles.
+                self._ai.rotate_to(self._ai.evade(AIFleeState.FLEE_ANGLE))
         self._ai.move()
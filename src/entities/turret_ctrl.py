@@ -38,6 +38,8 @@ class AITurretCtrl(AIMob):
 
 class AITurretCtrlState:
     """Base class for AITurretCtrl state."""
+    NAME = None  # Key of the state in cfg.AI_THINK_INTERVALS, which sets how often the AI thinks while in it.
+
     def __init__(self, ai):
         self._ai = ai
 
@@ -50,12 +52,14 @@ class AITurretCtrlState:
 
 class AIAttackState(AITurretCtrlState):
     """State class for AITankCtrl for attacking the player."""
+    NAME = 'attack'
+
     def __init__(self, ai):
         AITurretCtrlState.__init__(self, ai)
 
     def update(self, dt) -> None:
-        """Attacks the T=target as long as they're in range and the AI's turret has ammo."""
-        if self._ai.is_target_in_range():
+        """Attacks the T=target as long as they're in range and in sight, and the AI's turret has ammo."""
+        if self._ai.is_target_in_sight():
             turret = self._ai.turret
             if turret.barrel.ammo_count > 0:
                 if not self._ai.is_tank_pursuing():
@@ -67,6 +71,7 @@ class AIAttackState(AITurretCtrlState):
 
 class AIReloadState(AITurretCtrlState):
     """ State class for AITankCtrl for reloading the AI's turret."""
+    NAME = 'reload'
     _RELOAD_TIME = 10000
 
     def __init__(self, ai):
@@ -1,21 +1,35 @@
 import pygame as pg
 
 import src.config as cfg
-# Loads all sprite sheet images and sounds upon import.
-import src.services.image_loader
-import src.services.sound
+import src.services.profiler as profiler
+# Indexes all sprite sheet images and sounds upon import; they're decoded in the background or on first use.
+import src.services.image_loader as image_loader
+import src.services.sound as sound
+import src.services.text as text
+import src.utils.timer as timer
+import src.world.tiled_map as tiled_map
 from src.game_state import GamePlayingState, GameMainMenuState, GameState
+from src.services.preloader import Preloader
 from src.ui.ui import UI
 
 
 class Game:
     """Top-level game class for running the current pygame application."""
     def __init__(self):
-        """Sets the game screen and clock."""
+        """Sets the game screen and clock, and starts loading assets in the background."""
         self._screen = pg.display.get_surface()
         self._clock = pg.time.Clock()
         self._ui = UI()
         self._running = False
+        self._tick = 1 / cfg.TICK_RATE
+        self._accumulator = 0.0
+        self._caption_time = 0
+        self._preloader = Preloader()
+        self._preloader.add(image_loader.preload_jobs())
+        self._preloader.add(sound.preload_jobs())
+        self._preloader.add(text.preload_jobs())
+        self._preloader.add(tiled_map.preload_jobs(GamePlayingState.LEVEL_FILE))
+        self._preloader.start()
 
         self._play_state = GamePlayingState(self)
         self._main_menu_state = GameMainMenuState(self)
@@ -25,6 +39,10 @@ class Game:
     def ui(self) -> UI:
         return self._ui
 
+    @property
+    def preloader(self) -> Preloader:
+        return self._preloader
+
     @property
     def play_state(self) -> GamePlayingState:
         return self._play_state
@@ -51,13 +69,40 @@ class Game:
         self._state.enter()
 
     def run(self) -> None:
-        """Runs the game loop: processes inputs, updates, and draws at a frame rate specified in a config file."""
+        """Runs the game loop: processes inputs, updates, and draws at a frame rate specified in a config file.
+
+        The game state is updated in fixed ticks of 1 / TICK_RATE seconds, as many as the elapsed time calls for, so
+        that the simulation doesn't depend on the frame rate. Drawing interpolates between the last two ticks.
+        """
         self._running = True
         self.state = self._main_menu_state
         while self._running:
-            dt = self._clock.tick(cfg.FPS) / 1000
-            self._state.process_inputs()
-            self._state.update(dt)
-            self._state.draw(self._screen)
+            self._accumulator += min(self._clock.tick(cfg.FPS) / 1000, cfg.MAX_FRAME_TIME) * timer.time_scale()
+            self._preloader.pump()
+            with profiler.phase('input'):
+                self._state.process_inputs()
+            while self._accumulator >= self._tick:
+                self._state.update(self._tick)
+                self._accumulator -= self._tick
+            with profiler.phase('draw'):
+                dirty_rects = self._state.draw(self._screen, self._accumulator / self._tick)
+                overlay_rect = profiler.draw(self._screen)
+                if overlay_rect and dirty_rects is not None:
+                    dirty_rects.append(overlay_rect)
+            self._update_caption()
+            with profiler.phase('flip'):
+                if dirty_rects is None:
+                    pg.display.flip()
+                elif dirty_rects:
+                    pg.display.update(dirty_rects)
+            if profiler.enabled():
+                profiler.count('fps', int(self._clock.get_fps()))
+                profiler.count('scheduled', timer.scheduled_count())
+                profiler.end_frame()
+
+    def _update_caption(self) -> None:
+        """Shows the frame rate in the window's caption, once a second since setting the caption isn't free."""
+        now = pg.time.get_ticks()
+        if now - self._caption_time >= 1000:
             pg.display.set_caption(f"{cfg.TITLE}: {int(self._clock.get_fps())} (FPS)")
-            pg.display.flip()
+            self._caption_time = now
@@ -1,12 +1,15 @@
 import sys
 import abc
+import typing
 import pygame as pg
 
 import src.config as cfg
 import src.input.input_manager as input_manager
 import src.services.image_loader as image_loader
+import src.services.profiler as profiler
+import src.utils.timer as timer
 from src.world.level import Level
-from src.utils.timer import Timer
+from src.sprites.attributes.poolable import PoolMixin
 
 
 class GameState(metaclass=abc.ABCMeta):
@@ -33,17 +36,46 @@ class GameState(metaclass=abc.ABCMeta):
         pass
 
     @abc.abstractmethod
-    def draw(self, screen: pg.Surface) -> None:
+    def draw(self, screen: pg.Surface, alpha: float = 1.0) -> typing.Optional[typing.List[pg.Rect]]:
+        """Draws the state onto the screen.
+
+        :param screen: pygame Surface object representing the game's screen.
+        :param alpha: Fraction of a tick elapsed since the last update, for interpolating moving objects.
+        :return: The areas of the screen that changed, or None if the whole screen should be updated.
+        """
         pass
 
+    def _handle_window_event(self, event: pg.event.Event) -> None:
+        """Forces the UI to repaint the whole screen when the window is resized or uncovered."""
+        if event.type in (pg.VIDEORESIZE, pg.VIDEOEXPOSE):
+            self._game.ui.invalidate()
+
+    def _handle_profiler_event(self, event: pg.event.Event) -> None:
+        """Toggles the frame profiler and its overlay with F3, and streaming its frames to a file with F4."""
+        if event.type != pg.KEYDOWN:
+            return
+        if event.key == pg.K_F3:
+            profiler.toggle()
+            if not profiler.enabled():
+                # Repaint the area under the overlay.
+                self._game.ui.invalidate()
+        elif event.key == pg.K_F4 and profiler.enabled():
+            if profiler.exporting():
+                profiler.stop_export()
+            else:
+                profiler.start_export()
+
 
 class GameMainMenuState(GameState):
     """Main menu behavior for the Game class."""
+    _PROGRESS_RECT = pg.Rect(cfg.SCREEN_WIDTH // 4, cfg.SCREEN_HEIGHT - 48, cfg.SCREEN_WIDTH // 2, 12)
+
     def __init__(self, game):
         """Creates the splash image for the main menu."""
         GameState.__init__(self, game)
         self._menu_splash = pg.transform.scale(image_loader.get_image('blast_zone_splash.png'),
                                                (cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT))
+        self._showing_progress = True
 
     def _play(self) -> None:
         """Enters the main gameplay state."""
@@ -63,6 +95,8 @@ class GameMainMenuState(GameState):
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 sys.exit()
+            self._handle_window_event(event)
+            self._handle_profiler_event(event)
         input_manager.update_inputs()
         self._game.ui.process_inputs()
 
@@ -70,14 +104,39 @@ class GameMainMenuState(GameState):
         """Does nothing."""
         pass
 
-    def draw(self, screen: pg.Surface) -> None:
-        """Draws the game splash and the menu on top of it."""
-        screen.blit(self._menu_splash, self._menu_splash.get_rect())
-        self._game.ui.draw(screen)
+    def draw(self, screen: pg.Surface, alpha: float = 1.0) -> typing.List[pg.Rect]:
+        """Draws the game splash and the menu on top of it, repainting only the buttons that changed."""
+        if self._game.ui.needs_full_redraw:
+            screen.blit(self._menu_splash, self._menu_splash.get_rect())
+        dirty_rects = self._game.ui.draw(screen)
+        if self._showing_progress:
+            dirty_rects.append(self._draw_progress(screen))
+        return dirty_rects
+
+    def _draw_progress(self, screen: pg.Surface) -> pg.Rect:
+        """Draws a bar showing how many assets have been loaded in the background.
+
+        :param screen: pygame Surface object representing the game's screen.
+        :return: The area of the screen covered by the bar.
+        """
+        preloader = self._game.preloader
+        bar_rect = GameMainMenuState._PROGRESS_RECT
+        fill_rect = bar_rect.copy()
+        fill_rect.width = int(bar_rect.width * preloader.progress)
+        pg.draw.rect(screen, cfg.BLACK, bar_rect)
+        pg.draw.rect(screen, cfg.WHITE, fill_rect)
+        pg.draw.rect(screen, cfg.WHITE, bar_rect, 1)
+        if preloader.done:
+            # Repaint the splash over the bar on the next frame.
+            self._showing_progress = False
+            self._game.ui.invalidate()
+        return bar_rect
 
 
 class GamePlayingState(GameState):
     """Controls the main in-game (gameplay) behavior of the Game class."""
+    LEVEL_FILE = 'level_1.tmx'
+
     def __init__(self, game):
         GameState.__init__(self, game)
         self._level = None
@@ -87,8 +146,9 @@ class GamePlayingState(GameState):
         """Creates the game world."""
         # Clear the UI.
         self._game.ui.clear()
-        Timer.clear_timers()
-        self._level = Level('level_1.tmx')
+        timer.reset()
+        PoolMixin.clear_pools()
+        self._level = Level(GamePlayingState.LEVEL_FILE)
         self._paused = False
 
     def _main_menu(self) -> None:
@@ -99,7 +159,7 @@ class GamePlayingState(GameState):
         """Toggles the pause mode of the game."""
         if self._paused:
             self._game.ui.pop_menu()
-            Timer.unpause_timers()
+            timer.unpause()
         else:
             buttons = [
                 {'action': self._pause, 'text': 'Resume', 'size': 16, 'color': cfg.WHITE},
@@ -107,7 +167,7 @@ class GamePlayingState(GameState):
                 {'action': self._main_menu, 'text': 'Main Menu', 'size': 16, 'color': cfg.WHITE}
             ]
             self._game.ui.make_menu("Game Paused", 24, cfg.WHITE, buttons)
-            Timer.pause_timers()
+            timer.pause()
         self._paused = not self._paused
 
     def process_inputs(self) -> None:
@@ -115,6 +175,8 @@ class GamePlayingState(GameState):
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 sys.exit()
+            self._handle_window_event(event)
+            self._handle_profiler_event(event)
             if event.type == pg.KEYDOWN:
                 if event.key == pg.K_p and not self._is_game_over():
                     self._pause()
@@ -130,7 +192,7 @@ class GamePlayingState(GameState):
     def update(self, dt: float) -> None:
         """Updates the state of the game world and determines if game is over.
 
-        :param dt: Time since last frame.
+        :param dt: Duration of one simulation tick.
         :return: None
         """
         if not self._paused:
@@ -147,15 +209,20 @@ class GamePlayingState(GameState):
                     {'action': sys.exit, 'text': 'Exit', 'size': 16, 'color': cfg.WHITE}
                 ]
                 self._game.ui.make_menu(title, 24, cfg.WHITE, buttons)
-                Timer.pause_timers()
+                timer.pause()
                 self._paused = True
 
-    def draw(self, screen: pg.Surface) -> None:
-        """Draws the game's world and UI onto the screen.
+    def draw(self, screen: pg.Surface, alpha: float = 1.0) -> typing.Optional[typing.List[pg.Rect]]:
+        """Draws the game's world and UI onto the screen; while paused, only the changed menu areas are redrawn.
+
         :param screen: pygame Surface object representing the game's screen.
-        :return: None
+        :param alpha: Fraction of a tick elapsed since the last update, by which the world is interpolated.
+        :return: The areas of the screen that changed while paused, or None during gameplay.
         """
-        if not self._paused:
-            screen.fill(cfg.WHITE)
-            self._level.draw(screen)
+        if self._paused:
+            # The last frame of the world stays on screen beneath the menus.
+            return self._game.ui.draw(screen)
+        screen.fill(cfg.WHITE)
+        self._level.draw(screen, alpha)
         self._game.ui.draw(screen)
+        return None
@@ -0,0 +1,175 @@
+"""Runs a level without drawing it, on a virtual clock, as fast as the CPU allows.
+
+The player's tank is driven through the same input path as the keyboard and mouse, either by seeded random input or
+by a script, while the AI mobs play as usual. Use the headless.py script in the repository's root directory to run it,
+since the window must be created with the SDL dummy drivers.
+"""
+import json
+import random
+import time
+import typing
+import pygame as pg
+
+import src.config as cfg
+import src.input.input_manager as input_manager
+import src.utils.timer as timer
+from src.input.input_state import InputState
+from src.sprites.attributes.poolable import PoolMixin
+from src.utils.timer import VirtualClock
+from src.world.level import Level
+
+
+def _nearest_mob_pos(level: Level) -> pg.math.Vector2:
+    """Returns the position of the AI mob closest to the player, or the player's own position if none are left."""
+    player_pos = level.player.tank.pos
+    positions = [pg.math.Vector2(ai.sprite.rect.center) for ai in level.ai_mobs]
+    return min(positions, key=player_pos.distance_squared_to, default=player_pos)
+
+
+def feed_input(level: Level, actions: typing.Iterable[str], aim: pg.math.Vector2) -> None:
+    """Feeds actions to the level through the input manager, as if their keys had been pressed.
+
+    :param level: Level whose player receives the input.
+    :param actions: Names of the active actions, as in src/input/key_bindings.json.
+    :param aim: World position that the player aims at.
+    :return: None
+    """
+    input_manager.active_bindings.clear()
+    input_manager.mouse_state.clear()
+    for action in actions:
+        input_manager.active_bindings[action] = []
+    input_manager.mouse_state[InputState.MOUSE_LEFT] = InputState.STILL_RELEASED
+    level.process_inputs(aim)
+
+
+class RandomInput:
+    """Holds a random combination of movement keys for a number of ticks, while aiming at and firing on the nearest
+    AI mob."""
+    _MOVES = ((), ('forward',), ('reverse',))
+    _TURNS = ((), ('ccw_turn',), ('cw_turn',))
+
+    def __init__(self, seed: int = 0, hold_ticks: int = 30):
+        """
+        :param seed: Seed for the random choice of keys.
+        :param hold_ticks: Number of ticks that each combination of keys is held for.
+        """
+        self._random = random.Random(seed)
+        self._hold_ticks = hold_ticks
+        self._actions = ()
+
+    def actions(self, level: Level, tick: int) -> typing.Tuple[typing.Iterable[str], pg.math.Vector2]:
+        """Returns the action names that are active on the given tick and the world position to aim at."""
+        if tick % self._hold_ticks == 0:
+            self._actions = self._random.choice(RandomInput._MOVES) + self._random.choice(RandomInput._TURNS)
+        return self._actions + ('fire',), _nearest_mob_pos(level)
+
+
+class ScriptedInput:
+    """Replays a looping list of steps, each holding some actions for a number of ticks.
+
+    A script is a JSON list of steps such as {"ticks": 60, "actions": ["forward", "fire"], "aim": [400, 300]}. Actions
+    are the names in src/input/key_bindings.json. Without an "aim" position, the step aims at the nearest AI mob.
+    """
+    def __init__(self, steps: typing.List[dict]):
+        if not steps:
+            raise ValueError("Expected at least one step in the input script")
+        self._steps = steps
+        self._loop_ticks = sum(step['ticks'] for step in steps)
+
+    @classmethod
+    def load(cls, path: str) -> 'ScriptedInput':
+        """Reads a script from a JSON file."""
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def actions(self, level: Level, tick: int) -> typing.Tuple[typing.Iterable[str], pg.math.Vector2]:
+        """Returns the action names that are active on the given tick and the world position to aim at."""
+        tick %= self._loop_ticks
+        for step in self._steps:
+            if tick < step['ticks']:
+                break
+            tick -= step['ticks']
+        aim = step.get('aim')
+        return step.get('actions', ()), pg.math.Vector2(aim) if aim else _nearest_mob_pos(level)
+
+
+class HeadlessRunner:
+    """Steps a level in fixed ticks on a virtual clock, without drawing, and measures how fast it runs."""
+    def __init__(self, level_file: str, player_input=None, tick_rate: int = cfg.TICK_RATE, restart: bool = True,
+                 seed: int = 0):
+        """Switches every timer to a virtual clock and loads the level.
+
+        :param level_file: Filename of the level to load from the configuration file's map folder.
+        :param player_input: Object whose actions(level, tick) method drives the player; defaults to RandomInput.
+        :param tick_rate: Simulation ticks per simulated second.
+        :param restart: Whether to load the level again once the game is over, instead of stopping.
+        :param seed: Seed for the level's own random choices, e.g., AI patrol paths and item spawns.
+        """
+        self._level_file = level_file
+        self._input = player_input or RandomInput(seed)
+        self._dt = 1 / tick_rate
+        self._restart = restart
+        self._clock = VirtualClock()
+        timer.set_clock(self._clock)
+        random.seed(seed)
+        self._level = None
+        self._ticks = 0
+        self._rounds = 0
+        self._load_level()
+
+    @property
+    def level(self) -> Level:
+        return self._level
+
+    def _load_level(self) -> None:
+        """Discards the current game world, if any, and loads a new one."""
+        timer.reset()
+        PoolMixin.clear_pools()
+        self._level = Level(self._level_file, headless=True)
+
+    def _is_game_over(self) -> bool:
+        return not self._level.is_player_alive() or self._level.mob_count() == 0
+
+    def step(self) -> bool:
+        """Advances the game world by one tick.
+
+        :return: False once the game is over and the level isn't restarted; True otherwise.
+        """
+        feed_input(self._level, *self._input.actions(self._level, self._ticks))
+        self._level.update(self._dt)
+        self._clock.advance(self._dt * 1000)
+        self._ticks += 1
+        if self._is_game_over():
+            self._rounds += 1
+            if not self._restart:
+                return False
+            self._load_level()
+        return True
+
+    def run(self, ticks: int) -> typing.Dict[str, float]:
+        """Steps the game world as fast as possible and reports the simulation speed.
+
+        :param ticks: Maximum number of ticks to simulate.
+        :return: Dictionary with the ticks run, the simulated and wall-clock seconds, ticks per second, how many times
+            faster than real time the simulation ran, the slowest tick in milliseconds, and the games finished.
+        """
+        start_ticks = self._ticks
+        slowest = 0.0
+        start = time.perf_counter()
+        for _ in range(ticks):
+            tick_start = time.perf_counter()
+            running = self.step()
+            slowest = max(slowest, time.perf_counter() - tick_start)
+            if not running:
+                break
+        wall = time.perf_counter() - start
+        ran = self._ticks - start_ticks
+        return {
+            'ticks': ran,
+            'sim_seconds': ran * self._dt,
+            'wall_seconds': wall,
+            'ticks_per_second': ran / wall if wall else float('inf'),
+            'realtime_factor': ran * self._dt / wall if wall else float('inf'),
+            'slowest_tick_ms': slowest * 1000,
+            'rounds': self._rounds
+        }
@@ -0,0 +1,170 @@
+"""Packs the game's images and sounds into one pre-indexed bundle file, and reads its entries back lazily.
+
+Build the bundle after changing any asset with:
+
+    python -m src.services.bundle
+
+The bundle holds a JSON index followed by the raw pixels of every sprite sheet image (already cut out of its sheet),
+every extra PNG image, and the bytes of every sound. Loaders memory-map the file and only decode an entry the first
+time it's requested. A bundle that is older than the assets it was built from is ignored.
+"""
+import functools
+import json
+import mmap
+import os
+import struct
+import sys
+import typing
+import xml.etree.ElementTree as ElementTree
+import pygame as pg
+
+import src.config as cfg
+
+_MAGIC = b'BZBUNDL1'
+_HEADER = struct.Struct('<8sI')  # Magic bytes and index length.
+
+
+def _source_files() -> typing.List[str]:
+    """Returns the paths of every asset file that the bundle is built from."""
+    paths = []
+    for sheet in cfg.SPRITE_SHEETS:
+        paths.append(os.path.join(cfg.IMG_DIR, 'spritesheets', sheet['img']))
+        paths.append(os.path.join(cfg.IMG_DIR, 'spritesheets', sheet['xml']))
+    png_dir = os.path.join(cfg.IMG_DIR, 'png')
+    paths.extend(os.path.join(png_dir, f) for f in sorted(os.listdir(png_dir)) if f.lower().endswith('.png'))
+    paths.extend(os.path.join(cfg.SND_DIR, f) for f in sorted(os.listdir(cfg.SND_DIR)) if f.endswith('.wav'))
+    return paths
+
+
+def _fingerprint() -> typing.Dict[str, typing.List[int]]:
+    """Maps each source asset's path, relative to the game directory, to its size and modification time."""
+    fingerprint = {}
+    for path in _source_files():
+        stat = os.stat(path)
+        fingerprint[os.path.relpath(path, cfg.GAME_DIR)] = [stat.st_size, stat.st_mtime_ns]
+    return fingerprint
+
+
+class AssetBundle:
+    """Read-only, memory-mapped view of a bundle file."""
+    def __init__(self, path: str):
+        """Maps the bundle file and parses its index.
+
+        :param path: Location of the bundle file.
+        :raises ValueError: If the file is not a bundle.
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_len = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not an asset bundle")
+        self._index = json.loads(self._mmap[_HEADER.size:_HEADER.size + index_len])
+        self._data_start = _HEADER.size + index_len
+
+    @property
+    def image_names(self) -> typing.KeysView:
+        return self._index['images'].keys()
+
+    @property
+    def sound_names(self) -> typing.KeysView:
+        return self._index['sounds'].keys()
+
+    def is_current(self) -> bool:
+        """Checks whether the assets have not changed since the bundle was built."""
+        return self._index['fingerprint'] == _fingerprint()
+
+    def _entry_bytes(self, entry: dict) -> memoryview:
+        """Returns a view of an entry's data without copying it."""
+        start = self._data_start + entry['offset']
+        return memoryview(self._mmap)[start:start + entry['size']]
+
+    def image(self, name: str) -> pg.Surface:
+        """Decodes a bundled image into a new, unconverted surface.
+
+        :param name: Name of a sprite sheet image or extra PNG.
+        :return: Surface in the pixel format it was stored with.
+        """
+        entry = self._index['images'][name]
+        return pg.image.frombuffer(bytes(self._entry_bytes(entry)), tuple(entry['size_px']), entry['format'])
+
+    def image_has_alpha(self, name: str) -> bool:
+        """Checks whether a bundled image was stored with per-pixel alpha."""
+        return self._index['images'][name]['format'] == 'RGBA'
+
+    def sound_bytes(self, name: str) -> memoryview:
+        """Returns the undecoded bytes of a bundled sound file."""
+        return self._entry_bytes(self._index['sounds'][name])
+
+
+@functools.lru_cache(maxsize=None)
+def open_bundle(path: str = cfg.ASSET_BUNDLE) -> typing.Optional[AssetBundle]:
+    """Opens the asset bundle if bundles are enabled, and the file exists and is up-to-date; loaders share it.
+
+    :param path: Location of the bundle file.
+    :return: The opened AssetBundle, or None if the loose asset files should be used instead.
+    """
+    if not cfg.USE_ASSET_BUNDLE or not os.path.exists(path):
+        return None
+    try:
+        bundle = AssetBundle(path)
+    except (ValueError, struct.error) as err:
+        print(err, file=sys.stderr)
+        return None
+    if not bundle.is_current():
+        print("Asset bundle is out of date; loading asset files instead.")
+        return None
+    return bundle
+
+
+def build(path: str = cfg.ASSET_BUNDLE) -> None:
+    """Packs every sprite sheet image, extra PNG image, and sound into a bundle file.
+
+    :param path: Location of the bundle file to write.
+    :return: None
+    """
+    index = {'images': {}, 'sounds': {}, 'fingerprint': _fingerprint()}
+    blobs = []
+    offset = 0
+
+    def add(section: str, name: str, data: bytes, **info) -> None:
+        nonlocal offset
+        index[section][name] = {'offset': offset, 'size': len(data), **info}
+        blobs.append(data)
+        offset += len(data)
+
+    for sheet in cfg.SPRITE_SHEETS:
+        sheet_surf = pg.image.load(os.path.join(cfg.IMG_DIR, 'spritesheets', sheet['img']))
+        tree = ElementTree.parse(os.path.join(cfg.IMG_DIR, 'spritesheets', sheet['xml']))
+        for node in tree.getroot():
+            name = node.attrib['name']
+            if name in index['images']:
+                continue
+            x, y, w, h = [int(node.attrib[val]) for val in ('x', 'y', 'width', 'height')]
+            # Flattened onto an opaque surface, just like the image loader does for sprite sheet images.
+            image = pg.Surface((w, h))
+            image.blit(sheet_surf, (0, 0), pg.Rect(x, y, w, h))
+            add('images', name, pg.image.tostring(image, 'RGB'), size_px=[w, h], format='RGB')
+
+    png_dir = os.path.join(cfg.IMG_DIR, 'png')
+    for filename in sorted(os.listdir(png_dir)):
+        if filename.lower().endswith('.png'):
+            surf = pg.image.load(os.path.join(png_dir, filename))
+            fmt = 'RGBA' if surf.get_alpha() else 'RGB'
+            add('images', filename, pg.image.tostring(surf, fmt), size_px=list(surf.get_size()), format=fmt)
+
+    for filename in sorted(os.listdir(cfg.SND_DIR)):
+        if filename.endswith('.wav'):
+            with open(os.path.join(cfg.SND_DIR, filename), 'rb') as f:
+                add('sounds', filename, f.read())
+
+    index_bytes = json.dumps(index).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for blob in blobs:
+            f.write(blob)
+    print(f"Wrote {len(index['images'])} images and {len(index['sounds'])} sounds to {path}")
+
+
+if __name__ == '__main__':
+    build()
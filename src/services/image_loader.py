@@ -1,58 +1,145 @@
-"""Loads sprite sheet from top-level config.py file upon import"""
+"""Indexes the sprite sheets from top-level config.py file upon import; images are decoded when first needed."""
+import functools
 import sys
 import os
 import xml.etree.ElementTree as ElementTree
 import pygame as pg
 
 import src.config as cfg
+import src.services.bundle as asset_bundle
 
 
 class _ImageLoader:
     """Provides a simple interface for getting a sprite surface."""
-    def __init__(self, *sprite_sheets):
-        """ Loads all sprite sheets and saves each sprite's rectangle data.
+    def __init__(self, *sprite_sheets, bundle=None):
+        """ Indexes the sprite sheets' rectangle data; images are decoded on first use or by a Preloader.
 
         :param sprite_sheets: Tuple of dictionaries, with keys 'img' and 'xml', corresponding
                               to a sheet's image and corresponding XML file.
+        :param bundle: AssetBundle to decode images from lazily, or None to load the asset files.
         """
-        self._sprite_sheets = []
+        self._sheet_images = {}   # Maps each sprite sheet image name to its sheet's index and rectangle.
+        self._sheet_paths = []
+        self._sheet_surfs = []    # Converted sheet surfaces, or None for sheets that haven't been loaded yet.
+        self._extra_paths = {}
         self._extra_images = {}
-        print("Loading images...")
+        self._shared_images = {}  # Maps (name, colorkey) to the surface handed out to every caller.
+        self._bundle = bundle
+        # Bundled images are decoded on first use instead.
+        if bundle is None:
+            self._index_files(sprite_sheets)
+
+    def _index_files(self, sprite_sheets) -> None:
+        """ Reads the sprite sheets' XML files and finds the extra images, without decoding any image."""
         for sheet in sprite_sheets:
+            tree = ElementTree.parse(os.path.join(cfg.IMG_DIR, 'spritesheets', sheet['xml']))
+            for node in tree.getroot():
+                name = node.attrib['name']
+                # Earlier sheets take precedence over later ones for duplicate names.
+                if name not in self._sheet_images:
+                    rect = [int(node.attrib[val]) for val in ('x', 'y', 'width', 'height')]
+                    self._sheet_images[name] = (len(self._sheet_paths), rect)
+            self._sheet_paths.append(os.path.join(cfg.IMG_DIR, 'spritesheets', sheet['img']))
+            self._sheet_surfs.append(None)
+        for filename in os.listdir(os.path.join(cfg.IMG_DIR, 'png')):
+            if filename.lower().endswith(".png"):
+                self._extra_paths[filename] = os.path.join(cfg.IMG_DIR, 'png', filename)
+
+    @staticmethod
+    def _convert(surf: pg.Surface) -> pg.Surface:
+        """ Converts a loaded surface to the display's pixel format, keeping per-pixel alpha if it has any."""
+        if not surf.get_alpha():
+            return surf.convert()
+        return surf.convert_alpha()
+
+    def _get_sheet(self, index: int) -> pg.Surface:
+        """ Returns a converted sprite sheet surface, loading it now if it hasn't been loaded yet."""
+        if self._sheet_surfs[index] is None:
             try:
-                surf = pg.image.load(os.path.join(cfg.IMG_DIR, 'spritesheets', sheet['img']))
-                if not surf.get_alpha():
-                    surf = surf.convert()
-                else:
-                    surf = surf.convert_alpha()
-                tree = ElementTree.parse(os.path.join(cfg.IMG_DIR, 'spritesheets', sheet['xml']))
-                rectangles = {}
-                for node in tree.getroot():
-                    name = node.attrib['name']
-                    rectangles[name] = [int(node.attrib[val]) for val in ('x', 'y', 'width', 'height')]
-                self._sprite_sheets.append({'surf': surf, 'rectangles': rectangles})
+                self._sheet_surfs[index] = self._convert(pg.image.load(self._sheet_paths[index]))
             except pg.error as err:
                 print(err, file=sys.stderr)
                 raise SystemExit
-        for filename in os.listdir(os.path.join(cfg.IMG_DIR, 'png')):
-            if filename.lower().endswith(".png"):
-                surf = pg.image.load(os.path.join(cfg.IMG_DIR, 'png', filename))
-                if not surf.get_alpha():
-                    surf = surf.convert()
-                else:
-                    surf = surf.convert_alpha()
-                self._extra_images[filename] = surf
+        return self._sheet_surfs[index]
+
+    def _get_extra(self, name: str) -> pg.Surface:
+        """ Returns a converted extra image, loading it now if it hasn't been loaded yet."""
+        if name not in self._extra_images:
+            self._extra_images[name] = self._convert(pg.image.load(self._extra_paths[name]))
+        return self._extra_images[name]
+
+    def preload_jobs(self) -> list:
+        """ Returns Preloader jobs that decode every image not yet loaded, from the bundle or from the image files, to be
+        converted on the main thread."""
+        jobs = []
+        if self._bundle is not None:
+            for name in self._bundle.image_names:
+                if (name, None) not in self._shared_images:
+                    jobs.append((functools.partial(self._bundle.image, name),
+                                 functools.partial(self._finish_bundled, name)))
+            return jobs
+        for index, path in enumerate(self._sheet_paths):
+            if self._sheet_surfs[index] is None:
+                jobs.append((functools.partial(pg.image.load, path), functools.partial(self._finish_sheet, index)))
+        for name, path in self._extra_paths.items():
+            if name not in self._extra_images:
+                jobs.append((functools.partial(pg.image.load, path), functools.partial(self._finish_extra, name)))
+        return jobs
 
-    def get_image(self, name: str) -> pg.Surface:
-        """ Returns a surface corresponding with the given name
+    def _convert_bundled(self, name: str, surf: pg.Surface) -> pg.Surface:
+        """ Converts an image decoded from the bundle, keeping per-pixel alpha if it was stored with it."""
+        return surf.convert_alpha() if self._bundle.image_has_alpha(name) else surf.convert()
+
+    def _finish_bundled(self, name: str, surf: pg.Surface) -> None:
+        """ Converts a bundled image decoded by a Preloader, unless it was loaded on demand in the meantime."""
+        if (name, None) not in self._shared_images:
+            self._shared_images[(name, None)] = self._convert_bundled(name, surf)
+
+    def _finish_sheet(self, index: int, surf: pg.Surface) -> None:
+        """ Converts a sprite sheet decoded by a Preloader, unless it was loaded on demand in the meantime."""
+        if self._sheet_surfs[index] is None:
+            self._sheet_surfs[index] = self._convert(surf)
+
+    def _finish_extra(self, name: str, surf: pg.Surface) -> None:
+        """ Converts an extra image decoded by a Preloader, unless it was loaded on demand in the meantime."""
+        if name not in self._extra_images:
+            self._extra_images[name] = self._convert(surf)
+
+    def get_image(self, name: str, colorkey=None) -> pg.Surface:
+        """ Returns a shared surface corresponding with the given name; it must not be modified.
+
+        Every caller asking for the same name and colorkey receives the same surface, so code that draws on, fills, or
+        otherwise changes its image must use get_image_copy instead.
 
         :param name: Name of image as listed in the sprite sheet.
+        :param colorkey: Color to make transparent, or None to leave the image as loaded.
         :return: Pygame surface corresponding to the image name 'name'
         """
-        for sprite_sheet in self._sprite_sheets:
-            if name in sprite_sheet['rectangles']:
-                return _ImageLoader._create_surface(sprite_sheet['surf'], sprite_sheet['rectangles'][name])
-        return self._extra_images[name].copy()
+        key = (name, colorkey)
+        image = self._shared_images.get(key)
+        if image is None:
+            if colorkey is None:
+                if self._bundle is not None:
+                    image = self._convert_bundled(name, self._bundle.image(name))
+                elif name in self._sheet_images:
+                    index, rect = self._sheet_images[name]
+                    image = _ImageLoader._create_surface(self._get_sheet(index), rect)
+                else:
+                    image = self._get_extra(name)
+            else:
+                image = self.get_image(name).copy()
+                image.set_colorkey(colorkey)
+            self._shared_images[key] = image
+        return image
+
+    def get_image_copy(self, name: str, colorkey=None) -> pg.Surface:
+        """ Returns a private copy of the surface corresponding with the given name, which the caller may modify.
+
+        :param name: Name of image as listed in the sprite sheet.
+        :param colorkey: Color to make transparent, or None to leave the image as loaded.
+        :return: New pygame surface corresponding to the image name 'name'
+        """
+        return self.get_image(name, colorkey).copy()
 
     @classmethod
     def _create_surface(cls, sheet_surf: pg.Surface, rect: tuple) -> pg.Surface:
@@ -68,7 +155,9 @@ class _ImageLoader:
         return image
 
 
-# Loads all of the images for the game.
-_img_loader = _ImageLoader(*cfg.SPRITE_SHEETS)
+# Indexes all of the images for the game.
+_img_loader = _ImageLoader(*cfg.SPRITE_SHEETS, bundle=asset_bundle.open_bundle())
 # Globally available method for getting a loaded image.
 get_image = _img_loader.get_image
+get_image_copy = _img_loader.get_image_copy
+preload_jobs = _img_loader.preload_jobs
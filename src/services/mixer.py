@@ -0,0 +1,114 @@
+"""Decides which sound effects get a mixer channel, and pans them by where they happen in the game world.
+
+Sounds are played on a fixed budget of channels. Each sound has a cap on how many copies of it play at once and a
+cooldown between plays, so that sustained fire can't take every channel. Sounds that happen farther than a margin beyond
+the camera's view aren't played, and the rest are panned left or right by their position relative to the view.
+"""
+import typing
+import pygame as pg
+
+import src.config as cfg
+import src.utils.timer as timer
+
+
+class Mixer:
+    """Manages the voices, i.e., playing copies, of every sound effect on the mixer's channels."""
+    def __init__(self, channels: int = cfg.MIXER_CHANNELS, voice_limits: typing.Dict[str, int] = cfg.SFX_VOICE_LIMITS,
+                 cooldowns: typing.Dict[str, int] = cfg.SFX_COOLDOWNS, margin: int = cfg.SFX_HEARING_MARGIN):
+        """
+        :param channels: Number of mixer channels that sound effects may use at once.
+        :param voice_limits: Maximum number of voices per sound's filename; others use SFX_DEFAULT_VOICE_LIMIT.
+        :param cooldowns: Minimum game-time milliseconds between two plays of a sound, per filename; others have none.
+        :param margin: Pixels beyond each edge of the camera's view within which sounds are still heard.
+        """
+        self._channels = channels
+        self._voice_limits = voice_limits
+        self._cooldowns = cooldowns
+        self._margin = margin
+        self._listener = None
+        self._voices = {}  # Maps each sound's filename to the channels it was last played on, oldest first.
+        self._last_played = {}
+        self._stats = {'played': 0, 'culled': 0, 'cooled_down': 0, 'stolen': 0, 'dropped': 0}
+        self._initialized = False
+
+    def set_listener(self, view: typing.Optional[pg.Rect]) -> None:
+        """Sets the area of the world that the player sees, which sounds are culled and panned by.
+
+        :param view: The camera's rectangle in world coordinates, or None to play every sound centered.
+        :return: None
+        """
+        self._listener = view
+
+    def _volumes(self, pos: typing.Optional[typing.Sequence[float]]) -> typing.Optional[typing.Tuple[float, float]]:
+        """Returns the left and right volumes of a sound at a world position, or None if it's out of earshot."""
+        if pos is None or self._listener is None:
+            return 1.0, 1.0
+        hearing = self._listener.inflate(2 * self._margin, 2 * self._margin)
+        if not hearing.collidepoint(pos):
+            return None
+        # Pan from -1 (left edge of earshot) to 1 (right edge).
+        pan = (pos[0] - hearing.centerx) / (hearing.width / 2)
+        return min(1.0, 1.0 - pan), min(1.0, 1.0 + pan)
+
+    def _voices_of(self, filename: str, sound: pg.mixer.Sound) -> typing.List[pg.mixer.Channel]:
+        """Returns the channels still playing a sound, oldest first."""
+        voices = [channel for channel in self._voices.get(filename, ())
+                  if channel.get_busy() and channel.get_sound() is sound]
+        self._voices[filename] = voices
+        return voices
+
+    def play(self, filename: str, sound: pg.mixer.Sound, pos: typing.Sequence[float] = None) -> bool:
+        """Plays a sound if it's in earshot, off cooldown, and there's a channel for it.
+
+        When a sound already plays on as many channels as its voice limit, its oldest voice is cut short.
+
+        :param filename: Filename of the sound, by which its voice limit and cooldown are looked up.
+        :param sound: The decoded sound.
+        :param pos: World position of the sound's source, or None for sounds that aren't positioned.
+        :return: Whether the sound is played.
+        """
+        if not pg.mixer.get_init():
+            return False
+        if not self._initialized:
+            pg.mixer.set_num_channels(self._channels)
+            self._initialized = True
+        volumes = self._volumes(pos)
+        if volumes is None:
+            self._stats['culled'] += 1
+            return False
+        # Cooldowns are in game time, so they stand still while paused and follow the time scale and virtual clocks.
+        now = timer.now()
+        last_played = self._last_played.get(filename)
+        if last_played is not None and now - last_played < self._cooldowns.get(filename, 0):
+            self._stats['cooled_down'] += 1
+            return False
+
+        voices = self._voices_of(filename, sound)
+        if len(voices) >= self._voice_limits.get(filename, cfg.SFX_DEFAULT_VOICE_LIMIT):
+            channel = voices.pop(0)
+            channel.stop()
+            self._stats['stolen'] += 1
+        else:
+            channel = pg.mixer.find_channel()
+            if channel is None:
+                self._stats['dropped'] += 1
+                return False
+        channel.play(sound)
+        # A channel's volume is reset when it starts playing, so it's panned afterwards.
+        channel.set_volume(*volumes)
+        voices.append(channel)
+        self._last_played[filename] = now
+        self._stats['played'] += 1
+        return True
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Returns how many sounds were played, and how many were culled, on cooldown, cut short, or dropped."""
+        return dict(self._stats)
+
+
+# Global mixer used by the sound service.
+_mixer = Mixer()
+# Interface methods for the global mixer.
+set_listener = _mixer.set_listener
+play = _mixer.play
+stats = _mixer.stats
@@ -0,0 +1,68 @@
+"""Decodes assets on a worker thread and hands the results to the main thread to finish, i.e., to convert surfaces."""
+import queue
+import sys
+import threading
+import time
+import typing
+
+import src.config as cfg
+
+# A job is a decode function, run on the worker thread, and a finish function that receives its result on the main
+# thread. Finish functions must tolerate the asset having been loaded on demand in the meantime.
+Job = typing.Tuple[typing.Callable[[], typing.Any], typing.Callable[[typing.Any], None]]
+
+
+class Preloader:
+    """Runs a list of asset jobs in the background while the game keeps drawing frames."""
+    def __init__(self, jobs: typing.Iterable[Job] = ()):
+        self._jobs = list(jobs)
+        self._results = queue.Queue()
+        self._thread = None
+        self._finished = 0
+
+    def add(self, jobs: typing.Iterable[Job]) -> None:
+        """Adds jobs to run; must be called before start."""
+        if self._thread:
+            raise RuntimeError("Cannot add jobs after the preloader has started")
+        self._jobs.extend(jobs)
+
+    def start(self) -> None:
+        """Starts decoding on a daemon worker thread."""
+        self._thread = threading.Thread(target=self._work, name="asset-preloader", daemon=True)
+        self._thread.start()
+
+    def _work(self) -> None:
+        """Decodes every job in order, queueing the results for the main thread."""
+        for decode, finish in self._jobs:
+            try:
+                self._results.put((finish, decode(), None))
+            except Exception as err:
+                # The asset will be loaded on demand instead, which reports the error where it's needed.
+                self._results.put((finish, None, err))
+
+    @property
+    def progress(self) -> float:
+        """Returns the fraction of jobs that have been finished, between 0 and 1."""
+        return self._finished / len(self._jobs) if self._jobs else 1.0
+
+    @property
+    def done(self) -> bool:
+        return self._finished == len(self._jobs)
+
+    def pump(self, budget_ms: float = cfg.PRELOAD_BUDGET_MS) -> None:
+        """Finishes decoded jobs on the main thread, stopping early once the time budget has been spent.
+
+        :param budget_ms: Milliseconds that may be spent finishing jobs this frame.
+        :return: None
+        """
+        deadline = time.perf_counter() + budget_ms / 1000
+        while time.perf_counter() < deadline:
+            try:
+                finish, result, err = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if err is None:
+                finish(result)
+            else:
+                print(f"Preloading failed: {err!r}", file=sys.stderr)
+            self._finished += 1
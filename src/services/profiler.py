@@ -0,0 +1,233 @@
+"""Times the phases of each frame into a ring buffer, which can be shown as an on-screen graph or streamed to a file.
+
+Profiling is off until toggled, i.e., with the F3 key in game; while it's off, phase() hands out a shared no-op context
+manager and end_frame() returns right away.
+"""
+import collections
+import contextlib
+import csv
+import json
+import time
+import typing
+import pygame as pg
+
+import src.config as cfg
+import src.services.text as text_renderer
+
+PHASES = ('input', 'ai', 'sprites', 'collisions', 'draw', 'flip')
+_PHASE_COLORS = {
+    'input': (120, 120, 255),
+    'ai': (255, 160, 0),
+    'sprites': (0, 200, 0),
+    'collisions': (255, 60, 60),
+    'draw': (0, 200, 255),
+    'flip': (200, 0, 200)
+}
+_GRAPH_SCALE = 4  # Pixels per millisecond.
+_TEXT_INTERVAL = 500  # Milliseconds between refreshes of the overlay's text.
+_TEXT_SIZE = 12
+
+
+class _Section:
+    """Context manager that adds the time spent within it to one phase of the profiler's current frame."""
+    __slots__ = ('_frame', '_name', '_start')
+
+    def __init__(self, frame: dict, name: str):
+        self._frame = frame
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self._frame[self._name] += (time.perf_counter() - self._start) * 1000
+
+
+class FrameProfiler:
+    """Collects per-phase frame times and per-frame counts, e.g., of sprites."""
+    def __init__(self, history: int = cfg.PROFILER_HISTORY):
+        """
+        :param history: Number of frames kept in the ring buffer.
+        """
+        self._enabled = False
+        self._frame = dict.fromkeys(PHASES, 0.0)
+        self._counts = {}
+        self._sections = {}
+        self._null_section = contextlib.nullcontext()
+        self._frames = collections.deque(maxlen=history)
+        self._export_file = None
+        self._export_writer = None
+        self._overlay = None
+        self._overlay_text = None
+        self._overlay_text_time = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def frames(self) -> typing.Deque[dict]:
+        """Returns the recorded frames, oldest first; each maps phase names to milliseconds and count names to
+        counts."""
+        return self._frames
+
+    def toggle(self) -> None:
+        """Turns profiling and its overlay on or off; the ring buffer is emptied when it's turned on."""
+        self._enabled = not self._enabled
+        if self._enabled:
+            self._frames.clear()
+            self._overlay = None
+        else:
+            self.stop_export()
+
+    def phase(self, name: str) -> typing.ContextManager:
+        """Returns a context manager that times a phase of the current frame, or a no-op one if profiling is off.
+
+        :param name: One of PHASES; time spent in the same phase several times a frame, e.g., once per tick, adds up.
+        :return: Context manager for a with statement.
+        """
+        if not self._enabled:
+            return self._null_section
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(self._frame, name)
+        return section
+
+    def count(self, name: str, value: int) -> None:
+        """Records a count for the current frame, e.g., the number of sprites in a group."""
+        if self._enabled:
+            self._counts[name] = value
+
+    def end_frame(self) -> None:
+        """Stores the current frame in the ring buffer, streams it to the export file if any, and starts a new one."""
+        if not self._enabled:
+            return
+        record = {**self._frame, **self._counts}
+        self._frames.append(record)
+        if self._export_writer:
+            self._export_writer(record)
+        for name in self._frame:
+            self._frame[name] = 0.0
+        # Counts are only recorded while something reports them, e.g., not in the menus once a level is left.
+        self._counts.clear()
+
+    def start_export(self, path: str = cfg.PROFILER_EXPORT_FILE) -> None:
+        """Streams every following frame to a file, as CSV if its name ends with .csv, or else as JSON lines.
+
+        :param path: Location of the file, which is overwritten.
+        :return: None
+        """
+        self.stop_export()
+        self._export_file = open(path, 'w+', newline='')
+        if path.endswith('.csv'):
+            csv_writer = csv.DictWriter(self._export_file, fieldnames=[])
+
+            def write_row(record: dict) -> None:
+                nonlocal csv_writer
+                if any(name not in csv_writer.fieldnames for name in record):
+                    # A count seen for the first time gets a column, so the rows written so far are rewritten under
+                    # the new header; this only happens a few times, i.e., when a level or the bullet engine starts.
+                    self._export_file.seek(0)
+                    rows = list(csv.DictReader(self._export_file))
+                    fieldnames = csv_writer.fieldnames + [name for name in record if name not in csv_writer.fieldnames]
+                    self._export_file.seek(0)
+                    self._export_file.truncate()
+                    csv_writer = csv.DictWriter(self._export_file, fieldnames=fieldnames)
+                    csv_writer.writeheader()
+                    csv_writer.writerows(rows)
+                csv_writer.writerow(record)
+            self._export_writer = write_row
+        else:
+            self._export_writer = lambda record: self._export_file.write(json.dumps(record) + '\n')
+
+    def stop_export(self) -> None:
+        """Closes the export file, if any."""
+        if self._export_file:
+            self._export_file.close()
+        self._export_file = None
+        self._export_writer = None
+
+    @property
+    def exporting(self) -> bool:
+        return self._export_file is not None
+
+    def _render_text(self, width: int) -> pg.Surface:
+        """Renders the mean time of each phase over the ring buffer and the latest counts."""
+        frames = self._frames
+        lines = [(f"frame: {sum(frames[-1][phase] for phase in PHASES):.2f} ms", cfg.WHITE)]
+        for phase in PHASES:
+            mean = sum(frame[phase] for frame in frames) / len(frames)
+            lines.append((f"{phase}: {mean:.2f} ms", _PHASE_COLORS[phase]))
+        lines.extend((f"{name}: {value}", cfg.WHITE) for name, value in frames[-1].items() if name not in PHASES)
+        if self.exporting:
+            lines.append((f"Exporting to {self._export_file.name}", cfg.YELLOW))
+        line_height = _TEXT_SIZE + 2
+        surf = pg.Surface((width, line_height * len(lines)), pg.SRCALPHA)
+        surf.fill((0, 0, 0, 160))
+        for i, (line, color) in enumerate(lines):
+            text_renderer.render(surf.subsurface(pg.Rect(2, i * line_height, width - 2, line_height)), line, _TEXT_SIZE,
+                                 color, location='w')
+        return surf
+
+    def draw(self, screen: pg.Surface) -> typing.Optional[pg.Rect]:
+        """Draws a scrolling graph of the phase times of recent frames, with their means and the latest counts.
+
+        :param screen: The screen surface that the overlay is drawn to.
+        :return: The area of the screen covered by the overlay, or None if nothing was drawn.
+        """
+        if not self._enabled or not self._frames:
+            return None
+        width = self._frames.maxlen
+        height = _GRAPH_SCALE * 1000 // cfg.FPS * 2
+        if self._overlay is None:
+            self._overlay = pg.Surface((width, height))
+            self._overlay.fill(cfg.BLACK)
+        # Scroll the graph by one column and stack the newest frame's phase times in it.
+        self._overlay.scroll(-1, 0)
+        self._overlay.fill(cfg.BLACK, pg.Rect(width - 1, 0, 1, height))
+        bottom = height
+        for phase in PHASES:
+            bar = self._frames[-1][phase] * _GRAPH_SCALE
+            if bar >= 1:
+                pg.draw.line(self._overlay, _PHASE_COLORS[phase], (width - 1, bottom), (width - 1, bottom - bar))
+            bottom -= bar
+        # Mark the frame budget.
+        budget_y = height - _GRAPH_SCALE * 1000 // cfg.FPS
+        self._overlay.set_at((width - 1, budget_y), cfg.WHITE)
+
+        now = pg.time.get_ticks()
+        if self._overlay_text is None or now - self._overlay_text_time > _TEXT_INTERVAL:
+            self._overlay_text = self._render_text(width)
+            self._overlay_text_time = now
+        rect = pg.Rect(screen.get_width() - width, 0, width, height + self._overlay_text.get_height())
+        screen.blit(self._overlay, rect)
+        screen.blit(self._overlay_text, (rect.x, rect.y + height))
+        return rect
+
+
+# Global profiler shared by the game loop and the game world.
+_profiler = FrameProfiler()
+# Interface methods with the global profiler object.
+phase = _profiler.phase
+count = _profiler.count
+end_frame = _profiler.end_frame
+toggle = _profiler.toggle
+start_export = _profiler.start_export
+stop_export = _profiler.stop_export
+draw = _profiler.draw
+
+
+def enabled() -> bool:
+    """Checks if profiling is turned on."""
+    return _profiler.enabled
+
+
+def exporting() -> bool:
+    """Checks if frames are being streamed to a file."""
+    return _profiler.exporting
+
+
+def frames() -> typing.Deque[dict]:
+    """Returns the recorded frames, oldest first."""
+    return _profiler.frames
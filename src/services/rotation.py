@@ -0,0 +1,96 @@
+"""Process-wide cache of pre-rotated surfaces, shared by every sprite that rotates its image."""
+import collections
+import typing
+import pygame as pg
+
+import src.config as cfg
+import src.services.image_loader as image_loader
+
+
+class _RotationCache:
+    """LRU cache of rotated surfaces keyed by source image and angle bucket."""
+    def __init__(self, step: float, max_size: int):
+        """Creates an empty cache.
+
+        :param step: Size in degrees of each angle bucket; requested angles are rounded to the nearest bucket.
+        :param max_size: Maximum number of rotated surfaces kept before the least recently used is evicted.
+        """
+        if step <= 0:
+            raise ValueError(f"Expected positive step, but received {step}")
+        self._step = step
+        self._buckets = max(1, round(360 / step))
+        self._max_size = max_size
+        self._surfaces = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _bucket(self, angle: float) -> int:
+        """Returns the index of the angle bucket closest to the given angle."""
+        return round(angle / self._step) % self._buckets
+
+    def rotate(self, image: pg.Surface, angle: float, key: typing.Hashable = None) -> pg.Surface:
+        """Returns image rotated by angle (rounded to the cache's step), rotating it only on a cache miss.
+
+        :param image: Source surface to rotate.
+        :param angle: Counter-clockwise rotation in degrees.
+        :param key: Identifies the source image, i.e., its sprite sheet name; defaults to the surface itself.
+        :return: A rotated surface that is shared with other callers and must not be modified.
+        """
+        cache_key = (image if key is None else key, self._bucket(angle))
+        surf = self._surfaces.get(cache_key)
+        if surf is not None:
+            self._hits += 1
+            self._surfaces.move_to_end(cache_key)
+            return surf
+        self._misses += 1
+        return self._store(cache_key, image)
+
+    def _store(self, cache_key: tuple, image: pg.Surface) -> pg.Surface:
+        """Rotates image into the bucket named by cache_key and caches it, evicting the oldest entry if full."""
+        surf = pg.transform.rotate(image, cache_key[1] * self._step)
+        self._surfaces[cache_key] = surf
+        if len(self._surfaces) > self._max_size:
+            self._surfaces.popitem(last=False)
+            self._evictions += 1
+        return surf
+
+    def warm_up(self, names: typing.Iterable[str]) -> None:
+        """Pre-rotates the named sprite sheet images into every angle bucket without counting misses.
+
+        :param names: Image names as understood by the image loader.
+        :return: None
+        """
+        for name in names:
+            image = image_loader.get_image(name, cfg.BLACK)
+            for bucket in range(self._buckets):
+                cache_key = (name, bucket)
+                if cache_key not in self._surfaces:
+                    self._store(cache_key, image)
+
+    def stats(self) -> typing.Dict[str, float]:
+        """Returns the cache's size, hit and miss counts, evictions, and hit rate."""
+        lookups = self._hits + self._misses
+        return {
+            'size': len(self._surfaces),
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'hit_rate': self._hits / lookups if lookups else 0.0
+        }
+
+    def clear(self) -> None:
+        """Drops every cached surface and resets the counters."""
+        self._surfaces.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+
+# Global rotation cache.
+_rotation_cache = _RotationCache(cfg.ROTATION_CACHE_STEP, cfg.ROTATION_CACHE_SIZE)
+# Interface methods for the global cache.
+rotate = _rotation_cache.rotate
+warm_up = _rotation_cache.warm_up
+stats = _rotation_cache.stats
+clear = _rotation_cache.clear
@@ -1,27 +1,58 @@
+import functools
+import io
 import os
+import typing
 import pygame as pg
 
 import src.config as cfg
+import src.services.bundle as asset_bundle
+import src.services.mixer as mixer
 
 
 class Sound:
     """Class for handling all sounds in the game."""
-    def __init__(self):
-        """Loads all sounds and stores them."""
+    def __init__(self, bundle=None):
+        """Finds all sounds; each is decoded on first use, or earlier by a Preloader."""
         # self._music = {}
         self._sfx = {}
-        print("Loading all sounds...")
-        for filename in os.listdir(cfg.SND_DIR):
-            if filename.endswith(".wav"):
-                filepath = os.path.join(cfg.SND_DIR, filename)
-                self._sfx[filename] = pg.mixer.Sound(filepath)
+        self._bundle = bundle
+        if bundle is None:
+            self._filenames = [filename for filename in os.listdir(cfg.SND_DIR) if filename.endswith(".wav")]
+        else:
+            self._filenames = list(bundle.sound_names)
 
-    def play(self, filename: str) -> None:
-        """Plays a sound effect whose name is indicated by the provided filename."""
-        self._sfx[filename].play()
+    def _decode(self, filename: str) -> pg.mixer.Sound:
+        """Decodes a sound from the bundle or from its file; safe to call from a worker thread."""
+        if self._bundle is not None:
+            return pg.mixer.Sound(file=io.BytesIO(self._bundle.sound_bytes(filename)))
+        return pg.mixer.Sound(os.path.join(cfg.SND_DIR, filename))
+
+    def _get_sound(self, filename: str) -> pg.mixer.Sound:
+        """Returns the sound for a filename, decoding it if it hasn't been used yet."""
+        sfx = self._sfx.get(filename)
+        if sfx is None:
+            sfx = self._decode(filename)
+            self._sfx[filename] = sfx
+        return sfx
+
+    def preload_jobs(self) -> list:
+        """Returns Preloader jobs that decode every sound not yet loaded."""
+        return [(functools.partial(self._decode, filename), functools.partial(self._sfx.setdefault, filename))
+                for filename in self._filenames if filename not in self._sfx]
+
+    def play(self, filename: str, pos: typing.Sequence[float] = None) -> None:
+        """Plays a sound effect whose name is indicated by the provided filename, if the mixer lets it.
+
+        :param filename: Filename of the sound effect.
+        :param pos: World position of the sound's source, by which it's culled and panned; None plays it centered.
+        :return: None
+        """
+        mixer.play(filename, self._get_sound(filename), pos)
 
 
 # Global sound class.
-_sound_loader = Sound()
+_sound_loader = Sound(asset_bundle.open_bundle())
 # Interface methods for the global class.
 play = _sound_loader.play
+set_listener = mixer.set_listener
+preload_jobs = _sound_loader.preload_jobs
@@ -1,3 +1,4 @@
+import collections
 import typing
 import pygame as pg
 
@@ -6,19 +7,66 @@ import src.config as cfg
 
 
 class TextRenderer:
-    def __init__(self):
-        # Load all fonts
-        self._fonts = {font: pg.font.match_font(font) for font in cfg.FONT_NAMES}
+    def __init__(self, max_surfaces=cfg.TEXT_CACHE_SIZE):
+        # Font file paths by name, looked up on first use since searching the system fonts is slow
+        self._fonts = {}
+        # Font objects by (font name, size), since creating one reads and parses the font file.
+        self._font_objects = {}
+        # LRU cache of rendered text surfaces by (font name, text, size, color, antialias).
+        self._surfaces = collections.OrderedDict()
+        self._max_surfaces = max_surfaces
+        self._hits = 0
+        self._misses = 0
 
-    def _render_text_surface(self, text, size, color, font_name='arial') -> typing.Tuple[pg.Surface, pg.Rect]:
-        # Create font object
-        font_object = pg.font.Font(self._fonts[font_name], size)
+    def _get_font(self, font_name, size) -> pg.font.Font:
+        # Create font object only the first time a font and size are used
+        font_object = self._font_objects.get((font_name, size))
+        if font_object is None:
+            if font_name not in self._fonts:
+                self._fonts[font_name] = pg.font.match_font(font_name)
+            font_object = pg.font.Font(self._fonts[font_name], size)
+            self._font_objects[(font_name, size)] = font_object
+        return font_object
 
-        # Create a text surface
-        text_surface = font_object.render(text, True, color)
+    def _render_text_surface(self, text, size, color, font_name='arial',
+                             antialias=True) -> typing.Tuple[pg.Surface, pg.Rect]:
+        # Reuse a previously rendered text surface; it's shared, so callers must not modify it
+        key = (font_name, text, size, tuple(color), antialias)
+        text_surface = self._surfaces.get(key)
+        if text_surface is not None:
+            self._hits += 1
+            self._surfaces.move_to_end(key)
+        else:
+            self._misses += 1
+            # Create a text surface
+            text_surface = self._get_font(font_name, size).render(text, antialias, color)
+            self._surfaces[key] = text_surface
+            if len(self._surfaces) > self._max_surfaces:
+                self._surfaces.popitem(last=False)
         text_rect = text_surface.get_rect()
         return text_surface, text_rect
 
+    def preload_jobs(self) -> list:
+        """Returns a Preloader job that searches the system for the game's fonts."""
+        def find_fonts():
+            return {font: pg.font.match_font(font) for font in cfg.FONT_NAMES}
+
+        def store_fonts(paths):
+            for font, path in paths.items():
+                self._fonts.setdefault(font, path)
+        return [(find_fonts, store_fonts)]
+
+    def stats(self) -> typing.Dict[str, float]:
+        """Returns the number of cached fonts and text surfaces, and the text cache's hit and miss counts."""
+        lookups = self._hits + self._misses
+        return {
+            'fonts': len(self._font_objects),
+            'surfaces': len(self._surfaces),
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self._hits / lookups if lookups else 0.0
+        }
+
         # Render at specified (x, y) [overloaded below]
     def render_pos(self, surface, x, y, text, size, color, font_name='arial') -> None:
         text_surface, text_rect = self._render_text_surface(text, size, color, font_name)
@@ -56,3 +104,5 @@ _text_renderer = TextRenderer()
 
 render = _text_renderer.render
 render_pos = _text_renderer.render_pos
+stats = _text_renderer.stats
+preload_jobs = _text_renderer.preload_jobs
@@ -27,9 +27,7 @@ class AnimatedSprite(BaseSprite):
 
         # Load all images for this sprite.
         self._images = [self.image]
-        self._images.extend([image_loader.get_image(img) for img in images[1:]])
-        for image in self._images:
-            image.set_colorkey(cfg.BLACK)
+        self._images.extend([image_loader.get_image(img, cfg.BLACK) for img in images[1:]])
 
         # Store animation data.
         self._frame_info = frame_info
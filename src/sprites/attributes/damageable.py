@@ -1,3 +1,4 @@
+import functools
 import pygame as pg
 import typing
 
@@ -8,6 +9,24 @@ from src.sprites.base_sprite import BaseSprite
 _MAX_HEALTH = 100
 
 
+@functools.lru_cache(maxsize=512)
+def _health_bar_image(health: float, max_health: float, width: int, height: int) -> pg.Surface:
+    """Renders a health bar for the given health, shared by every sprite with the same health and bar size."""
+    pct = health / max_health
+    color = cfg.TRANSPARENT
+    if pct > 0.7:
+        color = cfg.GREEN
+    elif pct > 0.3:
+        color = cfg.YELLOW
+    elif pct > 0:
+        color = cfg.RED
+
+    image = pg.Surface((width, height), pg.SRCALPHA)
+    pg.draw.rect(image, color, pg.Rect(0, 0, int(width * pct), height))
+    pg.draw.rect(image, cfg.BLACK, image.get_rect(), 2)
+    return image
+
+
 class DamageMixin:
     """Mixin class that an object whose class is BaseSprite can subclass to obtain health-related attributes."""
     MAX_HEALTH = 100
@@ -33,26 +52,14 @@ class DamageMixin:
         if self.health < 0:
             self.health = 0
 
+    def health_bar_image(self, width: int, height: int) -> pg.Surface:
+        """Returns a cached health bar surface for the sprite's current health; it must not be modified."""
+        return _health_bar_image(self.health, self.MAX_HEALTH, int(width), int(height))
+
     def draw_health(self, surface: pg.Surface, camera, outline_rect=None) -> None:
         """Draw's a health bar display on the sprite."""
         # surface is generally the screen we draw on.
-        pct = self.health / self.MAX_HEALTH
-        color = cfg.TRANSPARENT
-        if pct > 0.7:
-            color = cfg.GREEN
-        elif pct > 0.3:
-            color = cfg.YELLOW
-        elif pct > 0:
-            color = cfg.RED
-
-        if outline_rect:
-            fill_rect = outline_rect.copy()
-        else:
-            fill_rect = self.hit_rect.copy()
-            fill_rect.height = fill_rect.height // 3
-            outline_rect = fill_rect.copy()
-
-        fill_rect.width *= pct
-
-        pg.draw.rect(surface, color, camera.apply(fill_rect))
-        pg.draw.rect(surface, cfg.BLACK, camera.apply(outline_rect), 2)
+        if not outline_rect:
+            outline_rect = self.hit_rect.copy()
+            outline_rect.height = outline_rect.height // 3
+        surface.blit(self.health_bar_image(outline_rect.width, outline_rect.height), camera.apply(outline_rect))
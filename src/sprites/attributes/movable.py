@@ -37,16 +37,16 @@ class MoveNonlinearMixin(MoveMixin):
         self.acc = pg.math.Vector2(0, 0)
 
     def move(self: typing.Union[BaseSprite, 'MoveNonlinearMixin'], dt: float) -> None:
-        """Updates the acceleration, velocity, and position of this object, and handles collisions."""
-        # Simulate friction.
-        self.acc -= _FRICTION_MU * self.vel
+        """Updates the velocity and position of this object, and handles collisions."""
+        # Simulate friction without altering the acceleration, which stays set by the controller over several ticks.
+        acc = self.acc - _FRICTION_MU * self.vel
 
         # Effect kinematic equations.
-        self.vel += self.acc * dt
+        self.vel += acc * dt
         if self.vel.length_squared() < _EPSILON:
             self.vel.x = 0
             self.vel.y = 0
             displacement = pg.math.Vector2(0, 0)
         else:
-            displacement = (self.vel * dt) + (0.5 * self.acc * dt**2)
+            displacement = (self.vel * dt) + (0.5 * acc * dt**2)
         self._hit_wall = collision_handler.handle_obstacle_collisions(self, displacement)
@@ -0,0 +1,55 @@
+import abc
+import typing
+
+from src.sprites.base_sprite import BaseSprite
+
+
+class PoolMixin:
+    """Mixin class for short-lived sprites that are recycled through a per-class free list once killed.
+
+    A pooled class implements reset() with the same parameters as its constructor, restoring the per-use state and
+    re-adding the sprite to its groups. Sprites are obtained with spawn() and returned to the pool by calling release()
+    from kill().
+    """
+    POOL_SIZE = 128
+    _free = {}   # Maps each pooled class to its list of killed, reusable sprites.
+    _stats = {}  # Maps each pooled class to its 'created' and 'reused' counts.
+
+    @classmethod
+    def spawn(cls, *args, **kwargs):
+        """Returns a reset sprite from the pool if one is available; otherwise, builds a new one."""
+        free = PoolMixin._free.setdefault(cls, [])
+        stats = PoolMixin._stats.setdefault(cls, {'created': 0, 'reused': 0})
+        if free:
+            sprite = free.pop()
+            sprite._in_pool = False
+            sprite.reset(*args, **kwargs)
+            stats['reused'] += 1
+        else:
+            sprite = cls(*args, **kwargs)
+            stats['created'] += 1
+        return sprite
+
+    @abc.abstractmethod
+    def reset(self, *args, **kwargs) -> None:
+        """Restores the state of a recycled sprite, as if it had been built with the same arguments."""
+        pass
+
+    def release(self: typing.Union[BaseSprite, 'PoolMixin']) -> None:
+        """Returns a killed sprite to its class's pool, unless it's already there or the pool is full."""
+        free = PoolMixin._free.setdefault(type(self), [])
+        if not getattr(self, '_in_pool', False) and len(free) < self.POOL_SIZE:
+            self._in_pool = True
+            free.append(self)
+
+    @classmethod
+    def pool_stats(cls) -> typing.Dict[str, typing.Dict[str, int]]:
+        """Returns, for each pooled class name, how many sprites were created, reused, and are free for reuse."""
+        return {pooled_cls.__name__: {**stats, 'free': len(PoolMixin._free.get(pooled_cls, []))}
+                for pooled_cls, stats in PoolMixin._stats.items()}
+
+    @classmethod
+    def clear_pools(cls) -> None:
+        """Drops every pooled sprite, i.e., when the game world they belong to is discarded."""
+        PoolMixin._free.clear()
+        PoolMixin._stats.clear()
@@ -2,6 +2,7 @@ import pygame as pg
 import typing
 
 import src.config as cfg
+import src.services.rotation as rotation
 from src.sprites.base_sprite import BaseSprite
 
 
@@ -17,13 +18,21 @@ class RotateMixin:
     def rotate(self: typing.Union[BaseSprite, 'RotateMixin'], dt=0) -> None:
         """Updates the rot attribute and rotates the image accordingly."""
         self.rot = (self.rot + self.rot_speed * dt) % 360
-        self.rotate_image(self, self._orig_image, self.rot - cfg.DEFAULT_IMAGE_ROT)
+        self.rotate_image(self, self._orig_image, self.rot - cfg.DEFAULT_IMAGE_ROT, self.image_name)
+
+    def image_at(self: typing.Union[BaseSprite, 'RotateMixin'], rot: float) -> pg.Surface:
+        """Returns the sprite's (shared) image rotated to the given rotation, without changing the sprite."""
+        return rotation.rotate(self._orig_image, rot - cfg.DEFAULT_IMAGE_ROT, self.image_name)
 
     @staticmethod
-    def rotate_image(sprite: BaseSprite, image: pg.Surface, angle: float) -> None:
-        """Rotates the sprite's image while keeping it centered at the same center-coordinates."""
+    def rotate_image(sprite: BaseSprite, image: pg.Surface, angle: float, key=None) -> None:
+        """Rotates the sprite's image while keeping it centered at the same center-coordinates.
+
+        The rotated image comes from the shared rotation cache, so it must not be modified in-place. The key names the
+        source image in the cache, which lets sprites built from the same sprite sheet image share rotations.
+        """
         old_center = sprite.rect.center
-        sprite.image = pg.transform.rotate(image, angle)
+        sprite.image = rotation.rotate(image, angle, key)
         sprite.rect = sprite.image.get_rect()
         sprite.rect.center = old_center
         sprite.hit_rect.center = sprite.rect.center
@@ -45,6 +45,11 @@ class Barrel(BaseSprite, RotateMixin):
         """Returns a string representing the barrel's color."""
         return self._color
 
+    @property
+    def bullet_image(self) -> str:
+        """Returns the name of the image used by the bullets this barrel fires."""
+        return Bullet.image_for(self._category, self._color)
+
     @property
     def ammo_count(self) -> int:
         """Returns the current ammo count for this barrel."""
@@ -70,15 +75,15 @@ class Barrel(BaseSprite, RotateMixin):
         """Fires a Bullet if enough time has passed and if there's ammo."""
         if self._ammo_count > 0 and self._fire_timer.elapsed() > self._fire_delay:
             self._spawn_bullet()
-            sfx_loader.play(Barrel._FIRE_SFX)
+            sfx_loader.play(Barrel._FIRE_SFX, self.rect.center)
             self._fire_timer.restart()
 
     def _spawn_bullet(self) -> None:
         """Spawns a Bullet object from the Barrel's nozzle."""
         fire_pos = pg.math.Vector2(self.hit_rect.height, 0).rotate(-self.rot)
         fire_pos.xy += self.rect.center
-        Bullet(fire_pos.x, fire_pos.y, self.rot, self._color, self._category, self._parent, self.all_groups)
-        MuzzleFlash(*fire_pos, self.rot, self.all_groups)
+        Bullet.fire(fire_pos.x, fire_pos.y, self.rot, self._color, self._category, self._parent, self.all_groups)
+        MuzzleFlash.spawn(*fire_pos, self.rot, self.all_groups)
         self._ammo_count -= 1
 
     def reload(self) -> None:
@@ -7,16 +7,20 @@ import src.services.image_loader as image_loader
 
 class BaseSprite(pg.sprite.Sprite, metaclass=abc.ABCMeta):
     """An abstract base class that derives from the pygame Sprite class."""
-    def __init__(self, image: str, all_groups, *groups: pg.sprite.Group):
+    def __init__(self, image: str, all_groups, *groups: pg.sprite.Group, private_image: bool = False):
         """
 
         :param image: Filename for this sprite's image.
         :param all_groups: A dictionary of sprite groups.
         :param groups: A sequence of sprite groups that this sprite will be added to.
+        :param private_image: Whether the sprite modifies its image in-place and so needs its own copy of it.
         """
         pg.sprite.Sprite.__init__(self, *groups)
-        self.image = image_loader.get_image(image)
-        self.image.set_colorkey(cfg.BLACK)
+        self.image_name = image
+        if private_image:
+            self.image = image_loader.get_image_copy(image, cfg.BLACK)
+        else:
+            self.image = image_loader.get_image(image, cfg.BLACK)
         self.all_groups = all_groups
         self.rect = self.image.get_rect()
         self.hit_rect = self.rect  # Untransformed rectangle for collision-handling.
@@ -2,9 +2,11 @@ import typing
 import pygame as pg
 
 import src.config as cfg
+import src.services.image_loader as image_loader
 from src.sprites.base_sprite import BaseSprite
 from src.sprites.attributes.movable import MoveMixin
 from src.sprites.attributes.rotateable import RotateMixin
+from src.sprites.attributes.poolable import PoolMixin
 from src.utils.timer import Timer
 
 
@@ -21,22 +23,47 @@ _STATS = {
 
 
 # TODO: Consider implementing a humming bullet.
-class Bullet(BaseSprite, MoveMixin):
-    """Sprite class that models a Bullet object."""
+class Bullet(BaseSprite, MoveMixin, PoolMixin):
+    """Sprite class that models a Bullet object; use Bullet.spawn to reuse killed bullets."""
     IMAGE_ROT = 90  # See sprite sheet.
+    engine = None  # The level's BulletEngine, if bullets are kept in it instead of being sprites.
 
     def __init__(self, x: float, y: float, angle: float, color: str, category: str, owner,
                  all_groups: typing.Dict[str, pg.sprite.Group]):
         """Creates a bullet object, rotating it to face the correct direction."""
         self._layer = cfg.ITEM_LAYER
-        BaseSprite.__init__(self, _IMAGES[category][color], all_groups, all_groups['all'], all_groups['bullets'])
+        BaseSprite.__init__(self, _IMAGES[category][color], all_groups)
+        self._source_image = self.image
+        self._spawn_timer = Timer()
+        self.reset(x, y, angle, color, category, owner, all_groups)
+
+    def reset(self, x: float, y: float, angle: float, color: str, category: str, owner,
+              all_groups: typing.Dict[str, pg.sprite.Group]) -> None:
+        """Places the bullet at its starting position and adds it back to the bullet groups."""
+        if self.image_name != _IMAGES[category][color]:
+            self.image_name = _IMAGES[category][color]
+            self._source_image = image_loader.get_image(self.image_name, cfg.BLACK)
+        self.all_groups = all_groups
         MoveMixin.__init__(self, x, y)
+        self.prev_pos = pg.math.Vector2(x, y)  # Position before the latest move, from which collisions are swept.
         self.vel = pg.math.Vector2(_STATS[category]["speed"], 0).rotate(-angle)
         self._damage = _STATS[category]["damage"]
         self._lifetime = _STATS[category]["lifetime"]
-        self._spawn_timer = Timer()
+        self._spawn_timer.restart()
         self._owner = owner
-        RotateMixin.rotate_image(self, self.image, angle - Bullet.IMAGE_ROT)
+        self.rect = self._source_image.get_rect(center=(x, y))
+        self.hit_rect = self._source_image.get_rect(center=(x, y))
+        RotateMixin.rotate_image(self, self._source_image, angle - Bullet.IMAGE_ROT, self.image_name)
+        self.add(all_groups['all'], all_groups['bullets'])
+
+    @classmethod
+    def fire(cls, x: float, y: float, angle: float, color: str, category: str, owner,
+             all_groups: typing.Dict[str, pg.sprite.Group]) -> None:
+        """Fires a bullet, either into the level's BulletEngine or as a pooled sprite."""
+        if cls.engine is not None:
+            cls.engine.spawn(x, y, angle, color, category, owner)
+        else:
+            cls.spawn(x, y, angle, color, category, owner, all_groups)
 
     @property
     def owner(self):
@@ -50,6 +77,16 @@ class Bullet(BaseSprite, MoveMixin):
         """Returns the range that this bullet can travel before it vanishes."""
         return _STATS[category]["speed"] * (_STATS[category]["lifetime"] / 1000)
 
+    @classmethod
+    def stats(cls, category: str) -> typing.Dict[str, int]:
+        """Returns the damage, speed, and lifetime in milliseconds of bullets of the given category."""
+        return _STATS[category]
+
+    @classmethod
+    def image_for(cls, category: str, color: str) -> str:
+        """Returns the name of the image used by bullets of the given category and color."""
+        return _IMAGES[category][color]
+
     @property
     def damage(self) -> int:
         """Returns the damage that this bullet can cause upon collision."""
@@ -60,4 +97,11 @@ class Bullet(BaseSprite, MoveMixin):
         if self._spawn_timer.elapsed() > self._lifetime:
             self.kill()
         else:
+            self.prev_pos.update(self.pos)
             self.move(dt)
+
+    def kill(self) -> None:
+        """Removes the bullet from all groups and returns it to the pool."""
+        self._owner = None
+        super().kill()
+        self.release()
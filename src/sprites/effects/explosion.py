@@ -1,11 +1,12 @@
 import src.config as cfg
 from src.sprites.animated_sprite import AnimatedSprite
+from src.sprites.attributes.poolable import PoolMixin
 
 
 _IMAGES = [f'explosion{i}.png' for i in range(1, 6)]
 
 
-class Explosion(AnimatedSprite):
+class Explosion(AnimatedSprite, PoolMixin):
     """Explosion class for game explosion animation."""
     def __init__(self, x: float, y: float, all_groups):
         """
@@ -16,11 +17,23 @@ class Explosion(AnimatedSprite):
         """
         self._layer = cfg.EFFECTS_LAYER
         frame_info = [{'start_frame': 0, 'num_frames': len(_IMAGES)}]
-        AnimatedSprite.__init__(self, _IMAGES, frame_info, all_groups, all_groups['all'],)
+        AnimatedSprite.__init__(self, _IMAGES, frame_info, all_groups)
         self.anim_fps = 48.0
+        self.reset(x, y, all_groups)
+
+    def reset(self, x: float, y: float, all_groups) -> None:
+        """Restarts the animation of a recycled Explosion at a new position."""
+        self.all_groups = all_groups
+        self.change_anim(0)
         self.rect.center = (x, y)
+        self.add(all_groups['all'])
 
     def _handle_last_frame(self) -> None:
         """Upon reaching the last frame of the Explosion's animation, the sprite is killed (no longer drawn)."""
         self._current_frame = 0
         self.kill()
+
+    def kill(self) -> None:
+        """Removes the explosion from all groups and returns it to the pool."""
+        super().kill()
+        self.release()
@@ -1,10 +1,11 @@
 import src.config as cfg
 from src.sprites.base_sprite import BaseSprite
 from src.sprites.attributes.rotateable import RotateMixin
+from src.sprites.attributes.poolable import PoolMixin
 from src.utils.timer import Timer
 
 
-class MuzzleFlash(BaseSprite, RotateMixin):
+class MuzzleFlash(BaseSprite, RotateMixin, PoolMixin):
     """Sprite that models the flash (or explosion) at the barrel's nozzle upon firing a bullet."""
     FLASH_DURATION = 25
     IMAGE = 'shotLarge.png'
@@ -12,14 +13,26 @@ class MuzzleFlash(BaseSprite, RotateMixin):
     def __init__(self, x: float, y: float, rot: float, all_groups):
         """Aligns the MuzzleFlash so that it starts at the tip of the Barrel nozzle."""
         self._layer = cfg.EFFECTS_LAYER
-        BaseSprite.__init__(self, MuzzleFlash.IMAGE, all_groups, all_groups['all'])
+        BaseSprite.__init__(self, MuzzleFlash.IMAGE, all_groups)
         RotateMixin.__init__(self)
+        self._spawn_timer = Timer()
+        self.reset(x, y, rot, all_groups)
+
+    def reset(self, x: float, y: float, rot: float, all_groups) -> None:
+        """Re-aligns a recycled MuzzleFlash at the tip of the Barrel nozzle and shows it again."""
+        self.all_groups = all_groups
         self.rect.center = (x, y)
         self.rot = rot
         self.rotate()
-        self._spawn_timer = Timer()
+        self._spawn_timer.restart()
+        self.add(all_groups['all'])
 
     def update(self, dt: float) -> None:
         """Remove the flash from screen after a short duration."""
         if self._spawn_timer.elapsed() > MuzzleFlash.FLASH_DURATION:
             self.kill()
+
+    def kill(self) -> None:
+        """Removes the flash from all groups and returns it to the pool."""
+        super().kill()
+        self.release()
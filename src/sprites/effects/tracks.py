@@ -1,31 +1,30 @@
-import typing
+import functools
 import pygame as pg
 
 import src.config as cfg
-from src.sprites.base_sprite import BaseSprite
+import src.services.image_loader as image_loader
+import src.services.rotation as rotation
 
 
-class Tracks(BaseSprite):
-    """Sprite that models the tracks that a tank leaves behind on the ground after moving."""
+@functools.lru_cache(maxsize=512)
+def _scaled(image: pg.Surface, width: int, height: int) -> pg.Surface:
+    """Returns a cached copy of a (shared, rotated) image scaled to the given size."""
+    return pg.transform.scale(image, (width, height))
+
+
+class Tracks:
+    """Models the tracks that a tank leaves behind on the ground after moving.
+
+    Tracks are not sprites: each one is stamped once into the level's DecalLayer, which fades all of them at once.
+    """
     IMAGE = 'tracksSmall.png'
     IMG_ROT = -90
 
-    def __init__(self, x, y, scale_h, scale_w, rot, groups: typing.Dict[str, pg.sprite.Group]):
-        """Sets the sprite's position and angle value so that it matches and trails the tank's path."""
-        self._layer = cfg.TRACKS_LAYER
-        BaseSprite.__init__(self, Tracks.IMAGE, groups, groups['all'])
+    def __init__(self, x, y, scale_h, scale_w, rot):
+        """Sets the image and position of the tracks so that they match and trail the tank's path."""
         # Transform and recenter.
-        self.image = pg.transform.rotate(self.image, rot - Tracks.IMG_ROT)
-        self.image = pg.transform.scale(self.image, (scale_h, scale_w))
+        source = image_loader.get_image(Tracks.IMAGE, cfg.BLACK)
+        rotated = rotation.rotate(source, rot - Tracks.IMG_ROT, Tracks.IMAGE)
+        self.image = _scaled(rotated, int(scale_h), int(scale_w))
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
-        self._alpha = 255
-
-    def update(self, dt: float) -> None:
-        """Increases the transparency of the tracks until it fades out, at which point we stop drawing."""
-        # Fade effect.
-        if self._alpha > 0:
-            self._alpha -= 4
-            self.image.set_alpha(self._alpha)
-        else:
-            self.kill()
@@ -19,7 +19,9 @@ class ItemBox(BaseSprite):
     SFX = 'box.wav'
 
     def __init__(self, x, y, max_durability, image, groups: typing.Dict[str, pg.sprite.Group]):
-        BaseSprite.__init__(self, image, groups, groups['item_boxes'], groups['obstacles'], groups['all'])
+        # The box darkens its own image as it wears out.
+        BaseSprite.__init__(self, image, groups, groups['item_boxes'], groups['obstacles'], groups['all'],
+                            private_image=True)
         self.rect.center = (x, y)
         self._durability = max_durability
         self._disappear_alpha = itertools.chain(ItemBox._DISAPPEAR_ALPHA * 2)
@@ -48,7 +50,7 @@ class ItemBox(BaseSprite):
         pass
 
     def kill(self) -> None:
-        sfx_loader.play(ItemBox.SFX)
+        sfx_loader.play(ItemBox.SFX, self.rect.center)
         item_type = random.choice([HealthItem, AmmoItem, SpeedItem])
         item_type(self.rect.centerx, self.rect.centery, self.all_groups)
         super().kill()
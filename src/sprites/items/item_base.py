@@ -5,7 +5,6 @@ import pytweening as tween
 
 import src.services.sound as sfx_loader
 from src.sprites.base_sprite import BaseSprite
-from src.utils.timer import Timer
 
 
 class Item(BaseSprite, metaclass=abc.ABCMeta):
@@ -19,7 +18,6 @@ class Item(BaseSprite, metaclass=abc.ABCMeta):
         self.rect.center = (x, y)
         self._sfx = sound
         self._spawn_pos = pg.math.Vector2(x, y)
-        self._effect_timer = Timer()
         # Default duration is 0.
         self._duration = 0
         # Tween function maps integer steps to values between 0 and 1.
@@ -31,6 +29,11 @@ class Item(BaseSprite, metaclass=abc.ABCMeta):
     def spawn_pos(self) -> pg.math.Vector2:
         return self._spawn_pos
 
+    @property
+    def duration(self) -> int:
+        """Returns the number of milliseconds that the item's effect lasts for."""
+        return self._duration
+
     def update(self, dt: float) -> None:
         """Floating animation for an item that has spawned. Credits to Chris Bradfield from KidsCanCode."""
         # Shift bobbing y offset to bob about item's original center.
@@ -45,16 +48,10 @@ class Item(BaseSprite, metaclass=abc.ABCMeta):
     def activate(self, sprite: pg.sprite.Sprite) -> None:
         """Applies the item's effect upon pickup and causes it to be stop being drawn."""
         self._apply_effect(sprite)
-        self._effect_timer.restart()
-        # Applies to items with non-zero duration.
-        sfx_loader.play(self._sfx)
+        sfx_loader.play(self._sfx, sprite.rect.center)
         # Make sure it doesn't get drawn anymore after the effect has been applied.
         super().kill()
 
-    def effect_subsided(self) -> bool:
-        """Checks if the item's effect should subside."""
-        return self._effect_timer.elapsed() > self._duration
-
     @abc.abstractmethod
     def _apply_effect(self, sprite) -> None:
         """Effect that is applied on item as long as the timer has not subsided."""
@@ -2,6 +2,7 @@ import typing
 import pygame as pg
 
 import src.config as cfg
+import src.utils.timer as timer
 from src.sprites.base_sprite import BaseSprite
 from src.sprites.barrel import Barrel
 from src.sprites.effects.tracks import Tracks
@@ -17,6 +18,7 @@ class Tank(BaseSprite, MoveNonlinearMixin, RotateMixin, DamageMixin):
 
     _SPEED_CUTOFF = 100
     _TRACK_DELAY = 100
+    leaves_tracks = True  # Whether moving tanks leave tracks for the level to stamp; off while nothing is drawn.
 
     BIG = "big"
     LARGE = "large"
@@ -40,6 +42,7 @@ class Tank(BaseSprite, MoveNonlinearMixin, RotateMixin, DamageMixin):
         self._barrels = []
         self._items = []
         self._track_timer = Timer()
+        self._track_marks = []
 
     def update(self, dt: float) -> None:
         """Rotates, moves, and handles any active in-game items that have some effect.
@@ -49,11 +52,8 @@ class Tank(BaseSprite, MoveNonlinearMixin, RotateMixin, DamageMixin):
         """
         self.rotate(dt)
         self.move(dt)
-        for item in self._items:
-            if item.effect_subsided():
-                item.remove_effect(self)
-                self._items.remove(item)
-        if self.vel.length_squared() > Tank._SPEED_CUTOFF and self._track_timer.elapsed() > Tank._TRACK_DELAY:
+        if Tank.leaves_tracks and self.vel.length_squared() > Tank._SPEED_CUTOFF and \
+                self._track_timer.elapsed() > Tank._TRACK_DELAY:
             self._spawn_tracks()
 
     @property
@@ -74,16 +74,28 @@ class Tank(BaseSprite, MoveNonlinearMixin, RotateMixin, DamageMixin):
         """
         item.activate(self)
         self._items.append(item)
+        # Applies to items with non-zero duration.
+        timer.schedule(item.duration, self._remove_item, item)
+
+    def _remove_item(self, item) -> None:
+        """Removes the effect of an item once its duration is over."""
+        item.remove_effect(self)
+        self._items.remove(item)
 
     def equip_barrel(self, barrel: Barrel) -> None:
         """Equips a new barrel to this tank."""
         self._barrels.append(barrel)
 
     def _spawn_tracks(self) -> None:
-        """Spawns track sprites as the tank object moves around the map."""
-        Tracks(*self.pos, self.hit_rect.height, self.hit_rect.height, self.rot, self.all_groups)
+        """Leaves tracks behind as the tank object moves around the map, to be stamped onto the ground."""
+        self._track_marks.append(Tracks(*self.pos, self.hit_rect.height, self.hit_rect.height, self.rot))
         self._track_timer.restart()
 
+    def pop_track_marks(self) -> typing.List[Tracks]:
+        """Returns the tracks left behind since the last call, so that the game world can stamp them."""
+        marks, self._track_marks = self._track_marks, []
+        return marks
+
     def rotate_barrel(self, aim_direction: float):
         """Rotates the all of the tank's barrels in a direction indicated by aim_direction."""
         for barrel in self._barrels:
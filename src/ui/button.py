@@ -29,30 +29,46 @@ class Button(AnimatedSprite):
         AnimatedSprite.__init__(self, img_files, frame_info, all_groups)
         # Add Text to buttons.
         for i in range(len(self._images)):
-            # Make a copy to safely alter image with text.
+            # Make a copy to safely alter image with text, since the loader's images are shared.
             self._images[i] = self._images[i].copy()
             text_renderer.render(self._images[i], text, size, color)
         # on-click button function
         self._action = action
+        # Screen area that must be redrawn because the button's image changed.
+        self._dirty_rect = None
 
     def handle_mouse(self):
         """Either animates the button or executes the function that it encapsulates."""
-        # Keep track of bottom of button.
-        old_bot = self.rect.bottomleft
         mouse_x, mouse_y = pg.mouse.get_pos()
         mouse_state = input_manager.mouse_state[InputState.MOUSE_LEFT]
         if self._is_hovering(mouse_x, mouse_y):
-            self.change_anim(Button._HOVER_ON)
             if mouse_state == InputState.STILL_PRESSED:
-                self.change_anim(Button._CLICKED)
-            elif mouse_state == InputState.JUST_RELEASED:
-                # toggle-off clicked animation
-                self._action()
+                self._set_anim(Button._CLICKED)
+            else:
+                self._set_anim(Button._HOVER_ON)
+                if mouse_state == InputState.JUST_RELEASED:
+                    # toggle-off clicked animation
+                    self._action()
         else:
-            self.change_anim(Button._HOVER_OFF)
+            self._set_anim(Button._HOVER_OFF)
+
+    def _set_anim(self, animation_number: int) -> None:
+        """Changes the button's image if it's not already showing it, and marks the affected area as dirty."""
+        if animation_number == self._anim_num:
+            return
+        # Keep track of bottom of button.
+        old_rect = self.rect.copy()
+        self.change_anim(animation_number)
         # Update button position
         self.rect = self.image.get_rect()
-        self.rect.bottomleft = old_bot
+        self.rect.bottomleft = old_rect.bottomleft
+        dirty = old_rect.union(self.rect)
+        self._dirty_rect = dirty if self._dirty_rect is None else self._dirty_rect.union(dirty)
+
+    def pop_dirty_rect(self) -> typing.Optional[pg.Rect]:
+        """Returns the area changed since the last call, or None if the button's image hasn't changed."""
+        dirty, self._dirty_rect = self._dirty_rect, None
+        return dirty
 
     def _is_hovering(self, mouse_x: int, mouse_y: int):
         """Determines whether the mouse is hovering over the button sprite."""
@@ -0,0 +1,54 @@
+import typing
+import pygame as pg
+
+
+class HudWidget:
+    """A region of the HUD that is re-rendered only when the value it's bound to changes."""
+    _UNSET = object()
+
+    def __init__(self, rect: pg.Rect, bind: typing.Callable[[], typing.Any],
+                 render: typing.Callable[[pg.Surface, typing.Any], None]):
+        """Creates a widget that has not been rendered yet.
+
+        :param rect: Area of the HUD surface occupied by the widget.
+        :param bind: Function returning the value displayed by the widget, i.e., the player's health.
+        :param render: Function that draws a value onto a (cleared) surface the size of the widget.
+        """
+        self.rect = rect
+        self._bind = bind
+        self._render = render
+        self._value = HudWidget._UNSET
+
+    def refresh(self, hud_surface: pg.Surface) -> bool:
+        """Re-renders the widget onto the HUD surface if its bound value has changed.
+
+        :param hud_surface: The HUD's composed surface.
+        :return: boolean, whether the widget was re-rendered.
+        """
+        value = self._bind()
+        if value == self._value:
+            return False
+        self._value = value
+        hud_surface.fill((0, 0, 0, 0), self.rect)
+        self._render(hud_surface.subsurface(self.rect), value)
+        return True
+
+
+class Hud:
+    """Retained heads-up display that keeps a composed surface and blits it every frame."""
+    def __init__(self, width: int, height: int):
+        self.image = pg.Surface((width, height), pg.SRCALPHA)
+        self._widgets = []
+
+    def add_widget(self, rect: pg.Rect, bind: typing.Callable[[], typing.Any],
+                   render: typing.Callable[[pg.Surface, typing.Any], None]) -> HudWidget:
+        """Adds a widget to the HUD; see HudWidget for the meaning of the parameters."""
+        widget = HudWidget(rect, bind, render)
+        self._widgets.append(widget)
+        return widget
+
+    def draw(self, surface: pg.Surface, pos: typing.Tuple[int, int]) -> None:
+        """Re-renders the widgets whose values changed and blits the composed HUD at a screen position."""
+        for widget in self._widgets:
+            widget.refresh(self.image)
+        surface.blit(self.image, pos)
@@ -1,3 +1,4 @@
+import typing
 import pygame as pg
 
 import src.config as cfg
@@ -51,6 +52,15 @@ class Menu(BaseSprite):
         for button in self.buttons:
             button.handle_mouse()
 
+    def dirty_rects(self) -> typing.List[pg.Rect]:
+        """Returns the areas of buttons whose images changed since this was last called."""
+        rects = []
+        for button in self.buttons:
+            dirty = button.pop_dirty_rect()
+            if dirty:
+                rects.append(dirty)
+        return rects
+
     def draw(self, surface: pg.Surface) -> None:
         """Draws the menu onto the surface provided."""
         surface.blit(self.image, self.rect)
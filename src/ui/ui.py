@@ -1,16 +1,31 @@
+import typing
 import pygame as pg
 
 from src.ui.menu import Menu
 
 
 class UI:
+    """Retained-mode UI that redraws only the menu areas that changed since the last frame."""
     def __init__(self):
         self._ui_sprites = pg.sprite.Group()
         self._menus = []
+        # Copy of the screen beneath the menus, used to repaint the areas behind changed buttons.
+        self._background = None
+        self._full_redraw = True
+
+    @property
+    def needs_full_redraw(self) -> bool:
+        """Checks whether the whole screen must be redrawn, i.e., because a menu was added or removed."""
+        return self._full_redraw
+
+    def invalidate(self) -> None:
+        """Requests that the next draw repaints the whole screen."""
+        self._full_redraw = True
 
     def make_menu(self, title, size, color, buttons):
         """Creates a menu and presents it as the UI's topmost element."""
         self._menus.append(Menu(title, size, color, buttons, self._ui_sprites))
+        self.invalidate()
 
     def process_inputs(self):
         """Handles the mouse by delegating to the topmost menu."""
@@ -21,13 +36,37 @@ class UI:
         """Removes the topmost menu."""
         menu = self._menus.pop()
         menu.kill()
+        self.invalidate()
 
     def clear(self):
         """Clears all menus from the UI."""
         while self._menus:
             self.pop_menu()
 
-    def draw(self, surface: pg.Surface):
-        """Draw all menus from bottom to top."""
+    def draw(self, surface: pg.Surface) -> typing.List[pg.Rect]:
+        """Draws the menus from bottom to top, repainting only the areas that changed unless a full redraw is due.
+
+        On a full redraw, the surface is expected to already hold what lies beneath the menus; it is saved so that
+        later frames can restore the area behind a button before redrawing it.
+
+        :param surface: The surface that the menus will be drawn to, i.e., the screen.
+        :return: List of the areas of the surface that were redrawn.
+        """
+        if self._full_redraw:
+            self._full_redraw = False
+            self._background = surface.copy() if self._menus else None
+            for menu in self._menus:
+                menu.dirty_rects()  # The whole screen is redrawn, so discard pending button changes.
+                menu.draw(surface)
+            return [surface.get_rect()]
+
+        dirty = []
         for menu in self._menus:
-            menu.draw(surface)
+            dirty.extend(menu.dirty_rects())
+        for rect in dirty:
+            surface.set_clip(rect)
+            surface.blit(self._background, rect, rect)
+            for menu in self._menus:
+                menu.draw(surface)
+        surface.set_clip(None)
+        return dirty
@@ -1,64 +1,230 @@
+import heapq
+import itertools
+import typing
+import weakref
 import pygame as pg
 
 
+class VirtualClock:
+    """Clock that only moves forward when advanced, i.e., to run the game world faster than real time."""
+    def __init__(self):
+        """Starts at the current real time, so timers created before switching clocks keep running forward."""
+        self._start = pg.time.get_ticks()
+        self._advanced = 0.0
+
+    def __call__(self) -> int:
+        """Returns whole milliseconds, like pg.time.get_ticks, so that game time is added and subtracted exactly and a
+        run doesn't depend on the real time it started at."""
+        return self._start + round(self._advanced)
+
+    def advance(self, ms: float) -> None:
+        """Moves the clock forward by the given number of milliseconds."""
+        self._advanced += ms
+
+
+class GameClock:
+    """Game time in milliseconds, which follows a time source, stands still while paused, and can be scaled.
+
+    Pausing or scaling only moves the point from which game time is measured, so it costs the same however many timers
+    the game has.
+    """
+    def __init__(self, source: typing.Callable[[], float] = pg.time.get_ticks):
+        """
+        :param source: Function returning the current real time in milliseconds.
+        """
+        self._source = source
+        self._anchor_source = source()
+        self._anchor_time = self._anchor_source  # Game time at _anchor_source.
+        self._paused = False
+        self._scale = 1.0
+
+    def now(self) -> float:
+        """Returns the current game time in milliseconds."""
+        if self._paused:
+            return self._anchor_time
+        return self._anchor_time + (self._source() - self._anchor_source) * self._scale
+
+    def _reanchor(self) -> None:
+        """Measures game time from now on, so that changes to the clock only affect the time that follows."""
+        self._anchor_time = self.now()
+        self._anchor_source = self._source()
+
+    def set_source(self, source: typing.Callable[[], float]) -> None:
+        """Sets the time source, e.g., pg.time.get_ticks or a VirtualClock; game time carries on from where it is."""
+        self._anchor_time = self.now()
+        self._source = source
+        self._anchor_source = source()
+
+    @property
+    def real_time(self) -> bool:
+        """Whether game time follows the real time, rather than a VirtualClock that's advanced by hand."""
+        return not isinstance(self._source, VirtualClock)
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def pause(self) -> None:
+        """Stops game time, and with it every timer and scheduled callback."""
+        if not self._paused:
+            self._reanchor()
+            self._paused = True
+
+    def unpause(self) -> None:
+        """Resumes game time from where it was paused."""
+        if self._paused:
+            self._anchor_source = self._source()
+            self._paused = False
+
+    @property
+    def time_scale(self) -> float:
+        return self._scale
+
+    def set_time_scale(self, scale: float) -> None:
+        """Sets how many milliseconds of game time pass per millisecond of real time, e.g., 0.5 for slow motion."""
+        self._reanchor()
+        self._scale = scale
+
+
+class ScheduledCall:
+    """Callback due at a given game time, as returned by Scheduler.schedule; cancel it to stop it from being called."""
+    __slots__ = ('deadline', '_seq', '_callback', '_args', '_cancelled')
+
+    def __init__(self, deadline: float, seq: int, callback: typing.Callable, args: tuple):
+        self.deadline = deadline
+        self._seq = seq
+        # Bound methods are only weakly referenced, so a scheduled call doesn't keep its owner alive.
+        if hasattr(callback, '__self__') and hasattr(callback, '__func__'):
+            self._callback = weakref.WeakMethod(callback)
+        else:
+            self._callback = lambda: callback
+        self._args = args
+        self._cancelled = False
+
+    def __lt__(self, other: 'ScheduledCall') -> bool:
+        return (self.deadline, self._seq) < (other.deadline, other._seq)
+
+    def cancel(self) -> None:
+        """Stops the callback from being called."""
+        self._cancelled = True
+        self._args = ()
+
+    def __call__(self) -> None:
+        callback = self._callback()
+        if not self._cancelled and callback is not None:
+            callback(*self._args)
+
+
+class Scheduler:
+    """Min-heap of callbacks ordered by the game time they're due at, checked in O(1) when none are due."""
+    def __init__(self, clock: GameClock):
+        self._clock = clock
+        self._heap = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, delay: float, callback: typing.Callable, *args) -> ScheduledCall:
+        """Calls a function once a number of milliseconds of game time have passed.
+
+        :param delay: Milliseconds of game time to wait, which don't pass while the game clock is paused.
+        :param callback: Function to call; if it's a bound method, the call is dropped once its object is gone.
+        :param args: Arguments to call the function with.
+        :return: The scheduled call, which can be cancelled.
+        """
+        call = ScheduledCall(self._clock.now() + delay, next(self._seq), callback, args)
+        heapq.heappush(self._heap, call)
+        return call
+
+    def run_due(self) -> None:
+        """Calls every callback whose time has come, in the order they're due."""
+        heap = self._heap
+        now = self._clock.now()
+        while heap and heap[0].deadline <= now:
+            heapq.heappop(heap)()
+
+    def clear(self) -> None:
+        """Drops every scheduled callback."""
+        self._heap.clear()
+
+
 class Timer:
-    """Simulates a timer for the game."""
-    _all_timers = []
+    """Measures the game time elapsed since it was started or restarted."""
+    __slots__ = ('_start', '_paused_elapsed')
 
     def __init__(self):
         """Starts running the timer."""
-        self._elapsed_time = 0
-        self._paused = False
-        self._unpause_time = pg.time.get_ticks()
-        Timer._all_timers.append(self)
+        self._start = _game_clock.now()
+        self._paused_elapsed = None  # Elapsed time when the timer itself was paused.
 
     def pause(self) -> None:
-        """Pauses the timer."""
-        self._paused = True
-        self._elapsed_time += time_since(self._unpause_time)
+        """Pauses the timer, on top of the game clock."""
+        if self._paused_elapsed is None:
+            self._paused_elapsed = self.elapsed()
 
     def unpause(self) -> None:
         """Unpauses the timer."""
-        self._paused = False
-        self._unpause_time = pg.time.get_ticks()
+        if self._paused_elapsed is not None:
+            self._start = _game_clock.now() - self._paused_elapsed
+            self._paused_elapsed = None
 
     def restart(self) -> None:
         """Restarts the timer."""
-        self._elapsed_time = 0
-        self._unpause_time = pg.time.get_ticks()
+        self._start = _game_clock.now()
+        if self._paused_elapsed is not None:
+            self._paused_elapsed = 0
 
     def elapsed(self) -> float:
         """Returns the number of milliseconds that have passed since the timer started."""
-        ms = self._elapsed_time
-        if not self._paused:
-            ms += time_since(self._unpause_time)
-        return ms
-
-    @classmethod
-    def pause_timers(cls) -> None:
-        """Pauses all of the timers in the game. Should be called only when the game is paused."""
-        for timer in cls._all_timers:
-            timer.pause()
-
-    @classmethod
-    def unpause_timers(cls) -> None:
-        """Unpauses all of the timers in the game. Should be called only when the game is paused."""
-        for timer in cls._all_timers:
-            timer.unpause()
-
-    @classmethod
-    def restart_timers(cls) -> None:
-        """Restarts all timers in the game"""
-        for timer in cls._all_timers:
-            timer.restart()
-
-    @classmethod
-    def clear_timers(cls) -> None:
-        """Removes all timers in the game."""
-        while cls._all_timers:
-            cls._all_timers.pop()
-
-
-def time_since(t0: int) -> int:
+        if self._paused_elapsed is not None:
+            return self._paused_elapsed
+        return time_since(self._start)
+
+
+# Global game clock that every timer and scheduled callback reads.
+_game_clock = GameClock()
+_scheduler = Scheduler(_game_clock)
+# Interface methods with the global game clock and scheduler.
+now = _game_clock.now
+pause = _game_clock.pause
+unpause = _game_clock.unpause
+set_time_scale = _game_clock.set_time_scale
+schedule = _scheduler.schedule
+run_due = _scheduler.run_due
+
+
+def set_clock(clock: typing.Callable[[], float]) -> None:
+    """Sets the time source of the game clock.
+
+    :param clock: Function returning the current time in milliseconds, e.g., pg.time.get_ticks or a VirtualClock.
+    :return: None
+    """
+    _game_clock.set_source(clock)
+
+
+def real_time() -> bool:
+    """Returns whether game time follows the real time; under a VirtualClock, nothing should depend on the real time."""
+    return _game_clock.real_time
+
+
+def time_scale() -> float:
+    """Returns how many milliseconds of game time pass per millisecond of real time."""
+    return _game_clock.time_scale
+
+
+def scheduled_count() -> int:
+    """Returns the number of callbacks waiting in the scheduler."""
+    return len(_scheduler)
+
+
+def reset() -> None:
+    """Drops every scheduled callback and resumes the game clock at normal speed, i.e., when a level is loaded."""
+    _scheduler.clear()
+    _game_clock.set_time_scale(1.0)
+    _game_clock.unpause()
+
+
+def time_since(t0: float) -> float:
     """ Returns number of milliseconds since t0 """
-    return pg.time.get_ticks() - t0
+    return _game_clock.now() - t0
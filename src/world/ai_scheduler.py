@@ -0,0 +1,95 @@
+"""Spreads the AI mobs' updates across ticks, thinking more often for mobs near the player or in a fight.
+
+Each mob thinks at an interval given by its state and by how far it is from the player. Between thinks, a mob's sprite
+carries on with its last decision, e.g., a tank keeps its heading and acceleration. Mobs that are due think in order of
+how long they've waited, until the tick's number of thinks, or while the game runs in real time, its time budget, is
+spent; the rest are deferred to the next tick. On a VirtualClock, e.g., in headless runs and benchmarks, only the
+number of thinks counts, so that the same seed makes the same decisions on any machine.
+"""
+import bisect
+import time
+import typing
+import pygame as pg
+
+import src.config as cfg
+import src.utils.timer as timer
+
+
+class AIScheduler:
+    """Decides which AI mobs think in each tick."""
+    def __init__(self, max_thinks: int = cfg.AI_THINKS_PER_TICK,
+                 budget: typing.Optional[float] = cfg.AI_THINK_BUDGET_MS,
+                 distances: typing.Sequence[float] = cfg.AI_LOD_DISTANCES,
+                 intervals: typing.Dict[str, typing.Sequence[float]] = cfg.AI_THINK_INTERVALS):
+        """
+        :param max_thinks: Maximum number of AI mobs that think per tick.
+        :param budget: Milliseconds per tick that AI mobs may spend thinking while the game clock follows the real time,
+            or None for no limit.
+        :param distances: Increasing distances in pixels from the player that separate the levels of detail.
+        :param intervals: Milliseconds between thinks, per state name, with one value per level of detail, i.e.,
+            one more than there are distances; mobs in other states think every tick.
+        """
+        self._max_thinks = max_thinks
+        self._budget = budget
+        self._distances_sq = [distance ** 2 for distance in distances]
+        self._intervals = intervals
+        self._next_think = {}  # Maps each AI mob to the game time at which it should next think.
+        self._last_think = {}
+        self._last_tick = {'thought': 0, 'deferred': 0, 'waiting': 0}
+        self._totals = {'thought': 0, 'deferred': 0}
+
+    def interval(self, ai, target_pos: pg.math.Vector2) -> float:
+        """Returns the milliseconds an AI mob waits between thinks, given its state and distance to the player.
+
+        :param ai: The AI mob.
+        :param target_pos: World position of the player.
+        :return: Interval in milliseconds.
+        """
+        intervals = self._intervals.get(getattr(ai.state, 'NAME', None))
+        if intervals is None:
+            return 0
+        lod = bisect.bisect(self._distances_sq, target_pos.distance_squared_to(ai.sprite.pos))
+        return intervals[lod]
+
+    def update(self, ai_mobs: typing.List, target_pos: pg.math.Vector2, dt: float) -> None:
+        """Lets the AI mobs that are due think, within the number of thinks and time budget.
+
+        :param ai_mobs: Every AI mob in the game world.
+        :param target_pos: World position of the player.
+        :param dt: Duration of the tick in seconds.
+        :return: None
+        """
+        now = timer.now()
+        next_think = self._next_think
+        due = [ai for ai in ai_mobs if next_think.get(ai, now) <= now]
+        # The longest waiting mobs think first, so that none is deferred for good.
+        due.sort(key=lambda ai: next_think.get(ai, now))
+        # The real time spent is only measured when it's what the game clock follows.
+        budget = self._budget if timer.real_time() else None
+        start = time.perf_counter()
+        thought = 0
+        for ai in due[:self._max_thinks]:
+            if thought and budget is not None and (time.perf_counter() - start) * 1000 > budget:
+                break
+            # Mobs are told how much time passed since they last thought, not just the latest tick.
+            last = self._last_think.get(ai)
+            ai.update(dt if last is None else max(dt, (now - last) / 1000))
+            self._last_think[ai] = now
+            next_think[ai] = now + self.interval(ai, target_pos)
+            thought += 1
+
+        if len(next_think) > len(ai_mobs):
+            # Forget the mobs that were defeated.
+            alive = set(ai_mobs)
+            for ai in [ai for ai in next_think if ai not in alive]:
+                del next_think[ai]
+                self._last_think.pop(ai, None)
+        self._last_tick = {'thought': thought, 'deferred': len(due) - thought, 'waiting': len(ai_mobs) - len(due)}
+        self._totals['thought'] += thought
+        self._totals['deferred'] += len(due) - thought
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Returns how many AI mobs thought, were deferred to a later tick, and weren't due in the latest tick, along
+        with the totals of thinks and deferrals so far."""
+        return {**self._last_tick, 'total_thought': self._totals['thought'],
+                'total_deferred': self._totals['deferred']}
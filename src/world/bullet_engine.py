@@ -0,0 +1,269 @@
+"""Optional structure-of-arrays store of every live bullet, moved and collided in NumPy batches.
+
+Enable it with cfg.USE_BULLET_ENGINE; it requires NumPy, which is not among the game's requirements. Without it, or
+with the engine turned off, bullets are the pooled Bullet sprites. Bullets in the engine behave like Bullet sprites:
+they fly straight, expire after their lifetime, and hit the first item box, damageable sprite other than their owner,
+or obstacle along their path.
+"""
+import typing
+import pygame as pg
+
+import src.config as cfg
+import src.services.image_loader as image_loader
+import src.services.rotation as rotation
+from src.sprites.bullet import Bullet
+from src.sprites.effects.explosion import Explosion
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def available() -> bool:
+    """Checks if NumPy, which the bullet engine requires, is installed."""
+    return np is not None
+
+
+class BulletEngine:
+    """Keeps the position, velocity, remaining lifetime, damage, owner, and category of every live bullet in arrays.
+
+    Live bullets occupy the first len(engine) rows; expired and spent bullets are compacted away once per tick.
+    """
+    _CATEGORIES = ('standard', 'rapid', 'power')
+    _ARRAYS = ('_pos', '_prev_pos', '_vel', '_half_size', '_lifetime', '_damage', '_owner', '_category', '_image')
+
+    def __init__(self, capacity: int = cfg.BULLET_ENGINE_CAPACITY):
+        """Allocates arrays for the given number of bullets; they grow as needed.
+
+        :param capacity: Number of bullets to allocate space for.
+        :raises RuntimeError: If NumPy is not installed.
+        """
+        if np is None:
+            raise RuntimeError("The bullet engine requires NumPy")
+        self._count = 0
+        self._pos = np.zeros((capacity, 2))
+        self._prev_pos = np.zeros((capacity, 2))   # Positions before the latest move, from which collisions are swept.
+        self._vel = np.zeros((capacity, 2))
+        self._half_size = np.zeros((capacity, 2))  # Half the width and height of each bullet's hit_rect.
+        self._lifetime = np.zeros(capacity)        # Remaining lifetime in seconds.
+        self._damage = np.zeros(capacity, dtype=np.int32)
+        self._owner = np.zeros(capacity, dtype=np.int32)
+        self._category = np.zeros(capacity, dtype=np.int8)
+        self._image = np.zeros(capacity, dtype=np.int32)
+        # Owners and pre-rotated images are referred to by their index in these lists.
+        self._owners = []
+        self._owner_ids = {}
+        self._images = []
+        self._image_ids = {}
+        self._last_dt = 0.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _grow(self) -> None:
+        """Doubles the capacity of every array."""
+        for name in BulletEngine._ARRAYS:
+            array = getattr(self, name)
+            grown = np.zeros((2 * len(array),) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def _owner_id(self, owner) -> int:
+        """Returns the index of a bullet owner, registering it on first use."""
+        owner_id = self._owner_ids.get(owner)
+        if owner_id is None:
+            owner_id = self._owner_ids[owner] = len(self._owners)
+            self._owners.append(owner)
+        return owner_id
+
+    def _image_id(self, image: pg.Surface) -> int:
+        """Returns the index of a (shared, pre-rotated) bullet image, registering it on first use."""
+        image_id = self._image_ids.get(image)
+        if image_id is None:
+            image_id = self._image_ids[image] = len(self._images)
+            self._images.append(image)
+        return image_id
+
+    def spawn(self, x: float, y: float, angle: float, color: str, category: str, owner) -> None:
+        """Adds a bullet, with the same arguments as a Bullet sprite.
+
+        :param x: x coordinate of the bullet's starting position.
+        :param y: y coordinate of the bullet's starting position.
+        :param angle: Direction of the bullet in degrees.
+        :param color: Color of the barrel firing the bullet.
+        :param category: Bullet category, which determines its image, speed, damage, and lifetime.
+        :param owner: Sprite that fired the bullet, which the bullet can't hit.
+        :return: None
+        """
+        if self._count == len(self._pos):
+            self._grow()
+        i = self._count
+        stats = Bullet.stats(category)
+        name = Bullet.image_for(category, color)
+        source = image_loader.get_image(name, cfg.BLACK)
+        vel = pg.math.Vector2(stats['speed'], 0).rotate(-angle)
+        self._pos[i] = self._prev_pos[i] = (x, y)
+        self._vel[i] = (vel.x, vel.y)
+        self._half_size[i] = (source.get_width() / 2, source.get_height() / 2)
+        self._lifetime[i] = stats['lifetime'] / 1000
+        self._damage[i] = stats['damage']
+        self._owner[i] = self._owner_id(owner)
+        self._category[i] = BulletEngine._CATEGORIES.index(category)
+        self._image[i] = self._image_id(rotation.rotate(source, angle - Bullet.IMAGE_ROT, name))
+        self._count += 1
+
+    def update(self, dt: float) -> None:
+        """Moves every bullet and removes the ones whose lifetime has run out.
+
+        :param dt: Duration of the tick in seconds.
+        :return: None
+        """
+        n = self._count
+        self._last_dt = dt
+        if not n:
+            return
+        self._prev_pos[:n] = self._pos[:n]
+        self._pos[:n] += self._vel[:n] * dt
+        self._lifetime[:n] -= dt
+        self._keep(self._lifetime[:n] > 0)
+
+    def _keep(self, keep) -> None:
+        """Compacts the live bullets, keeping only those flagged in a boolean mask over them."""
+        kept = int(keep.sum())
+        if kept == self._count:
+            return
+        n = self._count
+        for name in BulletEngine._ARRAYS:
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+        self._count = kept
+
+    def _hit_times(self, rects: typing.List[pg.Rect]) -> 'np.ndarray':
+        """Sweeps every bullet's hit_rect along its latest move, as collisions.swept_hit_time does, against each rect.
+
+        :param rects: Rectangles that the bullets may hit.
+        :return: (bullets x rects) matrix of the fractions of each bullet's move travelled before it overlaps each
+            rect, or infinity where it doesn't.
+        """
+        n = self._count
+        targets = np.array([tuple(rect) for rect in rects], dtype=float).reshape(-1, 4)
+        target_low = targets[:, :2]
+        target_high = targets[:, :2] + targets[:, 2:]
+        start = self._prev_pos[:n]
+        end = self._pos[:n]
+        half = self._half_size[:n]
+        # Broadphase: only sweep the pairs whose bounding box of the bullet's path overlaps the rect.
+        path_low = np.minimum(start, end) - half
+        path_high = np.maximum(start, end) + half
+        near = ((path_low[:, 0, None] < target_high[:, 0]) & (path_high[:, 0, None] > target_low[:, 0]) &
+                (path_low[:, 1, None] < target_high[:, 1]) & (path_high[:, 1, None] > target_low[:, 1]))
+        rows, cols = np.nonzero(near)
+        times = np.full((n, len(targets)), np.inf)
+        if not len(rows):
+            return times
+        p0 = start[rows]
+        d = end[rows] - p0
+        low = target_low[cols] - half[rows]
+        high = target_high[cols] + half[rows]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t0 = (low - p0) / d
+            t1 = (high - p0) / d
+        # Bullets not moving along an axis overlap a rect on it throughout, or never.
+        still = d == 0
+        inside = (low < p0) & (p0 < high)
+        t_enter = np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(t0, t1)).max(axis=1).clip(0)
+        t_exit = np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(t0, t1)).min(axis=1).clip(None, 1)
+        overlap = t_enter < t_exit
+        times[rows[overlap], cols[overlap]] = t_enter[overlap]
+        return times
+
+    def collide(self, groups: typing.Dict[str, pg.sprite.Group]) -> None:
+        """Resolves every bullet's collisions with item boxes, damageable sprites, and obstacles in batches.
+
+        Like a Bullet sprite, a bullet hits the first target along its latest move, with ties going to item boxes, then
+        damageable sprites, then obstacles, and then to the first target in the group.
+
+        :param groups: Dictionary of sprite groups owned by the game world.
+        :return: None
+        """
+        n = self._count
+        if not n:
+            return
+        boxes = list(groups['item_boxes'])
+        targets = list(groups['damageable'])
+        obstacles = groups['obstacles'].sprites()
+        if not boxes and not targets and not obstacles:
+            return
+        # Columns are in the order that ties are broken in, so the first hit is each row's lowest column.
+        times = self._hit_times([sprite.hit_rect for sprite in boxes + targets + obstacles])
+        # Bullets can't damage the sprite that fired them.
+        target_ids = np.array([self._owner_ids.get(sprite, -1) for sprite in targets], dtype=np.int32)
+        times[:, len(boxes):len(boxes) + len(targets)][self._owner[:n, None] == target_ids] = np.inf
+        first = times.argmin(axis=1)
+        first_time = times[np.arange(n), first]
+        hit = np.isfinite(first_time)
+        # Bullets stop where they hit, e.g., for their explosions.
+        self._pos[:n][hit] = (self._prev_pos[:n][hit] +
+                              (self._pos[:n][hit] - self._prev_pos[:n][hit]) * first_time[hit, None])
+
+        # Damage boxes or destroy if appropriate.
+        for b in np.unique(first[hit & (first < len(boxes))]):
+            boxes[b].wear_out()
+            if not boxes[b].alive():
+                break
+
+        # Handle sprites that take damage from bullets.
+        damaged = np.flatnonzero(hit & (first >= len(boxes)) & (first < len(boxes) + len(targets)))
+        for i in damaged[np.argsort(first[damaged], kind='stable')]:
+            sprite = targets[first[i] - len(boxes)]
+            x, y = self._pos[i]
+            Explosion.spawn(float(x), float(y), groups)
+            sprite.inflict_damage(int(self._damage[i]))
+            if sprite.health <= 0:
+                sprite.kill()
+
+        # Bullets that hit other obstacles merely disappear.
+        self._keep(~hit)
+
+    def draw(self, screen: pg.Surface, camera, alpha: float = 1.0) -> None:
+        """Draws the bullets in view of the camera from their shared, pre-rotated images.
+
+        :param screen: The screen surface that the bullets will be drawn to.
+        :param camera: Camera whose rectangle determines which bullets are visible.
+        :param alpha: Fraction of a tick elapsed since the latest update; bullets are drawn between ticks.
+        :return: None
+        """
+        n = self._count
+        if not n:
+            return
+        view = camera.rect
+        pos = self._pos[:n] - self._vel[:n] * ((1 - alpha) * self._last_dt)
+        visible = np.flatnonzero((pos[:, 0] > view.left - 32) & (pos[:, 0] < view.right + 32) &
+                                 (pos[:, 1] > view.top - 32) & (pos[:, 1] < view.bottom + 32))
+        images = self._images
+        blits = []
+        for i in visible:
+            image = images[self._image[i]]
+            x, y = pos[i]
+            blits.append((image, image.get_rect(center=(int(x) - view.x, int(y) - view.y))))
+        screen.blits(blits, doreturn=False)
+
+    def clear(self) -> None:
+        """Removes every bullet."""
+        self._count = 0
+        self._owners.clear()
+        self._owner_ids.clear()
+
+
+def make_engine() -> typing.Optional[BulletEngine]:
+    """Creates a bullet engine if it's enabled and NumPy is installed.
+
+    :return: A new BulletEngine, or None if bullets should be Bullet sprites.
+    """
+    if not cfg.USE_BULLET_ENGINE:
+        return None
+    if np is None:
+        print("NumPy is not installed; using bullet sprites instead of the bullet engine.")
+        return None
+    return BulletEngine()
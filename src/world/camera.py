@@ -17,6 +17,12 @@ class Camera:
         self.rect = pg.Rect(0, 0, cfg.SCREEN_WIDTH, cfg.SCREEN_HEIGHT)
         self.map_width = map_width
         self.map_height = map_height
+        self._prev_center = pg.math.Vector2(self.rect.center)
+        self._center = pg.math.Vector2(self.rect.center)
+        if target:
+            # Start at the target rather than sliding over to it.
+            self.update()
+            self._prev_center.update(self._center)
 
     def follow(self, target: pg.sprite.Sprite) -> None:
         """Sets the target that the camera will follow.
@@ -28,10 +34,18 @@ class Camera:
 
     def update(self) -> None:
         """Clamps the camera position using the target's position so that the target is always visible."""
-        self.rect.center = self.target.pos
+        self._prev_center.update(self._center)
+        self._center.x = clamp(self.target.pos.x, cfg.SCREEN_WIDTH / 2, self.map_width - cfg.SCREEN_WIDTH / 2)
+        self._center.y = clamp(self.target.pos.y, cfg.SCREEN_HEIGHT / 2, self.map_height - cfg.SCREEN_HEIGHT / 2)
+        self.rect.center = self._center
 
-        self.rect.centerx = clamp(self.target.pos.x, cfg.SCREEN_WIDTH / 2, self.map_width - cfg.SCREEN_WIDTH / 2)
-        self.rect.centery = clamp(self.target.pos.y, cfg.SCREEN_HEIGHT / 2, self.map_height - cfg.SCREEN_HEIGHT / 2)
+    def interpolate(self, alpha: float) -> None:
+        """Moves the camera between its positions from the last two updates, i.e., to render between ticks.
+
+        :param alpha: Fraction of the way from the previous position (0) to the latest one (1).
+        :return: None
+        """
+        self.rect.center = self._prev_center.lerp(self._center, alpha)
 
     def apply(self, rect: pg.Rect) -> pg.Rect:
         """Returns a rectangle offset by the camera's position.
@@ -40,3 +54,11 @@ class Camera:
         :return: A rectangle whose coordinates are the input's, offset by the camera's.
         """
         return rect.move(-self.rect.x, -self.rect.y)
+
+    def view_rect(self, margin: int = 0) -> pg.Rect:
+        """Returns the area of the world seen by the camera, grown on every side by a margin.
+
+        :param margin: Number of pixels to extend the camera's rectangle by on each side.
+        :return: A new rectangle in world coordinates.
+        """
+        return self.rect.inflate(2 * margin, 2 * margin)
@@ -1,35 +1,18 @@
 """Module that deals with resolving collisions."""
+import typing
 import pygame as pg
 
 from src.sprites.effects.explosion import Explosion
 
 
-def collide_hit_rect(sprite_a, sprite_b) -> bool:
-    """ Checks whether the sprites' hit_rect rectangles overlap.
-
-    :param sprite_a: A BaseSprite object.
-    :param sprite_b: A BaseSprite object.
-    :return: boolean, indicating whether the sprite's hit_rect rectangles overlapped.
-    """
-    return sprite_a.hit_rect.colliderect(sprite_b.hit_rect)
-
-
-def bullet_collide_owner(sprite, bullet) -> bool:
-    """Checks whether a Bullet has hit a sprite that didn't fire the bullet.
-
-    :param bullet: The Bullet object involved in the collision check.
-    :param sprite: Second BaseSprite object involved in the collision check.
-    :return: boolean, whether the collision takes place.
-    """
-    return bullet.owner != sprite and collide_hit_rect(bullet, sprite)
-
-
 def handle_obstacle_collisions(sprite, displacement: pg.math.Vector2) -> bool:
     """Corrects a sprite's displacement in the event the sprite has hit an obstacle.
 
     :param sprite: BaseSprite with a MoveMixin undergoing a displacement.
     :param displacement: vector representing the attempted displacement of the sprite.
     :return: boolean, whether the sprite hit an obstacle.
+
+    The sprite's 'obstacles' group is an ObstacleGroup, which only checks the obstacles near the sprite.
     """
     colliders = sprite.all_groups['obstacles']
     hit_wall = False
@@ -37,7 +20,7 @@ def handle_obstacle_collisions(sprite, displacement: pg.math.Vector2) -> bool:
     # Collision in x direction.
     sprite.pos.x += displacement.x
     sprite.hit_rect.centerx = sprite.pos.x
-    collider = pg.sprite.spritecollideany(sprite, colliders, collide_hit_rect)
+    collider = colliders.collide_any(sprite)
 
     if collider:
         # Hit left of collider.
@@ -53,7 +36,7 @@ def handle_obstacle_collisions(sprite, displacement: pg.math.Vector2) -> bool:
     # Collision in y direction.
     sprite.pos.y += displacement.y
     sprite.hit_rect.centery = sprite.pos.y
-    collider = pg.sprite.spritecollideany(sprite, colliders, collide_hit_rect)
+    collider = colliders.collide_any(sprite)
 
     if collider:
         # Hit top of collider.
@@ -69,44 +52,137 @@ def handle_obstacle_collisions(sprite, displacement: pg.math.Vector2) -> bool:
     return hit_wall
 
 
+# Groups that bullets can hit; a tie between targets along a bullet's path goes to the earlier group.
+BULLET_TARGETS = ('item_boxes', 'damageable', 'obstacles')
+
+
+def swept_hit_time(start: pg.math.Vector2, end: pg.math.Vector2, half_width: float, half_height: float,
+                   rect: pg.Rect) -> typing.Optional[float]:
+    """Finds when a moving rectangle first overlaps another rectangle along a straight path.
+
+    The moving rectangle is reduced to its center, sweeping a segment through the other rectangle grown by the moving
+    rectangle's half size on each side.
+
+    :param start: Center of the moving rectangle at the start of the path.
+    :param end: Center of the moving rectangle at the end of the path.
+    :param half_width: Half the width of the moving rectangle.
+    :param half_height: Half the height of the moving rectangle.
+    :param rect: Rectangle that may be hit, e.g., a target's hit_rect.
+    :return: Fraction of the path, from 0 to 1, travelled before the rectangles overlap, or None if they never do.
+    """
+    t_enter, t_exit = 0.0, 1.0
+    for p0, p1, low, high in ((start[0], end[0], rect.left - half_width, rect.right + half_width),
+                              (start[1], end[1], rect.top - half_height, rect.bottom + half_height)):
+        delta = p1 - p0
+        if delta == 0:
+            # Not moving along this axis: the rectangles overlap on it throughout, or never.
+            if not low < p0 < high:
+                return None
+            continue
+        t0, t1 = (low - p0) / delta, (high - p0) / delta
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_enter, t_exit = max(t_enter, t0), min(t_exit, t1)
+        if t_enter >= t_exit:
+            return None
+    return t_enter
+
+
+def _first_hits(groups, bullets: typing.List) -> typing.Dict[str, typing.Dict]:
+    """Finds the first target along the path that each bullet swept during the latest tick.
+
+    A bullet hits the target it reaches earliest, so that fast bullets can't pass through thin targets between ticks,
+    whatever the tick rate; like pg.sprite.groupcollide, ties go to the first target in the group. Targets are only
+    checked if they're near the bullet's path, and bullets can't damage the sprite that fired them.
+
+    :param groups: Dictionary of sprite groups owned by the game world.
+    :param bullets: Bullets to check.
+    :return: Dictionary mapping each group in BULLET_TARGETS to a dictionary of the targets that were hit, in the
+        group's order, and their bullets.
+    """
+    ranks = {}
+    hits = {name: {} for name in BULLET_TARGETS}
+    for bullet in bullets:
+        start, end = bullet.prev_pos, bullet.pos
+        half_width, half_height = bullet.hit_rect.width / 2, bullet.hit_rect.height / 2
+        path = bullet.hit_rect.union(bullet.hit_rect.move(start.x - end.x, start.y - end.y)).inflate(2, 2)
+        first = None
+        for priority, name in enumerate(BULLET_TARGETS):
+            for target in groups[name].query(path):
+                if name == 'damageable' and target is bullet.owner:
+                    continue
+                t = swept_hit_time(start, end, half_width, half_height, target.hit_rect)
+                if t is None:
+                    continue
+                if name not in ranks:
+                    ranks[name] = {sprite: i for i, sprite in enumerate(groups[name])}
+                key = (t, priority, ranks[name][target])
+                if first is None or key < first[0]:
+                    first = key, name, target
+        if first is not None:
+            (t, _, _), name, target = first
+            # The bullet stops where it hit, e.g., for its explosion.
+            bullet.pos.update(start.lerp(end, t))
+            hits[name].setdefault(target, []).append(bullet)
+    for name, targets in hits.items():
+        if len(targets) > 1:
+            hits[name] = {target: targets[target] for target in sorted(targets, key=ranks[name].get)}
+    return hits
+
+
 def handle_collisions(groups) -> None:
     """Resolves the collisions of the game world.
 
+    Every group but 'all' is an IndexedGroup, whose spatial hash serves as the broadphase: each sprite is only checked
+    against the sprites in the grid cells that it overlaps.
+
     :param groups: Dictionary of sprite groups owned by the game world.
     :return: None
     """
+    for name in ('tanks', 'damageable', 'items', 'bullets', 'obstacles', 'item_boxes'):
+        groups[name].reindex()
+
     # Tank/tank collision.
     all_tanks = list(groups['tanks'])
-    for i in range(0, len(all_tanks)):
-        tank_a = all_tanks[i]
-        for tank_b in all_tanks[i + 1:]:
-            if collide_hit_rect(tank_a, tank_b):
+    order = {tank: i for i, tank in enumerate(all_tanks)}
+    for tank_a in all_tanks:
+        for tank_b in groups['tanks'].query(tank_a.hit_rect):
+            # Each pair is resolved once, in the same order as comparing every pair of tanks would.
+            if order[tank_b] > order[tank_a]:
                 knock_back_dir = tank_b.rot
                 tank_a.vel += pg.math.Vector2(tank_b.KNOCK_BACK, 0).rotate(knock_back_dir)
                 tank_b.vel -= pg.math.Vector2(tank_b.KNOCK_BACK, 0).rotate(knock_back_dir)
 
     # Handle item pick-up.
-    hits = pg.sprite.groupcollide(groups['tanks'], groups['items'], False, True)
-    for tank, items in hits.items():
-        for item in items:
-            tank.pickup(item)
+    if groups['items']:
+        for tank in all_tanks:
+            for item in groups['items'].query(tank.rect):
+                item.kill()
+                tank.pickup(item)
+
+    if not groups['bullets']:
+        return
+    hits = _first_hits(groups, list(groups['bullets']))
 
     # Damage boxes or destroy if appropriate.
-    hits = pg.sprite.groupcollide(groups['item_boxes'], groups['bullets'], False, True, collide_hit_rect)
-    for box, bullets in hits.items():
+    for bullets in hits['item_boxes'].values():
+        for bullet in bullets:
+            bullet.kill()
+    for box in hits['item_boxes']:
         box.wear_out()
         if not box.alive():
             break
 
     # Handle sprites that take damage from bullets.
-    hits = pg.sprite.groupcollide(groups['damageable'], groups['bullets'], False, True, bullet_collide_owner)
-    for sprite, bullets in hits.items():
+    for sprite, bullets in hits['damageable'].items():
         for bullet in bullets:
             bullet.kill()
-            Explosion(bullet.pos.x, bullet.pos.y, groups)
+            Explosion.spawn(bullet.pos.x, bullet.pos.y, groups)
             sprite.inflict_damage(bullet.damage)
             if sprite.health <= 0:
                 sprite.kill()
 
     # Bullets that hit other obstacles merely disappear.
-    pg.sprite.groupcollide(groups['obstacles'], groups['bullets'], False, True, collide_hit_rect)
+    for bullets in hits['obstacles'].values():
+        for bullet in bullets:
+            bullet.kill()
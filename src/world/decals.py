@@ -0,0 +1,109 @@
+import collections
+import math
+import typing
+import pygame as pg
+
+import src.config as cfg
+
+
+class DecalLayer:
+    """World-space overlay, split into chunks, onto which ground decals like tank tracks are stamped.
+
+    Each chunk fades on its own schedule, so that fading is spread over ticks: every tick, up to fades_per_tick of the
+    chunks that waited longest since their last fade lose the alpha for the time that has passed, as long as that's at
+    least FADE_INTERVAL seconds. Chunks that have not been stamped on for FADE_DURATION seconds are discarded instead.
+    """
+    FADE_DURATION = 1.0
+    FADE_INTERVAL = 0.1
+
+    def __init__(self, world_rect: pg.Rect, chunk_size: int = cfg.DECAL_CHUNK_SIZE,
+                 fades_per_tick: int = cfg.DECAL_FADES_PER_TICK):
+        """Creates an empty decal layer.
+
+        :param world_rect: Rectangle covering the game world.
+        :param chunk_size: Width and height in pixels of each overlay chunk.
+        :param fades_per_tick: Maximum number of chunks faded in one update.
+        """
+        self._world_rect = world_rect
+        self._chunk_size = chunk_size
+        self._fades_per_tick = fades_per_tick
+        self._chunks = {}      # Maps (column, row) to the chunk's overlay surface.
+        self._last_stamp = {}  # Maps (column, row) to the layer time at which the chunk was last stamped on.
+        # Maps (column, row) to the layer time at which the chunk was last faded, or created, longest ago first.
+        self._last_fade = collections.OrderedDict()
+        self._time = 0.0
+
+    @property
+    def chunk_count(self) -> int:
+        """Returns the number of chunks holding decals that have not yet faded."""
+        return len(self._chunks)
+
+    def _chunk_keys(self, area: pg.Rect) -> typing.List[typing.Tuple[int, int]]:
+        """Returns the (column, row) keys of every chunk within the world that overlaps the given area."""
+        area = area.clip(self._world_rect)
+        if not area.w or not area.h:
+            return []
+        size = self._chunk_size
+        return [(cx, cy)
+                for cy in range(area.top // size, (area.bottom - 1) // size + 1)
+                for cx in range(area.left // size, (area.right - 1) // size + 1)]
+
+    def stamp(self, image: pg.Surface, rect: pg.Rect) -> None:
+        """Draws a decal image into the chunks under the given world rectangle.
+
+        :param image: Surface of the decal.
+        :param rect: World rectangle at which the decal is drawn.
+        :return: None
+        """
+        size = self._chunk_size
+        for key in self._chunk_keys(rect):
+            chunk = self._chunks.get(key)
+            if chunk is None:
+                chunk = pg.Surface((size, size), pg.SRCALPHA)
+                self._chunks[key] = chunk
+                self._last_fade[key] = self._time
+            chunk.blit(image, (rect.x - key[0] * size, rect.y - key[1] * size))
+            self._last_stamp[key] = self._time
+
+    def update(self, dt: float) -> None:
+        """Fades the chunks that are due, up to fades_per_tick of them, and discards those whose decals have all faded.
+
+        :param dt: Time elapsed since the layer was last updated.
+        :return: None
+        """
+        self._time += dt
+        last_fade = self._last_fade
+        fades = 0
+        while last_fade and fades < self._fades_per_tick:
+            key, faded_at = next(iter(last_fade.items()))
+            if self._time - faded_at < DecalLayer.FADE_INTERVAL:
+                break
+            if self._time - self._last_stamp[key] > DecalLayer.FADE_DURATION:
+                del self._chunks[key]
+                del self._last_stamp[key]
+                del last_fade[key]
+                continue
+            alpha = min(255, math.ceil(255 * (self._time - faded_at) / DecalLayer.FADE_DURATION))
+            self._chunks[key].fill((0, 0, 0, alpha), special_flags=pg.BLEND_RGBA_SUB)
+            last_fade[key] = self._time
+            last_fade.move_to_end(key)
+            fades += 1
+
+    def draw(self, screen: pg.Surface, camera) -> None:
+        """Blits the chunks in view of the camera.
+
+        :param screen: The screen surface that the decals will be drawn to.
+        :param camera: Camera whose rectangle determines which chunks are visible.
+        :return: None
+        """
+        size = self._chunk_size
+        for key in self._chunk_keys(camera.rect):
+            chunk = self._chunks.get(key)
+            if chunk is not None:
+                screen.blit(chunk, camera.apply(pg.Rect(key[0] * size, key[1] * size, size, size)))
+
+    def clear(self) -> None:
+        """Removes every decal."""
+        self._chunks.clear()
+        self._last_stamp.clear()
+        self._last_fade.clear()
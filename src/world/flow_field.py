@@ -0,0 +1,228 @@
+"""Flow fields over the navigation grid, which steer any number of tanks toward or away from a shared target.
+
+A flow field holds every free cell's shortest distance to the target's cell, so the cost of keeping it up to date
+depends on the size of the grid, not on the number of tanks that follow it. Each tank samples the field at its own cell:
+toward the target is the neighbor closest to it, and away from the target is the neighbor farthest from it.
+
+The distances are computed with NumPy if it's installed, and with Dijkstra's algorithm otherwise, in steps spread
+over several ticks so that a refresh doesn't stall any one of them. They only cover a window of cells around the target,
+since tanks only pursue a target within their range, so that a refresh costs the same on any size of map.
+"""
+import heapq
+import math
+import typing
+import pygame as pg
+
+import src.config as cfg
+import src.utils.timer as timer
+from src.utils.timer import Timer
+from src.world.navigation import NavGrid, STEPS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_STEP_CELLS = 64  # Cells settled by Dijkstra in one step of a refresh.
+# Direction in degrees of a step to each neighbor, in the tanks' convention for rotations.
+_ANGLES = tuple(-math.degrees(math.atan2(dr, dc)) for dc, dr, _ in STEPS)
+
+
+class FlowField:
+    """Distances from every cell of a NavGrid to a target's cell, refreshed as the target moves or obstacles change.
+
+    A refresh is computed a few steps at a time, once per game tick, while tanks keep following the previous distances.
+    The number of steps per tick is fixed, so that runs on a VirtualClock don't depend on the machine's speed.
+    """
+    def __init__(self, grid: NavGrid, interval: float = cfg.FLOW_FIELD_INTERVAL,
+                 steps_per_tick: int = cfg.FLOW_FIELD_STEPS_PER_TICK, radius: int = cfg.FLOW_FIELD_RADIUS):
+        """
+        :param grid: The navigation grid that the field is computed over.
+        :param interval: Minimum milliseconds between the starts of two refreshes of the field.
+        :param steps_per_tick: Steps of a refresh taken per tick; see _distances and _distances_np.
+        :param radius: Cells from the target's cell to the edges of the window that the field covers.
+        """
+        self._grid = grid
+        self._radius = radius
+        self._interval = interval
+        self._steps_per_tick = steps_per_tick
+        self._refresh_timer = Timer()
+        self._goal = None
+        self._version = None
+        self._pending = None  # Refresh in progress, as a generator returning the distances once done.
+        self._last_step = None
+        self._dist = []
+        self._toward = {}  # Maps cells to the index in STEPS toward the target, or None, as they're sampled.
+        self._away = {}
+        self.refreshes = 0
+
+    def update(self, target_pos: pg.math.Vector2) -> None:
+        """Carries on with the refresh in progress, or starts one if the target moved to another cell, or an obstacle
+        appeared or broke, at most once per interval; does nothing if already called in this game tick.
+
+        :param target_pos: World position of the target.
+        :return: None
+        """
+        now = timer.now()
+        if now == self._last_step:
+            return
+        self._last_step = now
+        grid = self._grid
+        if self._pending is None:
+            if self._goal is not None and self._refresh_timer.elapsed() < self._interval:
+                return
+            goal = grid.nearest_free(grid.cell_at(target_pos))
+            if goal is None or (goal == self._goal and grid.version == self._version):
+                return
+            self._goal = goal
+            self._version = grid.version
+            distances = _distances_np if np is not None else _distances
+            self._pending = distances(grid, goal, self._radius)
+            self._refresh_timer.restart()
+        try:
+            for _ in range(self._steps_per_tick):
+                next(self._pending)
+        except StopIteration as done:
+            self._pending = None
+            self._dist = done.value
+            self._toward.clear()
+            self._away.clear()
+            self.refreshes += 1
+
+    def _best_step(self, cell: int, toward: bool) -> typing.Optional[int]:
+        """Returns the index in STEPS of the neighbor to move to from a cell, or None if there's no better neighbor.
+
+        Tanks in a blocked cell, e.g., grinding against a tree, may step to any free neighbor to get clear of it.
+        """
+        grid, dist = self._grid, self._dist
+        cols, rows = grid.cols, grid.rows
+        row, col = divmod(cell, cols)
+        here = dist[cell]
+        inside = not grid.is_blocked(cell)
+        # Toward the target is the neighbor on the shortest path, and away from it is the farthest neighbor, if it's
+        # farther than the cell itself.
+        best, best_value = None, math.inf if toward else (here if inside else -math.inf)
+        for k, (dc, dr, step_cost) in enumerate(STEPS):
+            r, c = row + dr, col + dc
+            if not (0 <= r < rows and 0 <= c < cols):
+                continue
+            neighbor_dist = dist[r * cols + c]
+            if neighbor_dist == math.inf:
+                continue
+            if inside and dr and dc and (grid.is_blocked(row * cols + c) or grid.is_blocked(r * cols + col)):
+                continue
+            if toward and neighbor_dist < here and neighbor_dist + step_cost < best_value:
+                best, best_value = k, neighbor_dist + step_cost
+            elif not toward and neighbor_dist > best_value:
+                best, best_value = k, neighbor_dist
+        return best
+
+    def _sample(self, pos: typing.Sequence[float], toward: bool) -> typing.Optional[float]:
+        if not self._dist:
+            return None
+        cell = self._grid.cell_at(pos)
+        steps = self._toward if toward else self._away
+        if cell not in steps:
+            steps[cell] = self._best_step(cell, toward)
+        k = steps[cell]
+        return None if k is None else _ANGLES[k]
+
+    def toward(self, pos: typing.Sequence[float]) -> typing.Optional[float]:
+        """Returns the direction in degrees in which to drive from a world position along a shortest path to the target.
+
+        :param pos: World position, e.g., of a pursuing tank.
+        :return: Direction in degrees, or None in the target's cell and in cells that can't reach it.
+        """
+        return self._sample(pos, True)
+
+    def away(self, pos: typing.Sequence[float]) -> typing.Optional[float]:
+        """Returns the direction in degrees in which to drive from a world position to get farther from the target.
+
+        :param pos: World position, e.g., of a fleeing tank.
+        :return: Direction in degrees, or None in cells farther from the target than any of their neighbors.
+        """
+        return self._sample(pos, False)
+
+
+def _window(grid: NavGrid, goal: int, radius: int) -> typing.Tuple[int, int, int, int]:
+    """Returns the first and past-the-last row and column of the window of cells within a radius of the goal cell."""
+    row, col = divmod(goal, grid.cols)
+    return (max(row - radius, 0), min(row + radius + 1, grid.rows),
+            max(col - radius, 0), min(col + radius + 1, grid.cols))
+
+
+def _distances(grid: NavGrid, goal: int, radius: int) -> typing.Generator[None, None, typing.List[float]]:
+    """Computes each cell's shortest distance in cells to the goal cell, or infinity if it can't reach it within the
+    window around the goal, by Dijkstra.
+
+    :return: Generator that yields every _STEP_CELLS cells settled, and returns the distances by cell index.
+    """
+    cols, rows = grid.cols, grid.rows
+    row0, row1, col0, col1 = _window(grid, goal, radius)
+    # Blocked cells are read from a copy, as obstacles may change before the distances are done.
+    blocked = [count > 0 for count in grid.blockers]
+    dist = [math.inf] * (cols * rows)
+    dist[goal] = 0.0
+    open_heap = [(0.0, goal)]
+    settled = 0
+    while open_heap:
+        d, current = heapq.heappop(open_heap)
+        if d > dist[current]:
+            continue
+        settled += 1
+        if not settled % _STEP_CELLS:
+            yield
+        row, col = divmod(current, cols)
+        for dc, dr, step_cost in STEPS:
+            r, c = row + dr, col + dc
+            if not (row0 <= r < row1 and col0 <= c < col1):
+                continue
+            neighbor = r * cols + c
+            if blocked[neighbor] or (dr and dc and (blocked[row * cols + c] or blocked[r * cols + col])):
+                continue
+            if d + step_cost < dist[neighbor]:
+                dist[neighbor] = d + step_cost
+                heapq.heappush(open_heap, (d + step_cost, neighbor))
+    return dist
+
+
+def _distances_np(grid: NavGrid, goal: int, radius: int) -> typing.Generator[None, None, typing.List[float]]:
+    """Computes the same distances as _distances, by relaxing every cell of the window against its neighbors at once
+    until none changes.
+
+    :return: Generator that yields after every pass over the window, and returns the distances by cell index.
+    """
+    cols = grid.cols
+    row0, row1, col0, col1 = _window(grid, goal, radius)
+    rows, width = row1 - row0, col1 - col0
+    # Padded with a border of blocked cells, so that every cell has 8 neighbors.
+    free = np.zeros((rows + 2, width + 2), dtype=bool)
+    blockers = np.frombuffer(grid.blockers, dtype=np.uint16).reshape(grid.rows, cols)
+    free[1:-1, 1:-1] = blockers[row0:row1, col0:col1] == 0
+    dist = np.full((rows + 2, width + 2), np.inf)
+    dist[1 + goal // cols - row0, 1 + goal % cols - col0] = 0.0
+    inner = dist[1:-1, 1:-1]
+
+    def shifted(array, dc, dr):
+        return array[1 + dr:rows + 1 + dr, 1 + dc:width + 1 + dc]
+
+    relaxations = []
+    for dc, dr, step_cost in STEPS:
+        passable = free[1:-1, 1:-1] & shifted(free, dc, dr)
+        if dr and dc:
+            # No cutting corners.
+            passable &= shifted(free, dc, 0) & shifted(free, 0, dr)
+        relaxations.append((shifted(dist, dc, dr), np.where(passable, step_cost, np.inf)))
+    previous = np.empty_like(inner)
+    while True:
+        previous[...] = inner
+        for neighbor_dist, step_cost in relaxations:
+            # Updating in place lets distances spread more than one cell per pass.
+            np.minimum(inner, neighbor_dist + step_cost, out=inner)
+        if np.array_equal(previous, inner):
+            break
+        yield
+    result = [math.inf] * (cols * grid.rows)
+    for row, window_row in enumerate(inner.tolist(), row0):
+        result[row * cols + col0:row * cols + col1] = window_row
+    return result
@@ -1,15 +1,35 @@
 import random
+import typing
 import pytmx
 import pygame as pg
 
 
+import src.config as cfg
+import src.services.profiler as profiler
+import src.services.rotation as rotation
+import src.services.sound as sfx_loader
+import src.world.bullet_engine as bullet_engine
 import src.world.collisions as collision_handler
+import src.utils.timer as timer
 from src.world.tiled_map import TiledMapLoader
+from src.world.ai_scheduler import AIScheduler
 from src.world.camera import Camera
+from src.world.decals import DecalLayer
+from src.world.flow_field import FlowField
+from src.world.navigation import Navigator
+from src.world.spatial_hash import IndexedGroup, IndexedLayeredUpdates
+from src.world.static_grid import ObstacleGroup
+from src.world.visibility import Visibility
+from src.entities.ai_mob import AIMob
 from src.entities.player_ctrl import PlayerCtrl
 from src.entities.tank_ctrl import AITankCtrl
 from src.entities.turret_ctrl import AITurretCtrl
 from src.sprites.tank import Tank
+from src.sprites.barrel import Barrel
+from src.sprites.bullet import Bullet
+from src.sprites.effects.muzzle_flash import MuzzleFlash
+from src.sprites.effects.tracks import Tracks
+from src.sprites.attributes.rotateable import RotateMixin
 from src.sprites.turret import Turret
 from src.sprites.obstacles import Tree
 from src.sprites.obstacles import BoundaryWall
@@ -20,32 +40,63 @@ from src.utils.timer import Timer
 class Level:
     """Class that creates, draws, and updates the game world, including the map and all sprites."""
     _ITEM_RESPAWN_TIME = 30000  # 1 minute.
+    _CULL_MARGIN = 64  # Pixels beyond the camera's edges in which sprites are still drawn.
+    _SNAP_DISTANCE = 64  # Sprites that moved farther in one tick, e.g., recycled ones, are drawn without interpolation.
 
-    def __init__(self, level_file: str):
+    def __init__(self, level_file: str, headless: bool = False):
         """Creates a map and creates all of the sprites in it.
 
         :param level_file: Filename of level file to load from the configuration file's map folder.
+        :param headless: Whether the level is only simulated and never drawn, in which case decals aren't kept.
         """
-        # Create the tiled map surface.
+        self._headless = headless
+        # Tanks in a level that's never drawn don't leave tracks.
+        Tank.leaves_tracks = not headless
+        # Create the tiled map renderer; map chunks are baked as the camera approaches them.
         map_loader = TiledMapLoader(level_file)
-        self.image = map_loader.make_map()
-        self.rect = self.image.get_rect()
+        self._map = map_loader.make_chunked_map()
+        self.rect = self._map.rect
+        # Ground decals, such as tank tracks, drawn between the map and the sprites.
+        self._decals = DecalLayer(self.rect)
         self._groups = {
-            'all': pg.sprite.LayeredUpdates(),
-            'tanks': pg.sprite.Group(),
-            'damageable': pg.sprite.Group(),
-            'bullets': pg.sprite.Group(),
-            'obstacles': pg.sprite.Group(),
-            'items': pg.sprite.Group(),
-            'item_boxes': pg.sprite.Group()
+            'all': IndexedLayeredUpdates(),
+            'tanks': IndexedGroup(),
+            'damageable': IndexedGroup(),
+            'bullets': IndexedGroup(),
+            'obstacles': ObstacleGroup(),
+            'items': IndexedGroup(rect_attr='rect'),
+            'item_boxes': IndexedGroup(static=True)
         }
         self._player = None
         self._camera = None
         self._ai_mobs = []
+        # AI mobs far from the player, or idle, think less often than every tick.
+        self._ai_scheduler = AIScheduler()
+        self._ai_boss = None
+        self._ai_patrol_points = []
         self._item_spawn_positions = []
         self._item_spawn_timer = Timer()
+        # AI tanks drive along routes planned on a grid over the map.
+        self._navigator = Navigator(self.rect)
+        # Tanks pursuing or fleeing the player share a single flow field toward the player, refreshed as they use it.
+        self._flow_field = FlowField(self._navigator.grid)
+        # AI mobs only fire at the player when no obstacle is in the way.
+        self._visibility = Visibility(self.rect)
+        AIMob.visibility = self._visibility
+        self._prev_state = {}  # Maps each sprite to its center and rotation before the latest tick.
+        # Bullets are kept in arrays instead of sprites if the bullet engine is enabled.
+        self._bullets = bullet_engine.make_engine()
+        Bullet.engine = self._bullets
         # Initialize all sprites in game world.
         self._init_sprites(map_loader.tiled_map.objects)
+        # Obstacles that never move are baked into a grid over the map's tiles; item boxes can be destroyed.
+        self._groups['obstacles'].bake(self.rect, map_loader.tiled_map.tilewidth, self._groups['item_boxes'])
+        self._navigator.bake(self._groups['obstacles'], self._groups['item_boxes'])
+        self._visibility.bake(self._groups['obstacles'], self._groups['item_boxes'], self._groups['damageable'])
+        # Sound effects are culled and panned by what the camera sees.
+        sfx_loader.set_listener(self._camera.rect)
+        if cfg.ROTATION_CACHE_WARM_UP:
+            rotation.warm_up(self._rotated_image_names())
 
     def _init_sprites(self, objects: pytmx.TiledObjectGroup) -> None:
         """Initializes all of the pygame sprites in this level's map.
@@ -73,15 +124,12 @@ class Level:
 
         # Spawn single enemy tank.
         t = game_objects.get('enemy_tank')
-        tank = Tank.enemy(t.x, t.y, t.size, self._groups)  # Make a tank factory.
-        ai_patrol_points = game_objects.get('ai_patrol_point')
-        ai_boss = AITankCtrl(tank, ai_patrol_points, self._player.tank)
-        self._ai_mobs.append(ai_boss)
+        self._ai_patrol_points = game_objects.get('ai_patrol_point')
+        self._ai_boss = self.add_enemy_tank(t.x, t.y, t.size)
 
         # Spawn turrets.
         for t in game_objects.get('turret'):
-            turret = Turret(t.x, t.y, t.category, t.special, self._groups)
-            self._ai_mobs.append(AITurretCtrl(turret, ai_boss, self._player.tank))
+            self.add_turret(t.x, t.y, t.category, t.special)
 
         # Spawn obstacles that one can collide with.
         for tree in game_objects.get('small_tree'):
@@ -98,11 +146,67 @@ class Level:
         BoundaryWall(x=0, y=0, width=1, height=self.rect.height, all_groups=self._groups)                # Left
         BoundaryWall(x=self.rect.width, y=0, width=1, height=self.rect.height, all_groups=self._groups)  # Right
 
+    def add_enemy_tank(self, x: float, y: float, size: str) -> AITankCtrl:
+        """Spawns an AI-controlled enemy tank that patrols the level's patrol points and pursues the player.
+
+        :param x: x coordinate of the tank's center.
+        :param y: y coordinate of the tank's center.
+        :param size: Size of the enemy tank; see Tank.enemy.
+        :return: The tank's AI controller.
+        """
+        tank = Tank.enemy(x, y, size, self._groups)  # Make a tank factory.
+        ai = AITankCtrl(tank, self._ai_patrol_points, self._player.tank, self._navigator, self._flow_field)
+        self._ai_mobs.append(ai)
+        return ai
+
+    def add_turret(self, x: float, y: float, category: str, special: int) -> AITurretCtrl:
+        """Spawns an AI-controlled turret that attacks the player alongside the level's first enemy tank.
+
+        :param x: x coordinate of the turret's center.
+        :param y: y coordinate of the turret's center.
+        :param category: Bullet category of the turret's barrel.
+        :param special: Number of the special barrel image.
+        :return: The turret's AI controller.
+        """
+        turret = Turret(x, y, category, special, self._groups)
+        self._groups['obstacles'].freeze(turret)
+        self._navigator.add_obstacle(turret)
+        ai = AITurretCtrl(turret, self._ai_boss, self._player.tank)
+        self._ai_mobs.append(ai)
+        return ai
+
+    def _rotated_image_names(self) -> set:
+        """Returns the names of every image that this level's sprites may rotate, i.e., for cache warm-up."""
+        names = {MuzzleFlash.IMAGE, Tracks.IMAGE}
+        for sprite in self._groups['all']:
+            if isinstance(sprite, RotateMixin):
+                names.add(sprite.image_name)
+            if isinstance(sprite, Barrel):
+                names.add(sprite.bullet_image)
+        return names
+
     def _can_spawn_item(self) -> bool:
         """"Checks if a new item can be spawned."""
         return self._item_spawn_timer.elapsed() > Level._ITEM_RESPAWN_TIME and \
             len(self._groups['items']) + len(self._groups['item_boxes']) < len(self._item_spawn_positions)
 
+    @property
+    def player(self) -> PlayerCtrl:
+        return self._player
+
+    @property
+    def ai_mobs(self) -> list:
+        """Returns the controllers of the AI mobs that haven't been defeated."""
+        return self._ai_mobs
+
+    @property
+    def ai_scheduler(self) -> AIScheduler:
+        return self._ai_scheduler
+
+    @property
+    def visibility(self) -> Visibility:
+        return self._visibility
+
     def is_player_alive(self) -> bool:
         """Checks if the player's tank has been defeated."""
         return self._player.tank.alive()
@@ -111,12 +215,17 @@ class Level:
         """Checks if all the AI mobs have been defeated."""
         return len(self._ai_mobs)
 
-    def process_inputs(self) -> None:
-        """Handles keys and clicks that affect the game world."""
+    def process_inputs(self, mouse_world_pos: pg.math.Vector2 = None) -> None:
+        """Handles keys and clicks that affect the game world.
+
+        :param mouse_world_pos: World position to aim at instead of the mouse's, i.e., for scripted input.
+        :return: None
+        """
         self._player.handle_keys()
-        # Convert mouse coordinates to world coordinates.
-        mouse_x, mouse_y = pg.mouse.get_pos()
-        mouse_world_pos = pg.math.Vector2(mouse_x + self._camera.rect.x, mouse_y + self._camera.rect.y)
+        if mouse_world_pos is None:
+            # Convert mouse coordinates to world coordinates.
+            mouse_x, mouse_y = pg.mouse.get_pos()
+            mouse_world_pos = pg.math.Vector2(mouse_x + self._camera.rect.x, mouse_y + self._camera.rect.y)
         self._player.handle_mouse(mouse_world_pos)
 
     def update(self, dt: float) -> None:
@@ -125,17 +234,56 @@ class Level:
         :param dt: time elapsed since the last update of the game world.
         :return: None
         """
-        for ai in self._ai_mobs:
-            ai.update(dt)
+        if not self._headless:
+            self._save_render_state()
+        timer.run_due()
+        with profiler.phase('ai'):
+            self._update_ai(dt)
+        with profiler.phase('sprites'):
+            self._update_sprites(dt)
+        with profiler.phase('collisions'):
+            self._resolve_collisions()
+        self._spawn_items()
+
+        # Filter out any AIs that have been defeated, freeing the cells that destroyed turrets blocked.
+        defeated = [ai for ai in self._ai_mobs if not ai.sprite.alive()]
+        if defeated:
+            for ai in defeated:
+                self._navigator.remove_obstacle(ai.sprite)
+            self._ai_mobs = [ai for ai in self._ai_mobs if ai.sprite.alive()]
+
+    def _update_ai(self, dt: float) -> None:
+        """Lets the AI mobs that are due decide on their next action, once routes and lines of sight are updated for
+        item boxes that appeared or broke, the routes being planned are carried on with, and every AI mob's line of
+        sight to the player is checked."""
+        self._navigator.sync(self._groups['item_boxes'])
+        self._navigator.update()
+        self._visibility.sync(self._groups['item_boxes'])
+        self._visibility.update([ai.sprite for ai in self._ai_mobs], self._player.tank)
+        self._ai_scheduler.update(self._ai_mobs, self._player.tank.pos, dt)
+
+    def _update_sprites(self, dt: float) -> None:
+        """Updates every sprite, stamps the tracks that tanks left behind, and follows the player with the camera."""
         self._groups['all'].update(dt)
-        # Update list of ai mobs.
+        if self._bullets is not None:
+            self._bullets.update(dt)
+        for tank in self._groups['tanks']:
+            for tracks in tank.pop_track_marks():
+                self._decals.stamp(tracks.image, tracks.rect)
+        self._decals.update(dt)
         self._camera.update()
 
+    def _resolve_collisions(self) -> None:
+        """Resolves collisions between sprites, restarting the item spawn timer once an item is picked up."""
         game_items_count = len(self._groups['items'])
         collision_handler.handle_collisions(self._groups)
+        if self._bullets is not None:
+            self._bullets.collide(self._groups)
         if game_items_count > 0 and len(self._groups['items']) < game_items_count:
             self._item_spawn_timer.restart()
-        # See if it's time to spawn a new item.
+
+    def _spawn_items(self) -> None:
+        """Spawns a new item box at a free spawn position if it's time to."""
         if self._can_spawn_item():
             available_positions = self._item_spawn_positions.copy()
             for x, y in self._item_spawn_positions:
@@ -149,23 +297,73 @@ class Level:
                 x, y, = random.choice(available_positions)
                 ItemBox.spawn(x, y, self._groups)
 
-        # Filter out any AIs that have been defeated.
-        self._ai_mobs = [ai for ai in self._ai_mobs if ai.sprite.alive()]
+    def _save_render_state(self) -> None:
+        """Records every sprite's center and rotation, which are interpolated from when drawing between ticks."""
+        self._prev_state = {sprite: (sprite.rect.center, sprite.rot if isinstance(sprite, RotateMixin) else None)
+                            for sprite in self._groups['all']}
+
+    def _interpolated(self, sprite: pg.sprite.Sprite, alpha: float) -> typing.Tuple[pg.Surface, pg.Rect]:
+        """Returns the image and world rectangle of a sprite between its previous and latest ticks.
 
-    def draw(self, screen: pg.Surface) -> None:
-        """Draws every sprite in the game world, as well as heads-up display elements.
+        :param sprite: Sprite to draw.
+        :param alpha: Fraction of the way from the previous tick (0) to the latest one (1).
+        :return: The image to draw and the rectangle at which to draw it.
+        """
+        prev = self._prev_state.get(sprite)
+        if prev is None or alpha >= 1:
+            return sprite.image, sprite.rect
+        prev_center, prev_rot = prev
+        center = pg.math.Vector2(sprite.rect.center)
+        if center.distance_squared_to(prev_center) > Level._SNAP_DISTANCE ** 2:
+            return sprite.image, sprite.rect
+        image = sprite.image
+        if prev_rot is not None and prev_rot != sprite.rot:
+            # Turn the short way around, e.g., from 350 to 10 degrees through 0.
+            turn = (sprite.rot - prev_rot + 180) % 360 - 180
+            image = sprite.image_at(prev_rot + turn * alpha)
+        return image, image.get_rect(center=center.lerp(prev_center, 1 - alpha))
+
+    def draw(self, screen: pg.Surface, alpha: float = 1.0) -> None:
+        """Draws the sprites in view of the camera, as well as heads-up display elements.
 
         :param screen: The screen surface that the world's elements will be drawn to.
+        :param alpha: Fraction of a tick elapsed since the latest update, by which sprites and camera are interpolated.
         :return: None
         """
-        # Draw the map.
-        screen.blit(self.image, self._camera.apply(self.rect))
-        # Draw all sprites.
-        for sprite in self._groups['all']:
-            screen.blit(sprite.image, self._camera.apply(sprite.rect))
+        self._camera.interpolate(alpha)
+        # Draw the map chunks in view.
+        self._map.draw(screen, self._camera)
+        self._decals.draw(screen, self._camera)
+        # Draw only the sprites that the spatial index reports as near the camera.
+        visible = self._groups['all'].visible(self._camera.view_rect(Level._CULL_MARGIN))
+        offset_x, offset_y = -self._camera.rect.x, -self._camera.rect.y
+        drawn_rects = {}
+        engine_drawn = self._bullets is None
+        for sprite in visible:
+            if not engine_drawn and self._groups['all'].get_layer_of_sprite(sprite) > cfg.ITEM_LAYER:
+                # Bullets in the engine are drawn on the same layer as bullet sprites.
+                self._bullets.draw(screen, self._camera, alpha)
+                engine_drawn = True
+            image, rect = self._interpolated(sprite, alpha)
+            drawn_rects[sprite] = rect
+            screen.blit(image, rect.move(offset_x, offset_y))
             # pg.draw.rect(screen, (255, 255, 255), self._camera.apply(sprite.hit_rect), 1)
+        if not engine_drawn:
+            self._bullets.draw(screen, self._camera, alpha)
 
         # Draw HUD.
         for ai in self._ai_mobs:
-            ai.sprite.draw_health(screen, self._camera)
-        self._player.draw_hud(screen, self._camera)
+            rect = drawn_rects.get(ai.sprite)
+            if rect is not None:
+                # Keep the health bar on the interpolated sprite.
+                outline_rect = ai.sprite.hit_rect.copy()
+                outline_rect.height = outline_rect.height // 3
+                outline_rect.move_ip(rect.centerx - ai.sprite.rect.centerx, rect.centery - ai.sprite.rect.centery)
+                ai.sprite.draw_health(screen, self._camera, outline_rect)
+        self._player.draw_hud(screen)
+        if profiler.enabled():
+            for name, group in self._groups.items():
+                profiler.count(f'sprites.{name}', len(group))
+            if self._bullets is not None:
+                profiler.count('bullet_engine', len(self._bullets))
+            profiler.count('ai_deferred', self._ai_scheduler.stats()['deferred'])
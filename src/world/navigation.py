@@ -0,0 +1,416 @@
+"""Navigation grid over the game world, with an A* planner whose routes are cached and replanned incrementally.
+
+Cells that an obstacle, grown by a clearance for the tanks' size, overlaps are blocked. Routes between pairs of cells
+are cached, so tanks patrolling between the same points share them. When an obstacle appears, e.g., an item box
+respawns, only the cached routes through the cells it blocks are dropped; routes stay valid when obstacles break.
+Planning routes that aren't cached takes a fixed number of steps per tick, so that a route across a large map is
+planned over several ticks instead of stalling one.
+"""
+import array
+import collections
+import heapq
+import math
+import typing
+import pygame as pg
+
+import src.config as cfg
+import src.utils.timer as timer
+
+_DIAGONAL = math.sqrt(2)
+_STEP_CELLS = 64  # Cells expanded by A* in one step of a search.
+_PLAN_TIMEOUT = 1000  # Milliseconds after which a route being planned is dropped if it hasn't been asked for again.
+# Column offset, row offset, and cost of a step to each of a cell's neighbors.
+STEPS = ((1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+          (1, 1, _DIAGONAL), (1, -1, _DIAGONAL), (-1, 1, _DIAGONAL), (-1, -1, _DIAGONAL))
+
+
+class NavGrid:
+    """Grid over the game world counting, for each cell, the obstacles that block it."""
+    def __init__(self, world_rect: pg.Rect, cell_size: int = cfg.NAV_CELL_SIZE, clearance: int = cfg.NAV_CLEARANCE):
+        """Creates a grid with every cell free.
+
+        :param world_rect: Rectangle covering the game world.
+        :param cell_size: Width and height in pixels of each cell.
+        :param clearance: Pixels by which obstacles are grown on each side, so that routes keep tanks clear of them.
+        """
+        self.cell_size = cell_size
+        self._left, self._top = world_rect.topleft
+        self.cols = max(1, math.ceil(world_rect.width / cell_size))
+        self.rows = max(1, math.ceil(world_rect.height / cell_size))
+        self._clearance = clearance
+        self._blockers = array.array('H', bytes(2 * self.cols * self.rows))
+        self._spans = {}  # Maps each obstacle to the indices of the cells it blocks.
+        self.version = 0  # Counts the changes to the blocked cells, for anything computed from them.
+
+    def __contains__(self, sprite) -> bool:
+        return sprite in self._spans
+
+    def __iter__(self) -> typing.Iterator:
+        return iter(self._spans)
+
+    def cell_at(self, pos: typing.Sequence[float]) -> int:
+        """Returns the index of the cell containing a world position, clamped to the grid."""
+        col = min(max(int((pos[0] - self._left) // self.cell_size), 0), self.cols - 1)
+        row = min(max(int((pos[1] - self._top) // self.cell_size), 0), self.rows - 1)
+        return row * self.cols + col
+
+    def center(self, index: int) -> pg.math.Vector2:
+        """Returns the world position of a cell's center."""
+        row, col = divmod(index, self.cols)
+        return pg.math.Vector2(self._left + (col + 0.5) * self.cell_size, self._top + (row + 0.5) * self.cell_size)
+
+    def is_blocked(self, index: int) -> bool:
+        return self._blockers[index] > 0
+
+    @property
+    def blockers(self) -> array.array:
+        """Returns the number of obstacles blocking each cell, by index, e.g., to be read as a NumPy buffer."""
+        return self._blockers
+
+    def _cells_under(self, rect: pg.Rect) -> typing.List[int]:
+        """Returns the indices of the cells that a rectangle, grown by the clearance, overlaps."""
+        grown = rect.inflate(2 * self._clearance, 2 * self._clearance)
+        size = self.cell_size
+        col0 = max((grown.left - self._left) // size, 0)
+        row0 = max((grown.top - self._top) // size, 0)
+        col1 = min((grown.right - 1 - self._left) // size, self.cols - 1)
+        row1 = min((grown.bottom - 1 - self._top) // size, self.rows - 1)
+        return [row * self.cols + col for row in range(row0, row1 + 1) for col in range(col0, col1 + 1)]
+
+    def add_obstacle(self, sprite) -> typing.List[int]:
+        """Blocks the cells under an obstacle's hit_rect.
+
+        :return: Indices of the cells that were free until now.
+        """
+        span = self._cells_under(sprite.hit_rect)
+        self._spans[sprite] = span
+        newly_blocked = [i for i in span if not self._blockers[i]]
+        for i in span:
+            self._blockers[i] += 1
+        self.version += 1
+        return newly_blocked
+
+    def remove_obstacle(self, sprite) -> None:
+        """Frees the cells under an obstacle that no other obstacle blocks."""
+        span = self._spans.pop(sprite, None)
+        if span is None:
+            return
+        for i in span:
+            self._blockers[i] -= 1
+        self.version += 1
+
+    def nearest_free(self, index: int, max_radius: int = 4) -> typing.Optional[int]:
+        """Returns the closest free cell to a cell, which is the cell itself if it's free.
+
+        :param index: Index of the cell to start from, e.g., one that a tank grinding against a tree is in.
+        :param max_radius: Number of rings of cells around the cell to search.
+        :return: Index of a free cell, or None if there's none nearby.
+        """
+        if not self._blockers[index]:
+            return index
+        row, col = divmod(index, self.cols)
+        for radius in range(1, max_radius + 1):
+            ring = [(r, c) for r in range(row - radius, row + radius + 1) for c in range(col - radius, col + radius + 1)
+                    if max(abs(r - row), abs(c - col)) == radius and 0 <= r < self.rows and 0 <= c < self.cols]
+            ring.sort(key=lambda cell: (cell[0] - row) ** 2 + (cell[1] - col) ** 2)
+            for r, c in ring:
+                if not self._blockers[r * self.cols + c]:
+                    return r * self.cols + c
+        return None
+
+    def line_clear(self, start: pg.math.Vector2, end: pg.math.Vector2) -> bool:
+        """Checks if a straight line between two world positions only crosses free cells."""
+        # Sample the line every half cell, in cell coordinates.
+        size = self.cell_size
+        x, y = (start[0] - self._left) / size, (start[1] - self._top) / size
+        steps = max(1, math.ceil(start.distance_to(end) / (size / 2)))
+        step_x, step_y = (end[0] - start[0]) / size / steps, (end[1] - start[1]) / size / steps
+        cols, max_col, max_row, blockers = self.cols, self.cols - 1, self.rows - 1, self._blockers
+        for _ in range(steps + 1):
+            if blockers[min(max(int(y), 0), max_row) * cols + min(max(int(x), 0), max_col)]:
+                return False
+            x += step_x
+            y += step_y
+        return True
+
+    def find_path(self, start: int, goal: int) -> typing.Optional[typing.List[int]]:
+        """Finds a shortest path between two free cells with A*, moving in 8 directions without cutting corners.
+
+        :param start: Index of the cell to start from.
+        :param goal: Index of the cell to reach.
+        :return: Indices of the cells along the path, from start to goal, or None if the goal can't be reached.
+        """
+        search = self.search(start, goal)
+        while True:
+            try:
+                next(search)
+            except StopIteration as done:
+                return done.value
+
+    def search(self, start: int, goal: int) -> typing.Generator[None, None, typing.Optional[typing.List[int]]]:
+        """Finds the same path as find_path, in steps that can be spread over several ticks; the blocked cells must not
+        change until it's done.
+
+        :return: Generator that yields every _STEP_CELLS cells expanded, and returns the path or None.
+        """
+        cols, rows, blockers = self.cols, self.rows, self._blockers
+        goal_row, goal_col = divmod(goal, cols)
+
+        def heuristic(index: int) -> float:
+            # Octile distance: the cost of the best path if there were no obstacles.
+            dy, dx = abs(index // cols - goal_row), abs(index % cols - goal_col)
+            return max(dx, dy) + (_DIAGONAL - 1) * min(dx, dy)
+
+        came_from = {start: None}
+        cost = {start: 0.0}
+        open_heap = [(heuristic(start), 0.0, start)]
+        expanded = 0
+        while open_heap:
+            _, g, current = heapq.heappop(open_heap)
+            if current == goal:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = came_from[current]
+                return path[::-1]
+            if g > cost[current]:
+                continue
+            expanded += 1
+            if not expanded % _STEP_CELLS:
+                yield
+            row, col = divmod(current, cols)
+            for dc, dr, step_cost in STEPS:
+                r, c = row + dr, col + dc
+                if not (0 <= r < rows and 0 <= c < cols):
+                    continue
+                neighbor = r * cols + c
+                if blockers[neighbor]:
+                    continue
+                if dr and dc and (blockers[row * cols + c] or blockers[r * cols + col]):
+                    continue
+                new_cost = g + step_cost
+                if new_cost < cost.get(neighbor, math.inf):
+                    cost[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    heapq.heappush(open_heap, (new_cost + heuristic(neighbor), new_cost, neighbor))
+        return None
+
+
+class Route:
+    """Waypoints between two cells, which stop being valid once an obstacle blocks one of the cells along them.
+
+    A pending route has no waypoints yet: it stands for a route that the Navigator is still planning, and that is to be
+    asked for again in a later tick.
+    """
+    __slots__ = ('waypoints', 'cells', 'valid', 'pending')
+
+    def __init__(self, waypoints: typing.List[pg.math.Vector2], cells: typing.List[int], pending: bool = False):
+        self.waypoints = waypoints
+        self.cells = cells
+        self.valid = not pending
+        self.pending = pending
+
+
+class Navigator:
+    """Plans routes on a NavGrid and caches them between pairs of cells."""
+    def __init__(self, world_rect: pg.Rect, cache_size: int = cfg.NAV_ROUTE_CACHE_SIZE,
+                 steps_per_tick: int = cfg.NAV_SEARCH_STEPS_PER_TICK):
+        """
+        :param world_rect: Rectangle covering the game world.
+        :param cache_size: Maximum number of cached routes; the least recently used are dropped first.
+        :param steps_per_tick: Steps of route planning taken per tick, shared by every route being planned; see _plan.
+        """
+        self._grid = NavGrid(world_rect)
+        self._cache_size = cache_size
+        self._steps_per_tick = steps_per_tick
+        self._routes = collections.OrderedDict()  # Maps (start cell, goal cell) to a Route.
+        self._routes_through = {}  # Maps each cell to the keys of the cached routes through it.
+        # Maps (start cell, goal cell) to a route being planned, see _plan, and the game time it was last asked for.
+        self._plans = collections.OrderedDict()
+        self._unreachable = set()  # Keys of the routes whose goal can't be reached, until obstacles change.
+        self._dynamic = set()
+        self._stats = {'hits': 0, 'misses': 0, 'deferred': 0, 'invalidated': 0}
+
+    @property
+    def grid(self) -> NavGrid:
+        return self._grid
+
+    def bake(self, obstacles: typing.Iterable, dynamic: typing.Iterable = ()) -> None:
+        """Blocks the cells under every obstacle, except the dynamic ones, which are kept in step by sync.
+
+        :param obstacles: Obstacles in the game world, i.e., the 'obstacles' group.
+        :param dynamic: Obstacles that can appear and break, such as item boxes.
+        :return: None
+        """
+        dynamic = set(dynamic)
+        for sprite in obstacles:
+            if sprite not in dynamic:
+                # Routes planned before baking, i.e., by tanks created along with the map, are planned again.
+                self.add_obstacle(sprite)
+        self.sync(dynamic)
+
+    def add_obstacle(self, sprite) -> None:
+        """Blocks the cells under a new obstacle, dropping the cached routes through them and the routes being
+        planned."""
+        if sprite not in self._grid:
+            self._invalidate(self._grid.add_obstacle(sprite))
+            self._plans.clear()
+            self._unreachable.clear()
+
+    def remove_obstacle(self, sprite) -> None:
+        """Frees the cells under an obstacle; cached routes stay valid, if no longer the shortest, and routes being
+        planned start over."""
+        if sprite in self._grid:
+            self._grid.remove_obstacle(sprite)
+            self._plans.clear()
+            self._unreachable.clear()
+
+    def sync(self, dynamic: typing.Iterable) -> None:
+        """Updates the grid with the dynamic obstacles that appeared or broke since the last call.
+
+        :param dynamic: Every dynamic obstacle currently in the game world, e.g., the 'item_boxes' group.
+        :return: None
+        """
+        current = set(dynamic)
+        if current == self._dynamic:
+            return
+        for sprite in self._dynamic - current:
+            self.remove_obstacle(sprite)
+        for sprite in current - self._dynamic:
+            self.add_obstacle(sprite)
+        self._dynamic = current
+
+    def _invalidate(self, cells: typing.Iterable[int]) -> None:
+        """Drops the cached routes through any of the given cells, marking them as invalid for the tanks using them."""
+        for cell in cells:
+            for key in self._routes_through.pop(cell, ()):
+                route = self._routes.get(key)
+                if route is not None:
+                    self._forget(key)
+                    route.valid = False
+                    self._stats['invalidated'] += 1
+
+    def _forget(self, key: typing.Tuple[int, int]) -> None:
+        """Removes a route from the cache and from the index of routes by cell."""
+        route = self._routes.pop(key)
+        for cell in route.cells:
+            keys = self._routes_through.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._routes_through[cell]
+
+    def _smooth(self, cells: typing.List[int]) -> typing.Generator[None, None, typing.List[pg.math.Vector2]]:
+        """Turns a path of cells into as few waypoints as possible, skipping the turns that are in a clear line of sight.
+
+        :return: Generator that yields once for every _STEP_CELLS cells of the path that the lines checked span, and
+            returns the waypoints.
+        """
+        centers = [self._grid.center(cell) for cell in cells]
+        # The path runs straight between the cells where it turns, so only those and the goal may become waypoints.
+        turns = [i for i in range(1, len(cells) - 1) if cells[i] - cells[i - 1] != cells[i + 1] - cells[i]]
+        turns.append(len(cells) - 1)
+        waypoints = [centers[0]]
+        anchor = 0
+        spanned = 0
+        k = 0
+        while anchor < len(centers) - 1:
+            reach = turns[k]
+            k += 1
+            while k < len(turns):
+                spanned += turns[k] - anchor
+                while spanned >= _STEP_CELLS:
+                    spanned -= _STEP_CELLS
+                    yield
+                if not self._grid.line_clear(centers[anchor], centers[turns[k]]):
+                    break
+                reach = turns[k]
+                k += 1
+            waypoints.append(centers[reach])
+            anchor = reach
+        return waypoints
+
+    def _plan(self, start: int, goal: int) -> typing.Generator[None, None, typing.Optional[Route]]:
+        """Searches for a path between two free cells and smooths it into a route, in steps.
+
+        :return: Generator that yields after every step, and returns the route, or None if the goal can't be reached.
+        """
+        cells = yield from self._grid.search(start, goal)
+        if cells is None:
+            return None
+        waypoints = yield from self._smooth(cells)
+        return Route(waypoints, cells)
+
+    def route(self, start: pg.math.Vector2, goal: pg.math.Vector2) -> typing.Optional[Route]:
+        """Returns a route between two world positions, from the cache if one exists between their cells.
+
+        The route's waypoints start at the start cell's center and end at the goal cell's center, and the route
+        becomes invalid once an obstacle blocks a cell along it. A route that isn't cached is planned by update over
+        the following ticks; until it's done, a pending route is returned each time it's asked for.
+
+        :param start: World position to start from, e.g., a tank's position.
+        :param goal: World position to reach.
+        :return: The route, which may be pending, or None if the goal can't be reached.
+        """
+        grid = self._grid
+        start_cell = grid.nearest_free(grid.cell_at(start))
+        goal_cell = grid.nearest_free(grid.cell_at(goal))
+        if start_cell is None or goal_cell is None:
+            return None
+        key = (start_cell, goal_cell)
+        route = self._routes.get(key)
+        if route is not None:
+            self._routes.move_to_end(key)
+            self._stats['hits'] += 1
+            return route
+        if key in self._unreachable:
+            return None
+        if key in self._plans:
+            self._plans[key][1] = timer.now()
+        else:
+            self._stats['misses'] += 1
+            self._plans[key] = [self._plan(start_cell, goal_cell), timer.now()]
+        self._stats['deferred'] += 1
+        return Route([], [], pending=True)
+
+    def update(self) -> None:
+        """Carries on planning the routes asked for, oldest first, within the steps per tick; called once per tick.
+
+        :return: None
+        """
+        now = timer.now()
+        steps = self._steps_per_tick
+        for key, (plan, asked) in list(self._plans.items()):
+            if now - asked > _PLAN_TIMEOUT:
+                # No one is waiting for the route anymore, e.g., the tank that asked for it is pursuing the player.
+                del self._plans[key]
+                continue
+            if not steps:
+                continue
+            try:
+                while steps:
+                    steps -= 1
+                    next(plan)
+            except StopIteration as done:
+                del self._plans[key]
+                if done.value is None:
+                    self._unreachable.add(key)
+                else:
+                    self._add(key, done.value)
+
+    def _add(self, key: typing.Tuple[int, int], route: Route) -> None:
+        """Caches a route that has been planned, dropping the least recently used route if the cache is full."""
+        self._routes[key] = route
+        for cell in route.cells:
+            self._routes_through.setdefault(cell, set()).add(key)
+        if len(self._routes) > self._cache_size:
+            self._forget(next(iter(self._routes)))
+
+    def line_clear(self, start: pg.math.Vector2, end: pg.math.Vector2) -> bool:
+        """Checks if a tank could drive straight between two world positions without meeting an obstacle."""
+        return self._grid.line_clear(start, end)
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Returns the number of cached routes, cache hits and misses, pending routes handed out, and routes
+        invalidated by new obstacles."""
+        return {'routes': len(self._routes), **self._stats}
@@ -0,0 +1,216 @@
+"""Uniform-grid spatial hashing for querying sprites by the area they occupy."""
+import typing
+import pygame as pg
+
+
+class SpatialHash:
+    """Buckets sprites into square grid cells so that area queries only visit nearby sprites."""
+    def __init__(self, cell_size: int = 128, rect_attr: str = 'rect'):
+        """Creates an empty spatial hash.
+
+        :param cell_size: Width and height, in pixels, of each grid cell.
+        :param rect_attr: Name of the sprite attribute holding the rectangle to index, i.e., 'rect' or 'hit_rect'.
+        """
+        if cell_size <= 0:
+            raise ValueError(f"Expected positive cell_size, but received {cell_size}")
+        self._cell_size = cell_size
+        self._rect_attr = rect_attr
+        self._cells = {}  # Maps (cell_x, cell_y) to the set of sprites overlapping that cell.
+        self._spans = {}  # Maps each sprite to the (x0, y0, x1, y1) range of cells it overlaps.
+
+    @property
+    def cell_size(self) -> int:
+        return self._cell_size
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __contains__(self, sprite) -> bool:
+        return sprite in self._spans
+
+    def __iter__(self) -> typing.Iterator:
+        return iter(self._spans)
+
+    def _span(self, rect: pg.Rect) -> typing.Tuple[int, int, int, int]:
+        """Returns the inclusive range of cells that a rectangle overlaps."""
+        size = self._cell_size
+        return (rect.left // size, rect.top // size,
+                max(rect.right - 1, rect.left) // size, max(rect.bottom - 1, rect.top) // size)
+
+    def _add_to_cells(self, sprite, span: typing.Tuple[int, int, int, int]) -> None:
+        """Adds a sprite to every cell in the given span."""
+        x0, y0, x1, y1 = span
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self._cells.setdefault((cx, cy), set()).add(sprite)
+
+    def _remove_from_cells(self, sprite, span: typing.Tuple[int, int, int, int]) -> None:
+        """Removes a sprite from every cell in the given span, discarding cells that become empty."""
+        x0, y0, x1, y1 = span
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell is not None:
+                    cell.discard(sprite)
+                    if not cell:
+                        del self._cells[(cx, cy)]
+
+    def insert(self, sprite) -> None:
+        """Indexes a sprite by its current rectangle, re-indexing it if it was already present."""
+        if sprite in self._spans:
+            self.move(sprite)
+            return
+        span = self._span(getattr(sprite, self._rect_attr))
+        self._spans[sprite] = span
+        self._add_to_cells(sprite, span)
+
+    def remove(self, sprite) -> None:
+        """Removes a sprite from the index; does nothing if the sprite is not indexed."""
+        span = self._spans.pop(sprite, None)
+        if span is not None:
+            self._remove_from_cells(sprite, span)
+
+    def move(self, sprite) -> bool:
+        """Re-buckets an indexed sprite after its rectangle has changed.
+
+        :param sprite: A sprite that has already been inserted.
+        :return: boolean, whether the sprite changed cells.
+        """
+        old_span = self._spans[sprite]
+        new_span = self._span(getattr(sprite, self._rect_attr))
+        if new_span == old_span:
+            return False
+        self._remove_from_cells(sprite, old_span)
+        self._add_to_cells(sprite, new_span)
+        self._spans[sprite] = new_span
+        return True
+
+    def query(self, rect: pg.Rect) -> typing.Set:
+        """Returns the set of sprites whose indexed rectangle overlaps the given rectangle.
+
+        :param rect: Area to search, in the same coordinates as the indexed rectangles.
+        :return: Set of sprites overlapping rect.
+        """
+        x0, y0, x1, y1 = self._span(rect)
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        attr = self._rect_attr
+        return {sprite for sprite in found if rect.colliderect(getattr(sprite, attr))}
+
+    def clear(self) -> None:
+        """Removes every sprite from the index."""
+        self._cells.clear()
+        self._spans.clear()
+
+
+class IndexedLayeredUpdates(pg.sprite.LayeredUpdates):
+    """LayeredUpdates group that keeps its sprites in a SpatialHash so that only visible sprites need drawing."""
+    def __init__(self, *sprites, cell_size: int = 128, **kwargs):
+        """Creates the spatial index before any sprite is added to the group."""
+        self._index = SpatialHash(cell_size)
+        # Sprites are added to groups before their rect is assigned, so they're indexed lazily.
+        self._pending = set()
+        self._order = {}
+        self._next_order = 0
+        pg.sprite.LayeredUpdates.__init__(self, *sprites, **kwargs)
+
+    @property
+    def index(self) -> SpatialHash:
+        return self._index
+
+    def add_internal(self, sprite, layer=None) -> None:
+        """Adds the sprite to the group and queues it for indexing."""
+        pg.sprite.LayeredUpdates.add_internal(self, sprite, layer)
+        self._pending.add(sprite)
+        self._order[sprite] = self._next_order
+        self._next_order += 1
+
+    def remove_internal(self, sprite) -> None:
+        """Removes the sprite from the group and from the spatial index."""
+        pg.sprite.LayeredUpdates.remove_internal(self, sprite)
+        self._pending.discard(sprite)
+        self._order.pop(sprite, None)
+        self._index.remove(sprite)
+
+    def update(self, *args, **kwargs) -> None:
+        """Updates every sprite, then re-buckets those that moved to a different cell."""
+        pg.sprite.LayeredUpdates.update(self, *args, **kwargs)
+        self.reindex()
+
+    def reindex(self) -> None:
+        """Indexes newly added sprites and re-buckets sprites whose rectangles have changed cells."""
+        self._flush_pending()
+        for sprite in self._index:
+            self._index.move(sprite)
+
+    def _flush_pending(self) -> None:
+        """Indexes sprites that were added since the last flush."""
+        for sprite in self._pending:
+            self._index.insert(sprite)
+        self._pending.clear()
+
+    def visible(self, rect: pg.Rect) -> typing.List[pg.sprite.Sprite]:
+        """Returns the sprites overlapping a rectangle, in the same order that the group would draw them.
+
+        :param rect: Area of the world to query, i.e., the camera's view.
+        :return: List of sprites sorted by layer, then by the order they were added.
+        """
+        self._flush_pending()
+        layers = self._spritelayers
+        order = self._order
+        return sorted(self._index.query(rect), key=lambda sprite: (layers[sprite], order[sprite]))
+
+
+class IndexedGroup(pg.sprite.Group):
+    """Group that keeps its sprites in a SpatialHash, i.e., as a broadphase for collision checks between groups."""
+    def __init__(self, *sprites, cell_size: int = 128, rect_attr: str = 'hit_rect', static: bool = False):
+        """Creates the spatial index before any sprite is added to the group.
+
+        :param cell_size: Width and height, in pixels, of each grid cell.
+        :param rect_attr: Name of the sprite attribute holding the rectangle to index.
+        :param static: Whether the group's sprites never move once added, so they never need re-bucketing.
+        """
+        self._index = SpatialHash(cell_size, rect_attr)
+        # Sprites are added to groups before their rect is assigned, so they're indexed lazily.
+        self._pending = set()
+        self._static = static
+        pg.sprite.Group.__init__(self, *sprites)
+
+    def add_internal(self, sprite, layer=None) -> None:
+        """Adds the sprite to the group and queues it for indexing."""
+        pg.sprite.Group.add_internal(self, sprite)
+        self._pending.add(sprite)
+
+    def remove_internal(self, sprite) -> None:
+        """Removes the sprite from the group and from the spatial index."""
+        pg.sprite.Group.remove_internal(self, sprite)
+        self._pending.discard(sprite)
+        self._index.remove(sprite)
+
+    def reindex(self) -> None:
+        """Indexes newly added sprites and, unless the group is static, re-buckets sprites that changed cells."""
+        self._flush_pending()
+        if not self._static:
+            for sprite in self._index:
+                self._index.move(sprite)
+
+    def query(self, rect: pg.Rect) -> typing.Set:
+        """Returns the group's sprites whose indexed rectangle overlaps the given rectangle.
+
+        Sprites of a non-static group are found where they were at the last reindex() call.
+
+        :param rect: Area to search.
+        :return: Set of sprites overlapping rect.
+        """
+        self._flush_pending()
+        return self._index.query(rect)
+
+    def _flush_pending(self) -> None:
+        """Indexes sprites that were added since the last flush."""
+        for sprite in self._pending:
+            self._index.insert(sprite)
+        self._pending.clear()
@@ -0,0 +1,140 @@
+"""Occupancy grid of the obstacles that never move, baked once a level's sprites have been created."""
+import typing
+import pygame as pg
+
+from src.world.spatial_hash import IndexedGroup
+
+
+class StaticGrid:
+    """Grid over the game world, one byte per cell, flagging the cells that static obstacles overlap.
+
+    Most cells are empty, so a lookup usually ends after reading a few bytes; only occupied cells are looked up in the
+    map from cells to the obstacles overlapping them.
+    """
+    def __init__(self, world_rect: pg.Rect, cell_size: int):
+        """Creates an empty grid covering the world, plus a border of one cell for the world's boundary walls.
+
+        :param world_rect: Rectangle covering the game world.
+        :param cell_size: Width and height in pixels of each cell, i.e., the map's tile size.
+        """
+        self._cell_size = cell_size
+        self._origin_x = world_rect.left - cell_size
+        self._origin_y = world_rect.top - cell_size
+        self._cols = world_rect.width // cell_size + 3
+        self._rows = world_rect.height // cell_size + 3
+        self._occupied = bytearray(self._cols * self._rows)
+        self._cells = {}  # Maps the index of each occupied cell to the obstacles overlapping it.
+        self._spans = {}  # Maps each obstacle to the cell indices it overlaps.
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __contains__(self, sprite) -> bool:
+        return sprite in self._spans
+
+    def _cell_indices(self, rect: pg.Rect) -> typing.List[int]:
+        """Returns the indices of the cells that a rectangle overlaps, clamped to the grid."""
+        size, cols, rows = self._cell_size, self._cols, self._rows
+        x0 = min(max((rect.left - self._origin_x) // size, 0), cols - 1)
+        y0 = min(max((rect.top - self._origin_y) // size, 0), rows - 1)
+        x1 = min(max((max(rect.right - 1, rect.left) - self._origin_x) // size, 0), cols - 1)
+        y1 = min(max((max(rect.bottom - 1, rect.top) - self._origin_y) // size, 0), rows - 1)
+        return [y * cols + x for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+
+    def add(self, sprite) -> None:
+        """Marks the cells that a sprite's hit_rect overlaps as occupied by it."""
+        span = self._cell_indices(sprite.hit_rect)
+        self._spans[sprite] = span
+        for i in span:
+            self._cells.setdefault(i, []).append(sprite)
+            self._occupied[i] = 1
+
+    def remove(self, sprite) -> None:
+        """Removes a destroyed obstacle, clearing the cells that no other obstacle occupies."""
+        for i in self._spans.pop(sprite, ()):
+            cell = self._cells[i]
+            cell.remove(sprite)
+            if not cell:
+                del self._cells[i]
+                self._occupied[i] = 0
+
+    def collisions(self, rect: pg.Rect) -> typing.List:
+        """Returns the obstacles whose hit_rect overlaps a rectangle.
+
+        :param rect: Rectangle to check, e.g., a moving sprite's hit_rect.
+        :return: List of colliding obstacles, which is empty if the rectangle only covers empty cells.
+        """
+        occupied = self._occupied
+        found = []
+        for i in self._cell_indices(rect):
+            if occupied[i]:
+                for sprite in self._cells[i]:
+                    if sprite not in found and rect.colliderect(sprite.hit_rect):
+                        found.append(sprite)
+        return found
+
+
+class ObstacleGroup(IndexedGroup):
+    """Static IndexedGroup of obstacles that also resolves which obstacle a moving sprite runs into.
+
+    Once baked, obstacles that never move are looked up in a StaticGrid, so the cost of a lookup doesn't depend on
+    how many obstacles the map has. The remaining, dynamic obstacles, e.g., item boxes, are checked one by one.
+    """
+    def __init__(self, *sprites, cell_size: int = 128):
+        self._grid = None
+        self._dynamic = set()
+        self._order = {}
+        self._next_order = 0
+        IndexedGroup.__init__(self, *sprites, cell_size=cell_size, static=True)
+
+    def add_internal(self, sprite, layer=None) -> None:
+        """Adds the sprite to the group; sprites added after baking are dynamic."""
+        IndexedGroup.add_internal(self, sprite)
+        self._order[sprite] = self._next_order
+        self._next_order += 1
+        if self._grid is not None:
+            self._dynamic.add(sprite)
+
+    def remove_internal(self, sprite) -> None:
+        """Removes the sprite from the group and from the static grid or dynamic set."""
+        IndexedGroup.remove_internal(self, sprite)
+        self._order.pop(sprite, None)
+        self._dynamic.discard(sprite)
+        if self._grid is not None:
+            self._grid.remove(sprite)
+
+    def bake(self, world_rect: pg.Rect, cell_size: int, dynamic: typing.Iterable = ()) -> None:
+        """Bakes every obstacle, except the given dynamic ones, into a StaticGrid.
+
+        :param world_rect: Rectangle covering the game world.
+        :param cell_size: Width and height in pixels of each grid cell, i.e., the map's tile size.
+        :param dynamic: Obstacles that can change, such as destructible boxes, which are kept out of the grid.
+        :return: None
+        """
+        self._grid = StaticGrid(world_rect, cell_size)
+        self._dynamic = set(dynamic) & set(self._order)
+        for sprite in self:
+            if sprite not in self._dynamic:
+                self._grid.add(sprite)
+
+    def freeze(self, sprite) -> None:
+        """Moves an obstacle that was added after baking, but will never move, from the dynamic set into the grid."""
+        if sprite in self._dynamic:
+            self._dynamic.discard(sprite)
+            self._grid.add(sprite)
+
+    def collide_any(self, sprite):
+        """Returns the obstacle that a sprite's hit_rect collides with, if any.
+
+        When several obstacles collide, the one added to the group first is returned, just like
+        pg.sprite.spritecollideany would.
+
+        :param sprite: Moving sprite, i.e., a tank.
+        :return: The colliding obstacle, or None.
+        """
+        rect = sprite.hit_rect
+        if self._grid is None:
+            return next((obstacle for obstacle in self if rect.colliderect(obstacle.hit_rect)), None)
+        colliders = self._grid.collisions(rect)
+        colliders.extend(obstacle for obstacle in self._dynamic if rect.colliderect(obstacle.hit_rect))
+        return min(colliders, key=self._order.get, default=None)
@@ -1,37 +1,175 @@
+import collections
 import os
+import typing
 import pygame as pg
 import pytmx
 
 import src.config as cfg
 
+# Parsed maps by filename; maps are never modified, so restarting a level reuses them.
+_parsed_maps = {}
+
+
+def _unconverted_image_loader(filename, colorkey, **kwargs):
+    """pytmx image loader that cuts out tiles without converting them, so that it can run off the main thread.
+
+    Each tile is returned together with its colorkey, to be converted later by _convert_map_images.
+    """
+    if colorkey:
+        colorkey = pg.Color(f"#{colorkey}")
+    image = pg.image.load(filename)
+
+    def load_image(rect=None, flags=None):
+        tile = image.subsurface(rect) if rect else image.copy()
+        if flags:
+            tile = pytmx.util_pygame.handle_transformation(tile, flags)
+        return tile, colorkey
+    return load_image
+
+
+def _convert_map_images(filename: str, tm: pytmx.TiledMap) -> None:
+    """Converts the tiles of a map parsed off the main thread and makes the map available to TiledMapLoader."""
+    if filename in _parsed_maps:
+        return
+    tm.images = [pytmx.util_pygame.smart_convert(entry[0], entry[1], True) if entry else entry for entry in tm.images]
+    _parsed_maps[filename] = tm
+
+
+def preload_jobs(filename: str) -> list:
+    """Returns a Preloader job that parses a .tmx file on the worker thread and converts its tiles afterwards."""
+    if filename in _parsed_maps:
+        return []
+    path = os.path.join(cfg.MAP_DIR, filename)
+    return [(lambda: pytmx.TiledMap(path, image_loader=_unconverted_image_loader),
+             lambda tm: _convert_map_images(filename, tm))]
+
 
 class TiledMapLoader:
     """TiledMapLoader class for loading a TiledMap from a .tmx file. Credits to Chris Bradfield from KidsCanCode"""
     def __init__(self, filename):
-        tm = pytmx.util_pygame.load_pygame(os.path.join(cfg.MAP_DIR, filename), pixelalpha=True)
-        self._width = tm.width * tm.tilewidth
-        self._height = tm.height * tm.tileheight
+        tm = _parsed_maps.get(filename)
+        if tm is None:
+            tm = pytmx.util_pygame.load_pygame(os.path.join(cfg.MAP_DIR, filename), pixelalpha=True)
+            _parsed_maps[filename] = tm
         self._tiled_map = tm
 
     @property
     def tiled_map(self) -> pytmx.TiledMap:
         return self._tiled_map
 
-    def make_map(self) -> pg.Surface:
-        """Creates a pygame surface from the visible layers of the TiledMap object loaded.
+    def make_chunked_map(self, chunk_size: int = cfg.MAP_CHUNK_SIZE,
+                         memory_budget: int = cfg.MAP_CHUNK_BUDGET) -> 'ChunkedMap':
+        """Creates a renderer that bakes the visible layers of the TiledMap one chunk at a time, as needed.
+
+        :param chunk_size: Width and height in pixels of each baked chunk.
+        :param memory_budget: Approximate number of bytes that baked chunks may occupy.
+        :return: A ChunkedMap for the loaded TiledMap.
+        """
+        return ChunkedMap(self._tiled_map, chunk_size, memory_budget)
+
+
+class ChunkedMap:
+    """Draws a TiledMap from fixed-size chunks that are baked lazily and kept in a size-bounded LRU cache."""
+    _PREFETCH_PER_FRAME = 1  # Chunks near, but outside, the camera that may be baked each frame.
+
+    def __init__(self, tiled_map: pytmx.TiledMap, chunk_size: int, memory_budget: int):
+        """Prepares the tile layers for baking; no chunk is baked until it's near the camera.
 
-        :return: A pygame surface representing the map.
+        :param tiled_map: The TiledMap whose visible tile layers will be drawn.
+        :param chunk_size: Width and height in pixels of each baked chunk.
+        :param memory_budget: Approximate number of bytes that baked chunks may occupy.
         """
-        surf = pg.Surface((self._width, self._height))
-        for layer in self._tiled_map.visible_layers:
-            if isinstance(layer, pytmx.TiledTileLayer):
-                for x, y, gid, in layer:
-                    tile = self._tiled_map.get_tile_image_by_gid(gid)
+        if chunk_size <= 0:
+            raise ValueError(f"Expected positive chunk_size, but received {chunk_size}")
+        self._tiled_map = tiled_map
+        self._layers = [layer for layer in tiled_map.visible_layers if isinstance(layer, pytmx.TiledTileLayer)]
+        self._chunk_size = chunk_size
+        self._memory_budget = memory_budget
+        self._memory_used = 0
+        self._chunks = collections.OrderedDict()
+        self.rect = pg.Rect(0, 0, tiled_map.width * tiled_map.tilewidth, tiled_map.height * tiled_map.tileheight)
+
+    @property
+    def chunk_count(self) -> int:
+        """Returns the number of chunks currently baked."""
+        return len(self._chunks)
+
+    @property
+    def memory_used(self) -> int:
+        """Returns the approximate number of bytes occupied by baked chunks."""
+        return self._memory_used
+
+    def _chunk_keys(self, area: pg.Rect) -> typing.List[typing.Tuple[int, int]]:
+        """Returns the (column, row) keys of every chunk within the map that overlaps the given area."""
+        area = area.clip(self.rect)
+        if not area.w or not area.h:
+            return []
+        size = self._chunk_size
+        return [(cx, cy)
+                for cy in range(area.top // size, (area.bottom - 1) // size + 1)
+                for cx in range(area.left // size, (area.right - 1) // size + 1)]
+
+    def _chunk_rect(self, key: typing.Tuple[int, int]) -> pg.Rect:
+        """Returns the world rectangle covered by a chunk, trimmed to the map's edges."""
+        cx, cy = key
+        size = self._chunk_size
+        return pg.Rect(cx * size, cy * size, size, size).clip(self.rect)
+
+    def _bake(self, key: typing.Tuple[int, int]) -> pg.Surface:
+        """Blits the tiles that fall within a chunk onto a new surface and caches it."""
+        tm = self._tiled_map
+        chunk_rect = self._chunk_rect(key)
+        surf = pg.Surface(chunk_rect.size)
+        first_col, last_col = chunk_rect.left // tm.tilewidth, (chunk_rect.right - 1) // tm.tilewidth
+        first_row, last_row = chunk_rect.top // tm.tileheight, (chunk_rect.bottom - 1) // tm.tileheight
+        for layer in self._layers:
+            for y in range(first_row, last_row + 1):
+                row = layer.data[y]
+                for x in range(first_col, last_col + 1):
+                    tile = tm.get_tile_image_by_gid(row[x])
                     if tile:
-                        surf.blit(tile, (x * self._tiled_map.tilewidth, y * self._tiled_map.tileheight))
+                        surf.blit(tile, (x * tm.tilewidth - chunk_rect.x, y * tm.tileheight - chunk_rect.y))
         surf.set_colorkey(cfg.COLOR_KEY)
         if surf.get_alpha() is None:
             surf = surf.convert()
         else:
             surf = surf.convert_alpha()
+
+        self._chunks[key] = surf
+        self._memory_used += surf.get_width() * surf.get_height() * surf.get_bytesize()
         return surf
+
+    def _evict(self, keep: typing.Collection[typing.Tuple[int, int]]) -> None:
+        """Drops least recently used chunks until within the memory budget, never dropping those in keep."""
+        for key in list(self._chunks):
+            if self._memory_used <= self._memory_budget:
+                break
+            if key not in keep:
+                surf = self._chunks.pop(key)
+                self._memory_used -= surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    def draw(self, screen: pg.Surface, camera) -> None:
+        """Blits the chunks in view of the camera, baking them if needed, and prefetches chunks near the view.
+
+        :param screen: The screen surface that the map will be drawn to.
+        :param camera: Camera whose rectangle determines which chunks are visible.
+        :return: None
+        """
+        visible = self._chunk_keys(camera.rect)
+        for key in visible:
+            surf = self._chunks.get(key)
+            if surf is None:
+                surf = self._bake(key)
+            else:
+                self._chunks.move_to_end(key)
+            screen.blit(surf, camera.apply(self._chunk_rect(key)))
+
+        # Bake a few chunks within half a chunk of the view so that they're ready before they come into view.
+        budget = ChunkedMap._PREFETCH_PER_FRAME
+        for key in self._chunk_keys(camera.view_rect(self._chunk_size // 2)):
+            if budget == 0:
+                break
+            if key not in self._chunks:
+                self._bake(key)
+                budget -= 1
+        self._evict(keep=visible)
@@ -0,0 +1,162 @@
+"""Line of sight between positions in the game world, cast over a grid of the obstacles that block it.
+
+Rays are cast cell by cell (with a DDA, i.e., a digital differential analyzer) between the centers of two cells, and
+the results are cached per pair of cells. When an obstacle appears, e.g., an item box respawns, only the cached lines of
+sight that were clear are dropped, and when one breaks, only those that were blocked.
+"""
+import collections
+import math
+import typing
+import pygame as pg
+
+import src.config as cfg
+from src.world.navigation import NavGrid
+
+
+class Visibility:
+    """Answers whether sprites can see each other past the level's obstacles, e.g., whether AI mobs see the player."""
+    def __init__(self, world_rect: pg.Rect, cell_size: int = cfg.LOS_CELL_SIZE, cache_size: int = cfg.LOS_CACHE_SIZE):
+        """
+        :param world_rect: Rectangle covering the game world.
+        :param cell_size: Width and height in pixels of each cell of the grid that rays are cast over.
+        :param cache_size: Maximum number of cached lines of sight; the least recently used are dropped first.
+        """
+        # Obstacles block the cells they overlap, without growing them like the navigation grid does for the tanks.
+        self._grid = NavGrid(world_rect, cell_size, clearance=0)
+        self._cache_size = cache_size
+        self._cache = collections.OrderedDict()  # Maps (cell, cell) to whether the line between them is clear.
+        self._dynamic = set()
+        self._seeing = set()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidated': 0}
+
+    def bake(self, obstacles: typing.Iterable, dynamic: typing.Iterable = (),
+             transparent: typing.Iterable = ()) -> None:
+        """Blocks the cells under every obstacle, except the dynamic ones, which are kept in step by sync.
+
+        :param obstacles: Obstacles in the game world, i.e., the 'obstacles' group.
+        :param dynamic: Obstacles that can appear and break, such as item boxes.
+        :param transparent: Obstacles that don't block sight, i.e., turrets, which would otherwise hide themselves.
+        :return: None
+        """
+        dynamic = set(dynamic)
+        transparent = set(transparent)
+        for sprite in obstacles:
+            if sprite not in dynamic and sprite not in transparent:
+                self.add_obstacle(sprite)
+        self.sync(dynamic)
+
+    def add_obstacle(self, sprite) -> None:
+        """Blocks the cells under a new obstacle, dropping the cached lines of sight that were clear."""
+        if sprite not in self._grid and self._grid.add_obstacle(sprite):
+            self._invalidate(True)
+
+    def remove_obstacle(self, sprite) -> None:
+        """Frees the cells under an obstacle, dropping the cached lines of sight that were blocked."""
+        if sprite in self._grid:
+            self._grid.remove_obstacle(sprite)
+            self._invalidate(False)
+
+    def sync(self, dynamic: typing.Iterable) -> None:
+        """Updates the grid with the dynamic obstacles that appeared or broke since the last call.
+
+        :param dynamic: Every dynamic obstacle currently in the game world, e.g., the 'item_boxes' group.
+        :return: None
+        """
+        current = set(dynamic)
+        if current == self._dynamic:
+            return
+        for sprite in self._dynamic - current:
+            self.remove_obstacle(sprite)
+        for sprite in current - self._dynamic:
+            self.add_obstacle(sprite)
+        self._dynamic = current
+
+    def _invalidate(self, clear: bool) -> None:
+        """Drops the cached lines of sight that were clear, or those that were blocked."""
+        stale = [key for key, cached in self._cache.items() if cached == clear]
+        for key in stale:
+            del self._cache[key]
+        self._stats['invalidated'] += len(stale)
+
+    def _cast(self, start: int, end: int) -> bool:
+        """Checks if a ray between the centers of two cells crosses only free cells, besides the two cells themselves.
+
+        :param start: Index of the cell that the ray starts in.
+        :param end: Index of the cell that the ray ends in.
+        :return: Whether the line of sight is clear.
+        """
+        grid = self._grid
+        cols = grid.cols
+        row, col = divmod(start, cols)
+        end_row, end_col = divmod(end, cols)
+        d_col, d_row = end_col - col, end_row - row
+        step_col = 1 if d_col > 0 else -1
+        step_row = 1 if d_row > 0 else -1
+        # Distances along the ray to the next column (row) boundary and between two of them, scaled to whole numbers so
+        # that the ray passing exactly through a corner is detected.
+        span_col, span_row = abs(d_col) or 1, abs(d_row) or 1
+        delta_col = 2 * span_row if d_col else math.inf
+        delta_row = 2 * span_col if d_row else math.inf
+        next_col, next_row = delta_col / 2, delta_row / 2
+        while True:
+            if next_col < next_row:
+                col += step_col
+                next_col += delta_col
+            elif next_row < next_col:
+                row += step_row
+                next_row += delta_row
+            else:
+                # The ray passes through a corner, which is blocked if both cells beside it are.
+                if grid.is_blocked(row * cols + col + step_col) and grid.is_blocked((row + step_row) * cols + col):
+                    return False
+                col += step_col
+                row += step_row
+                next_col += delta_col
+                next_row += delta_row
+            if row == end_row and col == end_col:
+                return True
+            if grid.is_blocked(row * cols + col):
+                return False
+
+    def line_of_sight(self, start: typing.Sequence[float], end: typing.Sequence[float]) -> bool:
+        """Checks if nothing that blocks sight is between two world positions, from the cache if possible.
+
+        :param start: World position to look from, e.g., an AI mob's position.
+        :param end: World position to look at.
+        :return: Whether the line of sight is clear.
+        """
+        grid = self._grid
+        start_cell, end_cell = grid.cell_at(start), grid.cell_at(end)
+        if start_cell == end_cell:
+            return True
+        key = (start_cell, end_cell) if start_cell < end_cell else (end_cell, start_cell)
+        clear = self._cache.get(key)
+        if clear is not None:
+            self._cache.move_to_end(key)
+            self._stats['hits'] += 1
+            return clear
+        self._stats['misses'] += 1
+        clear = self._cache[key] = self._cast(*key)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return clear
+
+    def update(self, viewers: typing.Iterable, target) -> None:
+        """Checks, for every viewer in one go, whether it sees a target within its range; see sees.
+
+        :param viewers: Sprites with a range, i.e., the tanks and turrets of the AI mobs.
+        :param target: The sprite that they look for, i.e., the player's tank.
+        :return: None
+        """
+        target_pos = target.pos
+        self._seeing = {viewer for viewer in viewers
+                        if target_pos.distance_squared_to(viewer.pos) < viewer.range ** 2 and
+                        self.line_of_sight(viewer.pos, target_pos)}
+
+    def sees(self, viewer) -> bool:
+        """Returns whether a viewer had the target in range and in sight as of the latest update."""
+        return viewer in self._seeing
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Returns the number of cached lines of sight, cache hits and misses, and lines dropped by obstacle changes."""
+        return {'lines': len(self._cache), **self._stats}